@@ -0,0 +1 @@
+"""Performance benchmarks for Smart Resume Screener"""
@@ -0,0 +1,102 @@
+"""Reproducible synthetic resumes and job descriptions for benchmarks"""
+
+import os
+import random
+from typing import Iterator, List, Tuple
+
+_ROLES = ["Software Engineer", "Product Manager", "Data Analyst", "Web Developer", "UX Designer"]
+_SKILLS = ["Python", "Java", "SQL", "React", "AWS", "Docker", "Kubernetes", "Machine Learning"]
+_DEGREES = ["Bachelor of Science in Computer Science", "Master of Business Administration",
+            "PhD in Statistics", "Associate Degree in IT"]
+_LEVELS = [("Junior", "0-2 years"), ("Mid-level", "3-5 years"), ("Senior", "5+ years")]
+
+
+def _resume(rng: random.Random, i: int) -> str:
+    """Generate one resume in the plain-text layout ResumeParser expects"""
+    jobs = "\n".join(
+        f"{rng.choice(_ROLES)} at Company{rng.randint(1, 500)} ({2010 + j}-{2012 + j})\n"
+        f"- Delivered project {rng.randint(1, 99)} improving throughput by {rng.randint(5, 60)}%"
+        for j in range(rng.randint(1, 5))
+    )
+    return (
+        f"Candidate {i}\n{rng.choice(_ROLES)}\n\n"
+        f"SKILLS: {', '.join(rng.sample(_SKILLS, rng.randint(2, 6)))}\n\n"
+        f"EXPERIENCE:\n{jobs}\n\n"
+        f"EDUCATION:\n{rng.choice(_DEGREES)}, University {rng.randint(1, 50)}\n\n"
+        f"PROJECTS:\nOpen source contributor\n"
+    )
+
+
+def _job_description(rng: random.Random, i: int) -> str:
+    """Generate one job description in the layout JobDescriptionParser expects"""
+    level, years = rng.choice(_LEVELS)
+    skills = rng.sample(_SKILLS, rng.randint(3, 6))
+    requirements = "\n".join(f"- Experience with {skill}" for skill in skills[:3])
+    return (
+        f"Position: {level} {rng.choice(_ROLES)}\n"
+        f"Company: Company{rng.randint(1, 500)} (req {i})\n\n"
+        f"Requirements:\n- {years} of professional experience\n{requirements}\n\n"
+        f"Skills: {', '.join(skills)}\n"
+    )
+
+
+def iter_resumes(count: int, seed: int = 0) -> Iterator[str]:
+    """
+    Lazily generate resumes, so corpora of a million need not fit in memory.
+
+    Args:
+        count: Number of resumes
+        seed: Random seed (same seed, same corpus)
+
+    Yields:
+        Resume texts
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        yield _resume(rng, i)
+
+
+def make_resumes(count: int, seed: int = 0) -> List[str]:
+    """Generate resumes in the plain-text layout ResumeParser expects"""
+    return list(iter_resumes(count, seed))
+
+
+def make_job_descriptions(count: int, seed: int = 0) -> List[str]:
+    """
+    Generate job descriptions.
+
+    Args:
+        count: Number of job descriptions
+        seed: Random seed (same seed, same descriptions)
+
+    Returns:
+        Job description texts
+    """
+    rng = random.Random(f"jobs-{seed}")
+    return [_job_description(rng, i) for i in range(count)]
+
+
+def write_corpus(directory: str, resumes: int, jobs: int = 10, seed: int = 0) -> Tuple[str, str]:
+    """
+    Write a corpus to disk for end-to-end runs (e.g. cli.py match).
+
+    Args:
+        directory: Output directory
+        resumes: Number of resumes
+        jobs: Number of job descriptions
+        seed: Random seed
+
+    Returns:
+        Tuple of (resume directory, job description directory)
+    """
+    resume_dir = os.path.join(directory, "resumes")
+    job_dir = os.path.join(directory, "jobs")
+    os.makedirs(resume_dir, exist_ok=True)
+    os.makedirs(job_dir, exist_ok=True)
+    for i, text in enumerate(iter_resumes(resumes, seed)):
+        with open(os.path.join(resume_dir, f"resume_{i:07d}.txt"), "w") as f:
+            f.write(text)
+    for i, text in enumerate(make_job_descriptions(jobs, seed)):
+        with open(os.path.join(job_dir, f"job_{i:04d}.txt"), "w") as f:
+            f.write(text)
+    return resume_dir, job_dir
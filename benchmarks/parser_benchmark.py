@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+"""Micro-benchmark for per-resume ResumeParser.parse time"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks.corpus import make_resumes
+from src.parser import ResumeParser
+
+
+def run(count: int, repeat: int) -> None:
+    """Time ResumeParser.parse over a synthetic corpus and print a summary"""
+    parser = ResumeParser()
+    resumes = make_resumes(count)
+    timings = []
+    for _ in range(repeat):
+        for resume in resumes:
+            start = time.perf_counter()
+            parser.parse(resume)
+            timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    print(f"resumes parsed: {len(timings)}")
+    print(f"mean: {statistics.mean(timings) * 1e6:8.1f} us/resume")
+    print(f"p50:  {timings[len(timings) // 2] * 1e6:8.1f} us/resume")
+    print(f"p95:  {timings[int(len(timings) * 0.95)] * 1e6:8.1f} us/resume")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=2000, help="Number of synthetic resumes")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus")
+    args = parser.parse_args()
+    run(args.count, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python
+"""Stage-by-stage benchmark of the screening pipeline on a synthetic corpus
+
+Times parse, embed, index build, search and rank, and reports throughput
+and p50/p95/p99 latencies as JSON, plus the search recall@k against an
+exact scan (so approximate and compressed indexes can be compared on
+quality too). A saved report can serve as the baseline for later runs:
+
+    python -m benchmarks.pipeline_benchmark --resumes 10000 --output base.json
+    python -m benchmarks.pipeline_benchmark --resumes 10000 --baseline base.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.corpus import iter_resumes, make_job_descriptions
+from src.similarity.index_factory import INDEX_TYPES
+
+STAGES = ("parse", "embed", "index", "search", "rank")
+
+# Latencies regress when they grow, throughput and recall when they shrink
+_LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+_THROUGHPUT_METRIC = "throughput_per_s"
+_HIGHER_IS_BETTER = (_THROUGHPUT_METRIC, "recall_at_k")
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list (q in 0-100)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(timings: List[float], items: int) -> Dict[str, float]:
+    """
+    Summarize per-call timings of one stage.
+
+    Args:
+        timings: Seconds taken by each timed call
+        items: Items processed by all calls together
+
+    Returns:
+        Call and item counts, total time, items per second and latency
+        percentiles of a single call in milliseconds
+    """
+    ordered = sorted(timings)
+    total = sum(ordered)
+    return {
+        "calls": len(ordered),
+        "items": items,
+        "total_s": round(total, 6),
+        _THROUGHPUT_METRIC: round(items / total, 3) if total else 0.0,
+        "mean_ms": round(total / len(ordered) * 1e3, 4) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1e3, 4),
+        "p95_ms": round(percentile(ordered, 95) * 1e3, 4),
+        "p99_ms": round(percentile(ordered, 99) * 1e3, 4),
+        "max_ms": round(ordered[-1] * 1e3, 4) if ordered else 0.0,
+    }
+
+
+def _timed(fn: Callable[..., Any], timings: List[float], *args: Any, **kwargs: Any) -> Any:
+    """Call fn, appending its wall time to timings"""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    timings.append(time.perf_counter() - start)
+    return result
+
+
+def _batches(texts, size: int):
+    """Group an iterable of texts into lists of at most size"""
+    batch = []
+    for text in texts:
+        batch.append(text)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _recall(searcher, resume_vectors: np.ndarray, job_vectors: np.ndarray,
+            found: List[np.ndarray], k: int) -> float:
+    """Mean fraction of each query's exact top k that the index returned"""
+    import faiss
+
+    # Exact neighbours in the searcher's own metric; rows are the auto-assigned IDs
+    _, exact = faiss.knn(searcher._prepare(job_vectors), searcher._prepare(resume_vectors), k)
+    hits = [len(set(ids.tolist()) & set(row.tolist())) for ids, row in zip(found, exact)]
+    return sum(hits) / (len(exact) * min(k, len(resume_vectors))) if len(exact) else 1.0
+
+
+def _environment() -> Dict[str, Any]:
+    """Versions and host details that affect timings"""
+    import faiss
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "faiss": getattr(faiss, "__version__", None),
+        "commit": commit,
+    }
+
+
+def run(
+    resumes: int = 1000,
+    jobs: int = 100,
+    seed: int = 0,
+    model: str = "all-MiniLM-L6-v2",
+    fake_embeddings: bool = False,
+    dim: int = 384,
+    batch_size: int = 32,
+    index_type: str = "flat_l2",
+    index_chunk: int = 10000,
+    top_k: int = 10,
+    pq_m: int = 48,
+    rerank_factor: int = 0,
+    encode_workers: int = 0
+) -> Dict[str, Any]:
+    """
+    Run every stage over a synthetic corpus.
+
+    Args:
+        resumes: Number of synthetic resumes (1k to 1M)
+        jobs: Number of job descriptions, each searched once
+        seed: Corpus seed
+        model: Sentence Transformer model for the embed stage
+        fake_embeddings: Use seeded random vectors instead of a model
+            (skips the embed stage; useful for index/search at large scale)
+        dim: Embedding dimension when fake_embeddings is set
+        batch_size: Texts per encode call
+        index_type: FAISS index type (see src.similarity.index_factory.INDEX_TYPES)
+        index_chunk: Vectors added to the index per call
+        top_k: Results per search
+        pq_m: Sub-quantizers per vector for "ivf_pq"
+        rerank_factor: Exact re-rank shortlist factor (0 disables)
+        encode_workers: Encode processes (0 encodes in-process); each call
+            then covers four batches per worker
+
+    Returns:
+        Report with run parameters, environment and per-stage summaries
+    """
+    from src.parser import JobDescriptionParser, ResumeParser
+    from src.ranking import CandidateRanker
+    from src.similarity import FAISSSearcher
+
+    stages = {}
+    job_texts = make_job_descriptions(jobs, seed)
+
+    # Parse: one call per document
+    resume_parser = ResumeParser()
+    job_parser = JobDescriptionParser()
+    timings = []
+    for text in iter_resumes(resumes, seed):
+        _timed(resume_parser.parse, timings, text)
+    job_titles = [_timed(job_parser.parse, timings, text)["title"] for text in job_texts]
+    stages["parse"] = summarize(timings, resumes + jobs)
+
+    # Embed: one call per batch
+    if fake_embeddings:
+        rng = np.random.default_rng(seed)
+        resume_vectors = rng.standard_normal((resumes, dim), dtype=np.float32)
+        job_vectors = rng.standard_normal((jobs, dim), dtype=np.float32)
+    else:
+        from src.embeddings import EmbeddingGenerator
+
+        embedder = EmbeddingGenerator(
+            model, batch_size=batch_size, encode_workers=encode_workers, min_pool_texts=0
+        )
+        call_size = batch_size * encode_workers * 4 if encode_workers > 1 else batch_size
+        embedder.generate(["warm up"] * call_size)
+        dim = embedder.embedding_dim
+        resume_vectors = np.empty((resumes, dim), dtype=np.float32)
+        timings = []
+        row = 0
+        for batch in _batches(iter_resumes(resumes, seed), call_size):
+            resume_vectors[row:row + len(batch)] = _timed(embedder.generate, timings, batch)
+            row += len(batch)
+        job_vectors = np.concatenate([
+            _timed(embedder.generate, timings, batch) for batch in _batches(job_texts, call_size)
+        ])
+        embedder.close()
+        stages["embed"] = summarize(timings, resumes + jobs)
+
+    # Index build: one call per chunk of vectors
+    searcher = FAISSSearcher(dim, index_type=index_type, pq_m=pq_m, rerank_factor=rerank_factor)
+    timings = []
+    for start in range(0, resumes, index_chunk):
+        _timed(searcher.add_embeddings, timings, resume_vectors[start:start + index_chunk])
+    stages["index"] = summarize(timings, resumes)
+
+    # Search and rank: one call per job description
+    search_timings = []
+    rank_timings = []
+    found = []
+    ranker = CandidateRanker()
+    for job_vector, title in zip(job_vectors, job_titles):
+        distances, ids = _timed(searcher.search, search_timings, job_vector, k=top_k)
+        _timed(ranker.rank_candidates, rank_timings, distances, [f"resume_{i}" for i in ids], title)
+        found.append(ids)
+    stages["search"] = summarize(search_timings, jobs)
+    stages["search"]["recall_at_k"] = round(_recall(searcher, resume_vectors, job_vectors, found, top_k), 4)
+    stages["rank"] = summarize(rank_timings, jobs)
+
+    return {
+        "params": {
+            "resumes": resumes,
+            "jobs": jobs,
+            "seed": seed,
+            "model": None if fake_embeddings else model,
+            "dim": dim,
+            "batch_size": batch_size,
+            "index_type": index_type,
+            "index_chunk": index_chunk,
+            "top_k": top_k,
+            "pq_m": pq_m,
+            "rerank_factor": rerank_factor,
+            "encode_workers": encode_workers,
+        },
+        "environment": _environment(),
+        "stages": stages,
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.10) -> List[Dict[str, Any]]:
+    """
+    Compare a report against a baseline report.
+
+    Args:
+        report: Current run
+        baseline: Saved run to compare against
+        tolerance: Relative change tolerated before a metric counts as
+            a regression (0.10 = 10%)
+
+    Returns:
+        One row per stage and metric with both values, the relative
+        change and whether it is a regression
+    """
+    rows = []
+    for stage in STAGES:
+        current = report["stages"].get(stage)
+        previous = baseline["stages"].get(stage)
+        if not current or not previous:
+            continue
+        for metric in (*_LATENCY_METRICS, *_HIGHER_IS_BETTER):
+            if metric not in current or metric not in previous:
+                continue
+            before, after = previous[metric], current[metric]
+            change = after / before - 1 if before else 0.0
+            if metric in _HIGHER_IS_BETTER:
+                regression = change < -tolerance
+            else:
+                regression = change > tolerance
+            rows.append({
+                "stage": stage,
+                "metric": metric,
+                "baseline": before,
+                "current": after,
+                "change": round(change, 4),
+                "regression": regression,
+            })
+    return rows
+
+
+def _print_comparison(rows: List[Dict[str, Any]], out=sys.stderr) -> None:
+    """Print comparison rows as a table"""
+    print(f"{'stage':<8} {'metric':<18} {'baseline':>12} {'current':>12} {'change':>8}", file=out)
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['stage']:<8} {row['metric']:<18} {row['baseline']:>12.4f} "
+              f"{row['current']:>12.4f} {row['change']:>+8.1%}{flag}", file=out)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--resumes", type=int, default=1000, help="Synthetic resumes (1k to 1M)")
+    parser.add_argument("--jobs", type=int, default=100, help="Job descriptions searched")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2", help="Model for the embed stage")
+    parser.add_argument("--fake-embeddings", action="store_true",
+                        help="Use seeded random vectors and skip the embed stage")
+    parser.add_argument("--dim", type=int, default=384, help="Dimension of fake embeddings")
+    parser.add_argument("--batch-size", type=int, default=32, help="Texts per encode call")
+    parser.add_argument("--index-type", default="flat_l2", choices=INDEX_TYPES)
+    parser.add_argument("--pq-m", type=int, default=48, help="Sub-quantizers for ivf_pq")
+    parser.add_argument("--rerank-factor", type=int, default=0,
+                        help="Re-rank k * factor hits by exact distance (0 disables)")
+    parser.add_argument("--encode-workers", type=int, default=0,
+                        help="Encode processes with their own model copy (0 = in-process)")
+    parser.add_argument("--index-chunk", type=int, default=10000, help="Vectors per index add")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="Saved report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Relative change counted as a regression")
+    args = parser.parse_args(argv)
+
+    report = run(
+        resumes=args.resumes,
+        jobs=args.jobs,
+        seed=args.seed,
+        model=args.model,
+        fake_embeddings=args.fake_embeddings,
+        dim=args.dim,
+        batch_size=args.batch_size,
+        index_type=args.index_type,
+        index_chunk=args.index_chunk,
+        top_k=args.top_k,
+        pq_m=args.pq_m,
+        rerank_factor=args.rerank_factor,
+        encode_workers=args.encode_workers,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["params"] != report["params"]:
+            print("warning: baseline was run with different parameters", file=sys.stderr)
+        rows = compare(report, baseline, args.tolerance)
+        _print_comparison(rows)
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+"""Command line interface for Smart Resume Screener"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Any
+
+import config
+
+
+def _print_ranking(title: str, candidates: List[Dict[str, Any]]) -> None:
+    """Print one ranked candidate list as a table"""
+    print("=" * 60)
+    print(title)
+    print("=" * 60)
+    if not candidates:
+        print("  No resumes found")
+    for rank, candidate in enumerate(candidates, 1):
+        print(f"{rank:>3}. {candidate['candidate_id']:<35} "
+              f"{candidate['score']:6.1f}  {candidate['explanation']}")
+
+
+def _filters(args: argparse.Namespace) -> Dict[str, List[str]]:
+    """Collect the --skill, --level and --degree constraints"""
+    filters = {"skills": args.skill, "level": args.level, "degree": args.degree}
+    return {field: values for field, values in filters.items() if values}
+
+
+def _cmd_match(args: argparse.Namespace) -> None:
+    from screener import ResumeScreener
+
+    filters = _filters(args)
+    if args.progress and filters:
+        sys.exit("error: --progress cannot be combined with --skill, --level or --degree")
+
+    screener = ResumeScreener(
+        args.model,
+        parse_resumes=not args.no_parse,
+        parse_workers=args.workers,
+        backend=args.backend,
+    )
+    if args.progress:
+        for snapshot in screener.iter_match_resumes(args.resume_dir, args.job, top_k=args.top_k):
+            best = snapshot["candidates"][0]["candidate_id"] if snapshot["candidates"] else "-"
+            print(f"[{snapshot['processed']}/{snapshot['total']}] best so far: {best}", file=sys.stderr)
+        results = snapshot["candidates"]
+    else:
+        results = screener.match_resumes(args.resume_dir, args.job, top_k=args.top_k, filters=filters)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_ranking(args.job, results)
+
+
+def _cmd_match_jobs(args: argparse.Namespace) -> None:
+    from screener import ResumeScreener
+
+    screener = ResumeScreener(
+        args.model,
+        parse_resumes=not args.no_parse,
+        parse_workers=args.workers,
+        backend=args.backend,
+    )
+    results = screener.match_jobs(args.resume_dir, args.jobs, top_k=args.top_k, filters=_filters(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for job_path, candidates in results.items():
+            _print_ranking(job_path, candidates)
+
+
+def _cmd_parse(args: argparse.Namespace) -> None:
+    from src.parser import JobDescriptionParser, ResumeParser, get_skill_matcher
+
+    skill_matcher = get_skill_matcher(config.SKILL_TAXONOMY_PATH)
+    parser = JobDescriptionParser(skill_matcher) if args.job else ResumeParser(skill_matcher)
+    for path in args.files:
+        with open(path, 'r') as f:
+            parsed = parser.parse(f.read())
+        parsed.pop("text")
+        print(json.dumps({"file": path, **parsed}, indent=2))
+
+
+def _cmd_check_backend(args: argparse.Namespace) -> int:
+    from src.embeddings import check_parity
+
+    texts = []
+    for path in args.files:
+        with open(path, 'r') as f:
+            texts.append(f.read())
+    report = check_parity(
+        args.model,
+        texts,
+        backend=args.candidate,
+        cache_dir=config.MODEL_CACHE_DIR,
+        quantization_config=config.ONNX_QUANTIZATION_CONFIG,
+        threshold=args.threshold,
+    )
+    print(json.dumps(report, indent=2))
+    return 0 if report["passed"] else 1
+
+
+def _cmd_serve(args: argparse.Namespace) -> None:
+    from screener import ResumeScreener
+    from src.metrics import enable_metrics
+    from src.service import run_service
+
+    # /metrics serves the process-wide collector
+    enable_metrics()
+
+    screener = ResumeScreener(
+        args.model,
+        parse_resumes=not args.no_parse,
+        parse_workers=args.workers,
+        backend=args.backend,
+    )
+    if args.resume_dir:
+        print(f"Synced {args.resume_dir}: {screener.sync_resumes(args.resume_dir)}")
+    print(f"Listening on http://{args.host}:{args.port}")
+    try:
+        run_service(
+            screener,
+            args.host,
+            args.port,
+            max_batch_size=args.max_batch_size,
+            max_wait_ms=args.max_wait_ms,
+            max_concurrency=args.max_concurrency,
+            max_pending=config.SERVICE_MAX_PENDING,
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+def _add_filter_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the hard-constraint options shared by the match commands"""
+    parser.add_argument("--skill", action="append", default=[],
+                        help="Only rank resumes listing this skill (repeat to require several)")
+    parser.add_argument("--level", action="append", default=[],
+                        choices=["entry-level", "junior", "mid-level", "senior"],
+                        help="Only rank resumes at this experience level (repeat to allow several)")
+    parser.add_argument("--degree", action="append", default=[],
+                        choices=["bachelor", "master", "phd", "diploma", "associate"],
+                        help="Only rank resumes holding this degree (repeat to allow several)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser"""
+    parser = argparse.ArgumentParser(
+        description="Match resumes to job descriptions using embeddings and FAISS"
+    )
+    parser.add_argument("--model", default=config.EMBEDDING_MODEL,
+                        help="Sentence Transformer model name")
+    parser.add_argument("--backend", default=config.EMBEDDING_BACKEND,
+                        choices=["torch", "onnx", "onnx-int8"],
+                        help="Inference backend used to encode texts")
+    parser.add_argument("--no-parse", action="store_true",
+                        help="Skip structured resume parsing (ranking only)")
+    parser.add_argument("--workers", type=int, default=config.PARSE_WORKERS,
+                        help="Processes used to read and parse resumes")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Print stage timings and counters (Prometheus format) to stderr")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="Profile the command with cProfile and write stats to PATH "
+                             "('-' prints a summary to stderr)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    match = subparsers.add_parser("match", help="Rank resumes against one job description")
+    match.add_argument("resume_dir", help="Directory containing .txt resumes")
+    match.add_argument("job", help="Job description file")
+    match.add_argument("--top-k", type=int, default=config.TOP_K_RESULTS)
+    match.add_argument("--json", action="store_true", help="Print results as JSON")
+    match.add_argument("--progress", action="store_true",
+                       help="Report the running top match while new resumes are ingested")
+    _add_filter_arguments(match)
+    match.set_defaults(func=_cmd_match)
+
+    match_jobs = subparsers.add_parser(
+        "match-jobs", help="Rank resumes against many job descriptions in one pass"
+    )
+    match_jobs.add_argument("resume_dir", help="Directory containing .txt resumes")
+    match_jobs.add_argument("jobs", nargs="+", help="Job description files")
+    match_jobs.add_argument("--top-k", type=int, default=config.TOP_K_RESULTS)
+    match_jobs.add_argument("--json", action="store_true", help="Print results as JSON")
+    _add_filter_arguments(match_jobs)
+    match_jobs.set_defaults(func=_cmd_match_jobs)
+
+    parse = subparsers.add_parser("parse", help="Parse resumes (or job descriptions) without ranking")
+    parse.add_argument("files", nargs="+", help="Files to parse")
+    parse.add_argument("--job", action="store_true", help="Parse the files as job descriptions")
+    parse.set_defaults(func=_cmd_parse)
+
+    check_backend = subparsers.add_parser(
+        "check-backend", help="Compare an ONNX backend's embeddings against torch"
+    )
+    check_backend.add_argument("files", nargs="+", help="Sample resumes or job descriptions")
+    check_backend.add_argument("--candidate", default="onnx-int8", choices=["onnx", "onnx-int8"],
+                               help="Backend to check")
+    check_backend.add_argument("--threshold", type=float, default=0.99,
+                               help="Minimum cosine agreement per text")
+    check_backend.set_defaults(func=_cmd_check_backend)
+
+    serve = subparsers.add_parser("serve", help="Run the HTTP scoring service")
+    serve.add_argument("--resume-dir", help="Index this directory before serving /search")
+    serve.add_argument("--host", default=config.SERVICE_HOST)
+    serve.add_argument("--port", type=int, default=config.SERVICE_PORT)
+    serve.add_argument("--max-batch-size", type=int, default=config.SERVICE_MAX_BATCH_SIZE,
+                       help="Most texts encoded in one call")
+    serve.add_argument("--max-wait-ms", type=float, default=config.SERVICE_MAX_WAIT_MS,
+                       help="Longest time a text waits for its batch to fill")
+    serve.add_argument("--max-concurrency", type=int, default=config.SERVICE_MAX_CONCURRENCY,
+                       help="Batches encoded at the same time")
+    serve.set_defaults(func=_cmd_serve)
+
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    """Run the command line interface"""
+    args = build_parser().parse_args(argv)
+    if args.metrics or args.profile:
+        from src.metrics import enable_metrics, profile_run
+
+        collector = enable_metrics() if args.metrics else None
+        path = None if args.profile == "-" else args.profile
+        try:
+            if args.profile:
+                with profile_run(path):
+                    return args.func(args) or 0
+            return args.func(args) or 0
+        finally:
+            if collector is not None:
+                sys.stderr.write(collector.to_prometheus())
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,9 +3,52 @@
 # Embedding settings
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"
 EMBEDDING_DIMENSION = 384
+EMBEDDING_BATCH_SIZE = 32  # Texts per forward pass, grouped by token length
+MODEL_REGISTRY_MAX_MODELS = 2  # Idle models kept warm per process (LRU beyond this)
+EMBEDDING_BACKEND = "torch"  # "torch", "onnx" or "onnx-int8" (exported under MODEL_CACHE_DIR)
+ONNX_QUANTIZATION_CONFIG = "avx2"  # Int8 preset: "arm64", "avx2", "avx512" or "avx512_vnni"
+EMBEDDING_WORKERS = 0  # Encode processes with their own model copy (0 = encode in-process)
+EMBEDDING_WORKER_THREADS = None  # Intra-op threads per encode process (None = cores / workers)
+EMBEDDING_POOL_MIN_TEXTS = 256  # Smaller inputs are encoded in-process
 
 # FAISS settings
-FAISS_INDEX_TYPE = "flat_l2"  # Can be "flat_l2", "ivf", etc.
+FAISS_INDEX_TYPE = "flat_l2"  # "flat_l2", "cosine", "ivf", "hnsw", or compressed "sq_fp16", "sq8", "ivf_pq"
+FAISS_IVF_NLIST = 1024  # Inverted lists for "ivf"/"ivf_pq" (capped by training size)
+FAISS_IVF_NPROBE = 16  # Lists visited per query for "ivf"/"ivf_pq"
+FAISS_HNSW_M = 32  # Graph degree for "hnsw"
+FAISS_HNSW_EF_CONSTRUCTION = 200
+FAISS_HNSW_EF_SEARCH = 64  # Query-time search depth for "hnsw"
+FAISS_PQ_M = 48  # Sub-quantizers for "ivf_pq", i.e. bytes per vector at 8 bits (must divide the dimension)
+FAISS_PQ_NBITS = 8  # Bits per sub-quantizer code for "ivf_pq"
+FAISS_RERANK_FACTOR = 0  # Re-score k * factor index hits with exact float32 distances (0 = off)
+FAISS_NUM_SHARDS = 1  # Above 1, resumes are partitioned across this many shards searched in parallel
+FAISS_SHARD_MODE = "process"  # "process" runs each shard in a worker process, "local" in this one
+FAISS_INDEX_PATH = "data/index/resumes.faiss"  # Set to None to keep the index in memory
+FAISS_INDEX_MMAP = False  # Map the saved index read-only, shared by worker processes (updated by a separate writer)
+
+# Parser settings
+# Skill taxonomy file. None uses the bundled src/parser/data/skills.txt,
+# a ~250-skill sample; supply a full taxonomy for production use.
+SKILL_TAXONOMY_PATH = None
+
+# Ingestion settings
+PARSE_RESUMES = True  # Set to False to skip structured parsing when only ranking
+PARSE_WORKERS = None  # Processes used to read and parse resumes (None = all cores)
+STREAM_CHUNK_SIZE = 256  # Resumes read and embedded at a time while syncing
+INGEST_READ_WORKERS = 4  # Threads reading resume files ahead of parsing and encoding
+INGEST_QUEUE_SIZE = 512  # Resumes buffered between read, parse and encode stages
+DEDUP_THRESHOLD = None  # Word-shingle similarity from which resumes share one embedding, e.g. 0.85 (None = off)
+
+# Metrics settings
+METRICS_ENABLED = False  # Record stage timings and counters process-wide (see src/metrics)
+
+# Service settings (python cli.py serve)
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8080
+SERVICE_MAX_BATCH_SIZE = 64  # Most texts encoded in one call
+SERVICE_MAX_WAIT_MS = 5.0  # Longest time a text waits for its batch to fill
+SERVICE_MAX_CONCURRENCY = 1  # Batches encoded at the same time
+SERVICE_MAX_PENDING = 1024  # Queued texts before requests get 503
 
 # Ranking settings
 SCORE_THRESHOLD = 50  # Minimum score to consider as match
@@ -18,3 +61,11 @@ OUTPUT_DIR = "data/output"
 
 # Model cache settings
 MODEL_CACHE_DIR = ".model_cache"
+
+# Embedding cache settings (set EMBEDDING_CACHE_PATH to None to disable)
+EMBEDDING_CACHE_PATH = ".model_cache/embeddings.sqlite3"
+EMBEDDING_CACHE_MAX_ENTRIES = 200000
+
+# Query result cache settings (in memory; set QUERY_CACHE_MAX_ENTRIES to 0 to disable)
+QUERY_CACHE_MAX_ENTRIES = 256  # Parsed jobs, job embeddings and ranked lists kept (LRU)
+QUERY_CACHE_TTL_SECONDS = 3600  # Lifetime of a cached entry (None = until evicted)
@@ -43,14 +43,23 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+
+def load_screener(model_name: str) -> ResumeScreener:
+    """This session's screener; loaded models are shared across sessions by the model registry"""
+    screener = st.session_state.get("screener")
+    if screener is None or screener.embedder.model_name != model_name:
+        if screener is not None:
+            # Drop the old model's reference so the registry can unload it
+            screener.embedder.close()
+        # Single-resume matching needs no persisted index
+        screener = st.session_state["screener"] = ResumeScreener(model_name, index_path=None)
+    return screener
+
+
 # Title and header
 st.title("📄 Resume Screener")
 st.markdown("Compare a resume against a job description and get a matching score")
 
-# Initialize session state
-if 'screener' not in st.session_state:
-    st.session_state.screener = ResumeScreener()
-
 # Sidebar for model selection
 with st.sidebar:
     st.header("⚙️ Settings")
@@ -68,6 +77,8 @@ with st.sidebar:
     3. Click 'Analyze' to get the match score
     """)
 
+screener = load_screener(embedding_model)
+
 # Main content - two columns
 col1, col2 = st.columns(2)
 
@@ -138,7 +149,7 @@ if analyze_button:
         with st.spinner("Analyzing resume against job description..."):
             try:
                 # Get the match result
-                result = st.session_state.screener.match_single_resume(resume, job_description)
+                result = screener.match_single_resume(resume, job_description)
                 
                 # Display results
                 st.markdown("---")
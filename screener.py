@@ -1,35 +1,489 @@
 """Main Resume Screener class"""
 
+import copy
+import heapq
 import os
-from typing import List, Dict, Any
-from src.parser import ResumeParser, JobDescriptionParser
-from src.embeddings import EmbeddingGenerator
-from src.similarity import FAISSSearcher
-from src.ranking import CandidateRanker
+import threading
+from itertools import islice
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+import numpy as np
+
+import config
+from src._files import file_stamp
+from src.parser import ResumeParser, JobDescriptionParser, get_skill_matcher
+from src.parser.job_parser import experience_level
+from src.parser.resume_parser import DEGREES
+from src.embeddings import EmbeddingCache, EmbeddingGenerator, get_model_registry
+from src.similarity import ResumeCatalog
+from src.similarity.metadata import active_filters
+from src.ingestion import NearDuplicateIndex, scan_resumes, stream_resumes
+from src.ranking import CandidateRanker, QueryResultCache
+from src.metrics import capture_stats, count, enable_metrics, stage
 
 
 class ResumeScreener:
     """Main class for screening resumes against job descriptions"""
 
-    def __init__(self, embedding_model: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        embedding_model: str = "all-MiniLM-L6-v2",
+        batch_size: int = config.EMBEDDING_BATCH_SIZE,
+        cache_path: Optional[str] = config.EMBEDDING_CACHE_PATH,
+        index_path: Optional[str] = config.FAISS_INDEX_PATH,
+        parse_resumes: bool = config.PARSE_RESUMES,
+        parse_workers: Optional[int] = config.PARSE_WORKERS,
+        backend: str = config.EMBEDDING_BACKEND,
+        query_cache_size: int = config.QUERY_CACHE_MAX_ENTRIES,
+        dedup_threshold: Optional[float] = config.DEDUP_THRESHOLD,
+        mmap_index: bool = config.FAISS_INDEX_MMAP
+    ):
         """
         Initialize the Resume Screener.
         
         Args:
             embedding_model: Name of the Sentence Transformer model
+            batch_size: Number of resumes encoded per forward pass
+            cache_path: Path of the on-disk embedding cache (None disables it)
+            index_path: Path of the persisted resume index (None keeps it in memory)
+            parse_resumes: Run structured parsing on ingested resumes
+                (disable when only ranking is needed)
+            parse_workers: Processes used to read and parse resumes
+                (None uses all cores)
+            backend: Inference backend, "torch", "onnx" or "onnx-int8"
+            query_cache_size: Parsed jobs, job embeddings and ranked lists
+                kept in memory for repeated searches (0 disables)
+            dedup_threshold: Similarity (estimated Jaccard over word shingles)
+                from which resumes are treated as near-duplicates and share
+                one embedding (None disables)
+            mmap_index: Open the saved index read-only and memory-mapped,
+                sharing its pages with other processes on the host; the
+                index is then updated by a separate writer and picked up
+                by refresh_index (not supported with sharding)
         """
-        self.resume_parser = ResumeParser()
-        self.job_parser = JobDescriptionParser()
-        self.embedder = EmbeddingGenerator(embedding_model)
-        self.searcher = FAISSSearcher(self.embedder.get_embedding_dimension())
+        skill_matcher = get_skill_matcher(config.SKILL_TAXONOMY_PATH)
+        self.resume_parser = ResumeParser(skill_matcher)
+        self.job_parser = JobDescriptionParser(skill_matcher)
+        cache = None
+        if cache_path:
+            cache = EmbeddingCache(cache_path, max_entries=config.EMBEDDING_CACHE_MAX_ENTRIES)
+        if config.METRICS_ENABLED:
+            enable_metrics()
+        registry = get_model_registry()
+        registry.max_models = config.MODEL_REGISTRY_MAX_MODELS
+        self.embedder = EmbeddingGenerator(
+            embedding_model,
+            batch_size=batch_size,
+            cache=cache,
+            registry=registry,
+            backend=backend,
+            model_cache_dir=config.MODEL_CACHE_DIR,
+            quantization_config=config.ONNX_QUANTIZATION_CONFIG,
+            encode_workers=config.EMBEDDING_WORKERS,
+            threads_per_worker=config.EMBEDDING_WORKER_THREADS,
+            min_pool_texts=config.EMBEDDING_POOL_MIN_TEXTS,
+        )
         self.ranker = CandidateRanker()
-        self.resume_embeddings = {}
+        self.result_cache = None
+        if query_cache_size:
+            self.result_cache = QueryResultCache(query_cache_size, config.QUERY_CACHE_TTL_SECONDS)
+        self.index_path = index_path
+        self.parse_resumes = parse_resumes
+        self.parse_workers = parse_workers
+        self.dedup_threshold = dedup_threshold
+        self.mmap_index = mmap_index and config.FAISS_NUM_SHARDS <= 1
+        self._catalog_stamp = None
+        self._refresh_lock = threading.Lock()
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """Reopen the persisted index, or start an empty one"""
+        from src.similarity import FAISSSearcher, ShardedSearcher
+        
+        self._catalog_stamp = file_stamp(self._catalog_path())
+        saved = self._open_saved()
+        if saved is not None:
+            self.searcher, self.catalog, self.dedup = saved
+            return
+        
+        dimension = self.embedder.get_embedding_dimension()
+        if config.FAISS_NUM_SHARDS > 1:
+            self.searcher = ShardedSearcher(
+                dimension,
+                num_shards=config.FAISS_NUM_SHARDS,
+                index_type=config.FAISS_INDEX_TYPE,
+                mode=config.FAISS_SHARD_MODE,
+                path=self.index_path,
+                **self._index_params()
+            )
+            # Shards reopen their files from path; start from empty
+            self.searcher.reset()
+        else:
+            vector_path = None
+            if self.index_path and not self.mmap_index:
+                vector_path = FAISSSearcher.vectors_path(self.index_path)
+            self.searcher = FAISSSearcher(
+                dimension,
+                index_type=config.FAISS_INDEX_TYPE,
+                vector_path=vector_path,
+                **self._index_params()
+            )
+            # Stays empty until a writer saves an index to refresh from
+            self.searcher.read_only = self.mmap_index
+        self.catalog = ResumeCatalog(model_name=self.embedder.model_id)
+        self.dedup = self._new_dedup()
+
+    def _open_saved(self) -> Optional[Tuple[Any, ResumeCatalog, Optional[NearDuplicateIndex]]]:
+        """Load the saved searcher, catalog and near-duplicate index if they match the settings"""
+        from src.similarity import FAISSSearcher, ShardedSearcher
+        
+        catalog_path = self._catalog_path()
+        if not catalog_path or not os.path.exists(self.index_path) or not os.path.exists(catalog_path):
+            return None
+        index_stamp = file_stamp(self.index_path)
+        try:
+            if config.FAISS_NUM_SHARDS > 1:
+                searcher = ShardedSearcher.load(
+                    self.index_path,
+                    num_shards=config.FAISS_NUM_SHARDS,
+                    mode=config.FAISS_SHARD_MODE,
+                    **self._index_params()
+                )
+            else:
+                searcher = FAISSSearcher.load(self.index_path, mmap=self.mmap_index, **self._index_params())
+        except (RuntimeError, ValueError):
+            # Saved with the other layout (a single index vs. a shard manifest)
+            return None
+        catalog = ResumeCatalog.load(catalog_path)
+        # A reader may catch a writer between saving the index and the
+        # catalog; only accept an index unchanged while loading, that the
+        # catalog was saved with (the searcher checked its own files)
+        stamp = catalog.index_stamp
+        if (searcher.embedding_dim != self.embedder.get_embedding_dimension()
+                or searcher.index_type != config.FAISS_INDEX_TYPE
+                or catalog.model_name != self.embedder.model_id
+                or searcher.get_index_size() != catalog.indexed_count()
+                or (stamp is not None and not stamp == index_stamp == file_stamp(self.index_path))):
+            if isinstance(searcher, ShardedSearcher):
+                # Stop the shard workers of the rejected index
+                searcher.close()
+            return None
+        return searcher, catalog, self._load_dedup()
+
+    def refresh_index(self) -> bool:
+        """
+        Switch to the latest saved index if a writer has replaced it.
+
+        Meant for screeners opened with mmap_index, and called by
+        search_index: when a writer (a screener without mmap_index running
+        sync_resumes) has saved a new version, it is mapped in place of the
+        current one. A save caught halfway is skipped; the writer replaces
+        the catalog last, which triggers another attempt.
+        
+        Returns:
+            True if a newer index was loaded
+        """
+        stamp = file_stamp(self._catalog_path())
+        if stamp is None or stamp == self._catalog_stamp:
+            return False
+        if not self._refresh_lock.acquire(blocking=False):
+            # Another thread is already loading it
+            return False
+        try:
+            self._catalog_stamp = stamp
+            saved = self._open_saved()
+            if saved is None:
+                return False
+            self.searcher, self.catalog, self.dedup = saved
+            count("index_refreshes_total")
+            return True
+        finally:
+            self._refresh_lock.release()
+
+    def _new_dedup(self) -> Optional[NearDuplicateIndex]:
+        """Empty near-duplicate index (None when deduplication is off)"""
+        return None if self.dedup_threshold is None else NearDuplicateIndex(self.dedup_threshold)
+
+    def _load_dedup(self) -> Optional[NearDuplicateIndex]:
+        """Reopen the persisted near-duplicate index, or start an empty one"""
+        dedup_path = self._dedup_path()
+        if self.dedup_threshold is None or not dedup_path or not os.path.exists(dedup_path):
+            return self._new_dedup()
+        return NearDuplicateIndex.load(dedup_path, self.dedup_threshold)
+
+    def _index_params(self) -> Dict[str, int]:
+        """Index build and query settings from config"""
+        return {
+            "nlist": config.FAISS_IVF_NLIST,
+            "nprobe": config.FAISS_IVF_NPROBE,
+            "hnsw_m": config.FAISS_HNSW_M,
+            "ef_construction": config.FAISS_HNSW_EF_CONSTRUCTION,
+            "ef_search": config.FAISS_HNSW_EF_SEARCH,
+            "pq_m": config.FAISS_PQ_M,
+            "pq_nbits": config.FAISS_PQ_NBITS,
+            "rerank_factor": config.FAISS_RERANK_FACTOR,
+        }
+
+    def _catalog_path(self) -> Optional[str]:
+        """Path of the ID mapping stored next to the index file"""
+        return f"{self.index_path}.meta.json" if self.index_path else None
+
+    def _dedup_path(self) -> Optional[str]:
+        """Path of the near-duplicate signatures stored next to the index file"""
+        return f"{self.index_path}.minhash.npz" if self.index_path else None
+
+    def save_index(self) -> None:
+        """
+        Persist the resume index and its ID mapping.
+        
+        Each file is replaced atomically, and the catalog goes last with
+        the identity of the index file it belongs to (whose manifest names
+        the vector files), so screeners loading or refreshing the index
+        only accept a complete save.
+        """
+        if not self.index_path:
+            return
+        if self.dedup is not None:
+            self.dedup.save(self._dedup_path())
+        self.searcher.save(self.index_path)
+        self.catalog.index_stamp = file_stamp(self.index_path)
+        self.catalog.save(self._catalog_path())
+
+    def resume_embedding(self, filename: str) -> Optional[np.ndarray]:
+        """
+        Look up the stored embedding of an indexed resume.
+        
+        Args:
+            filename: Resume file name
+            
+        Returns:
+            The embedding, or None if the resume is not indexed
+        """
+        resume_id = self.catalog.get_id(filename)
+        if resume_id is None:
+            return None
+        return self.searcher.store.get([self.catalog.representative(resume_id)])[0]
+
+    def sync_resumes(
+        self,
+        resume_dir: str,
+        chunk_size: int = config.STREAM_CHUNK_SIZE
+    ) -> Dict[str, int]:
+        """
+        Bring the index in line with the contents of a resume directory.
+        
+        Only new or modified files are embedded; files that disappeared
+        are removed from the index. Indexing a different directory than
+        the one currently held starts a fresh index.
+        
+        Args:
+            resume_dir: Directory containing resume files
+            chunk_size: Resumes read and embedded at a time
+            
+        Returns:
+            Counts of added, updated and removed resumes
+        """
+        changes = dict.fromkeys(("added", "updated", "removed", "touched"), 0)
+        current, changed = self._start_sync(os.path.abspath(resume_dir), changes)
+        for _ in self._ingest_chunks(current, changed, changes, chunk_size):
+            pass
+        return {key: changes[key] for key in ("added", "updated", "removed")}
+
+    def _start_sync(
+        self,
+        resume_dir: str,
+        changes: Dict[str, int]
+    ) -> Tuple[Dict[str, os.stat_result], List[str]]:
+        """Drop files that disappeared and list the ones whose stats changed"""
+        if self.mmap_index:
+            raise RuntimeError("The index is opened read-only (mmap_index); sync it from a writable screener")
+        if self.catalog.resume_dir != resume_dir:
+            self.searcher.reset()
+            self.catalog = ResumeCatalog(resume_dir, self.embedder.model_id)
+            self.dedup = self._new_dedup()
+        
+        current = {entry.name: entry.stat() for entry in scan_resumes(resume_dir)}
+        
+        stale_ids = [
+            self.catalog.get_id(filename)
+            for filename in self.catalog.filenames()
+            if filename not in current
+        ]
+        if stale_ids:
+            unindexed, _ = self._release(stale_ids)
+            if unindexed:
+                self.searcher.remove_ids(unindexed)
+        changes["removed"] = len(stale_ids)
+        
+        # Read only files whose stats changed; re-embed only if content changed
+        changed = []
+        for filename in sorted(current):
+            stat = current[filename]
+            record = self.catalog.get(filename)
+            if record and record["mtime"] == stat.st_mtime and record["size"] == stat.st_size:
+                continue
+            changed.append(filename)
+        return current, changed
+
+    def _ingest_chunks(
+        self,
+        current: Dict[str, os.stat_result],
+        changed: List[str],
+        changes: Dict[str, int],
+        chunk_size: int
+    ) -> Iterator[Tuple[int, List[int]]]:
+        """
+        Read changed files and embed the modified ones, one chunk at a time.
+        
+        Files are read and parsed by a background pipeline (see
+        stream_resumes) while the current chunk is encoded, and each chunk
+        is added to the index in one call. Superseded vectors of updated
+        resumes leave the catalog at once but are removed from the index
+        in a single call at the end, as removal rebuilds an "hnsw" index.
+        The index is saved at the end even if the caller stops iterating
+        early.
+        
+        Yields:
+            Per chunk, the number of files read and the IDs of the
+            indexed resumes to re-rank (near-duplicates have no vector)
+        """
+        superseded = []
+        resumes = stream_resumes(
+            [os.path.join(self.catalog.resume_dir, filename) for filename in changed],
+            parse=self.parse_resumes,
+            read_workers=config.INGEST_READ_WORKERS,
+            parse_workers=self.parse_workers,
+            chunk_size=min(chunk_size, 64),
+            queue_size=max(config.INGEST_QUEUE_SIZE, chunk_size),
+            taxonomy_path=config.SKILL_TAXONOMY_PATH,
+        )
+        try:
+            while True:
+                # Time spent here is the encoder waiting on reads and parsing
+                with stage("read"):
+                    chunk = list(islice(resumes, chunk_size))
+                if not chunk:
+                    break
+                handled = []
+                pending = []
+                for resume in chunk:
+                    filename = os.path.basename(resume["path"])
+                    stat = current[filename]
+                    record = self.catalog.get(filename)
+                    if record and record["hash"] == resume["hash"]:
+                        self.catalog.touch(filename, stat.st_mtime, stat.st_size)
+                        resume_id = self.catalog.get_id(filename)
+                        if self.catalog.representative(resume_id) == resume_id:
+                            handled.append(resume_id)
+                        changes["touched"] += 1
+                        continue
+                    if record:
+                        unindexed, promoted = self._release([self.catalog.get_id(filename)])
+                        superseded.extend(unindexed)
+                        handled.extend(promoted)
+                        changes["updated"] += 1
+                    else:
+                        changes["added"] += 1
+                    pending.append((filename, stat, resume))
+
+                # Near-duplicates of an indexed resume join its cluster unembedded
+                resume_ids = []
+                texts = []
+                for filename, stat, resume in pending:
+                    representative = None
+                    if self.dedup is not None:
+                        with stage("dedup"):
+                            signature = self.dedup.signature(resume["text"])
+                            representative = self.dedup.find(signature)
+                    resume_id = self.catalog.add(
+                        filename, stat.st_mtime, stat.st_size, resume["hash"],
+                        metadata=_resume_metadata(resume),
+                        duplicate_of=representative,
+                    )
+                    if representative is not None:
+                        count("near_duplicates_total")
+                        continue
+                    if self.dedup is not None:
+                        self.dedup.add(resume_id, signature)
+                    resume_ids.append(resume_id)
+                    texts.append(resume["text"])
+
+                if texts:
+                    self.searcher.add_embeddings(self.embedder.generate(texts), resume_ids)
+                    handled.extend(resume_ids)
+                yield len(chunk), handled
+        finally:
+            resumes.close()
+            if superseded:
+                self.searcher.remove_ids(superseded)
+            if any(changes.values()):
+                with stage("save"):
+                    self.save_index()
+            for change, resumes_changed in changes.items():
+                count("resumes_synced_total", resumes_changed, change=change)
+
+    def _release(self, resume_ids: List[int]) -> Tuple[List[int], List[int]]:
+        """
+        Drop resumes from the catalog, keeping their clusters indexed.
+        
+        When a cluster representative leaves, its first remaining
+        near-duplicate takes over the representative's vector, so the rest
+        of the cluster stays searchable without re-embedding.
+        
+        Args:
+            resume_ids: IDs of the resumes to drop
+            
+        Returns:
+            Tuple of (IDs whose vectors the caller must remove from the
+            index, IDs newly added to the index)
+        """
+        leaving = {int(resume_id) for resume_id in resume_ids}
+        unindexed = [
+            resume_id for resume_id in sorted(leaving)
+            if self.catalog.representative(resume_id) == resume_id
+        ]
+        handovers = []
+        for resume_id in unindexed:
+            heirs = [d for d in self.catalog.duplicates(resume_id) if d not in leaving]
+            signature = None
+            if self.dedup is not None:
+                signature = self.dedup.get(resume_id)
+                self.dedup.remove(resume_id)
+            if not heirs:
+                continue
+            for duplicate in heirs:
+                self.catalog.set_representative(duplicate, None if duplicate == heirs[0] else heirs[0])
+            if signature is not None:
+                self.dedup.add(heirs[0], signature)
+            handovers.append((resume_id, heirs[0]))
+        
+        promoted = [heir for _, heir in handovers]
+        if handovers:
+            vectors = self.searcher.store.get([resume_id for resume_id, _ in handovers])
+            self.searcher.add_embeddings(vectors, promoted)
+        self.catalog.remove(list(leaving))
+        return unindexed, promoted
+
+    def _with_duplicates(self, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """List the other members of each ranked candidate's near-duplicate cluster"""
+        for candidate in candidates:
+            resume_id = self.catalog.get_id(candidate["candidate_id"])
+            if resume_id is None:
+                continue
+            representative = self.catalog.representative(resume_id)
+            members = [representative, *self.catalog.duplicates(representative)]
+            duplicates = [member for member in members if member != resume_id]
+            if duplicates:
+                candidate["duplicates"] = [self.catalog.filename(member) for member in duplicates]
+        return candidates
 
     def match_resumes(
         self, 
         resume_dir: str, 
         job_description_path: str,
-        top_k: int = 10
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        return_stats: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Match resumes against a job description.
@@ -38,65 +492,387 @@ class ResumeScreener:
             resume_dir: Directory containing resume files
             job_description_path: Path to job description file
             top_k: Number of top matches to return
+            filters: Hard constraints such as {"skills": ["python"],
+                "level": "senior", "degree": "master"} (see MetadataStore.select)
+            return_stats: Also return a MetricsCollector with the stage
+                timings and counters of this call
             
         Returns:
-            List of matched candidates ranked by score
+            List of matched candidates ranked by score, or a
+            (candidates, stats) tuple if return_stats is set
         """
-        # Read and parse job description
+        if return_stats:
+            with capture_stats() as stats:
+                return self.match_resumes(resume_dir, job_description_path, top_k, filters), stats
+        
+        # Read job description
         with open(job_description_path, 'r') as f:
             job_text = f.read()
         
-        job_data = self.job_parser.parse(job_text)
-        job_embedding = self.embedder.generate(job_text)
+        # Bring the index up to date with the resume directory
+        self.sync_resumes(resume_dir)
+        return self.search_index(job_text, top_k=top_k, filters=filters)
+
+    def iter_match_resumes(
+        self,
+        resume_dir: str,
+        job_description_path: str,
+        top_k: int = 10,
+        chunk_size: int = config.STREAM_CHUNK_SIZE
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Match resumes against a job description, yielding partial rankings.
         
-        # Process resumes
-        resume_files = [f for f in os.listdir(resume_dir) if f.endswith('.txt')]
+        Indexed resumes that did not change are ranked first, straight from
+        the index. The rest of the directory is then read and embedded
+        chunk_size files at a time, each chunk updating a running top-k, so
+        results can be shown while ingestion continues. Resume text in
+        memory is bounded by the chunk being encoded plus the ingestion
+        queues read ahead of it (config.INGEST_QUEUE_SIZE).
         
-        if not resume_files:
-            return []
+        Args:
+            resume_dir: Directory containing resume files
+            job_description_path: Path to job description file
+            top_k: Number of top matches to keep
+            chunk_size: Resumes read and embedded per snapshot
+            
+        Yields:
+            Dicts with the current "candidates" (ranked as in match_resumes),
+            the "processed" and "total" number of files to ingest, and
+            "done" on the final snapshot
+        """
+        with open(job_description_path, 'r') as f:
+            job_text = f.read()
+        job_data, job_embedding = self._job(job_text)
+        job_title = job_data.get("title", "")
+        
+        changes = dict.fromkeys(("added", "updated", "removed", "touched"), 0)
+        current, changed = self._start_sync(os.path.abspath(resume_dir), changes)
+        
+        # Bounded max-heap of (-distance, filename): the worst kept match on top
+        top = []
+        
+        # Files about to be re-read may change, so leave them out here
+        rereading = {self.catalog.get_id(filename) for filename in changed} - {None}
+        index_size = self.searcher.get_index_size()
+        if index_size:
+            distances, ids = self.searcher.search(
+                job_embedding, k=min(index_size, top_k + len(rereading))
+            )
+            for distance, resume_id in zip(distances, ids):
+                if resume_id not in rereading:
+                    _push_bounded(top, top_k, distance, self.catalog.filename(resume_id))
+        
+        processed = 0
+        yield self._ranking_snapshot(top, job_title, processed, len(changed))
+        
+        for files_read, resume_ids in self._ingest_chunks(current, changed, changes, chunk_size):
+            if resume_ids:
+                vectors = self.searcher.store.get(resume_ids)
+                for distance, resume_id in zip(self.searcher.distances(job_embedding, vectors), resume_ids):
+                    _push_bounded(top, top_k, distance, self.catalog.filename(resume_id))
+            processed += files_read
+            yield self._ranking_snapshot(top, job_title, processed, len(changed))
+
+    def _ranking_snapshot(
+        self,
+        top: List[Tuple[float, str]],
+        job_title: str,
+        processed: int,
+        total: int
+    ) -> Dict[str, Any]:
+        """Rank the current top-k heap"""
+        best = sorted(top, reverse=True)
+        distances = np.array([-negated for negated, _ in best], dtype=np.float32)
+        return {
+            "candidates": self._with_duplicates(self.ranker.rank_candidates(
+                distances, [filename for _, filename in best], job_title
+            ).to_list()),
+            "processed": processed,
+            "total": total,
+            "done": processed == total,
+        }
+
+    def search_index(
+        self,
+        job_text: str,
+        top_k: int = 10,
+        job_embedding: Optional[np.ndarray] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank the resumes already in the index against a job description.
         
-        # Parse and embed all resumes
-        for resume_file in resume_files:
-            resume_path = os.path.join(resume_dir, resume_file)
-            with open(resume_path, 'r') as f:
-                resume_text = f.read()
+        Unlike match_resumes, the resume directory is not re-synced.
+        
+        Args:
+            job_text: Job description text
+            top_k: Number of top matches to return
+            job_embedding: Precomputed job embedding (encoded if omitted)
+            filters: Hard constraints resumes must meet (see match_resumes)
             
-            resume_data = self.resume_parser.parse(resume_text)
-            resume_embedding = self.embedder.generate(resume_text)
-            self.resume_embeddings[resume_file] = resume_embedding
-            self.searcher.add_embeddings(resume_embedding)
+        Returns:
+            List of matched candidates ranked by score
+        """
+        cached = self.cached_search(job_text, top_k, filters)
+        if cached is not None:
+            return cached
+        
+        key = self._result_key(job_text, top_k, filters)
+        job_data, job_embedding = self._job(job_text, job_embedding)
+        
+        allowed_ids, stand_ins = self._filter_ids(filters)
+        index_size = self.searcher.get_index_size() if allowed_ids is None else len(allowed_ids)
+        if not index_size:
+            return []
         
         # Search for similar resumes
-        distances, indices = self.searcher.search(job_embedding[0], k=min(top_k, len(resume_files)))
+        distances, ids = self.searcher.search(
+            job_embedding, k=min(top_k, index_size), allowed_ids=allowed_ids
+        )
         
         # Rank candidates
-        candidate_ids = [resume_files[idx] for idx in indices]
-        ranked_candidates = self.ranker.rank_candidates(distances, candidate_ids, job_data.get("title", ""))
+        candidate_ids = [self.catalog.filename(stand_ins.get(resume_id, resume_id)) for resume_id in ids]
+        results = self.ranker.rank_candidates(distances, candidate_ids, job_data.get("title", "")).to_list()
+        self._store(key, results)
+        return self._with_duplicates(results)
+
+    def cached_search(
+        self,
+        job_text: str,
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up the results of an identical earlier search_index call.
         
-        return ranked_candidates
+        Callers that encode job descriptions themselves (the HTTP service)
+        check this first, so repeated queries skip encoding altogether.
+        
+        Args:
+            job_text: Job description text
+            top_k: Number of top matches to return
+            filters: Hard constraints resumes must meet (see match_resumes)
+            
+        Returns:
+            The ranked candidates if cached for the current index, else None
+        """
+        if self.mmap_index:
+            self.refresh_index()
+        cached = self._cached(self._result_key(job_text, top_k, filters))
+        return None if cached is None else self._with_duplicates(cached)
 
-    def match_single_resume(self, resume_text: str, job_text: str) -> Dict[str, Any]:
+    def match_jobs(
+        self,
+        resume_dir: str,
+        job_description_paths: List[str],
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        return_stats: bool = False
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Match resumes against several job descriptions at once.
+        
+        The resume directory is synced once, all job descriptions are
+        embedded in one batch and searched with a single multi-query
+        index search.
+        
+        Args:
+            resume_dir: Directory containing resume files
+            job_description_paths: Paths to job description files
+            top_k: Number of top matches to return per job
+            filters: Hard constraints resumes must meet (see match_resumes)
+            return_stats: Also return a MetricsCollector with the stage
+                timings and counters of this call
+            
+        Returns:
+            Mapping of job description path to its ranked candidates, or
+            a (mapping, stats) tuple if return_stats is set
+        """
+        if return_stats:
+            with capture_stats() as stats:
+                return self.match_jobs(resume_dir, job_description_paths, top_k, filters), stats
+        
+        job_texts = []
+        for job_description_path in job_description_paths:
+            with open(job_description_path, 'r') as f:
+                job_texts.append(f.read())
+        
+        # Parse and embed the jobs not in the query cache, in one batch
+        jobs = [self._cached_job(job_text) for job_text in job_texts]
+        missing = [i for i, job in enumerate(jobs) if job is None]
+        if missing:
+            embeddings = self.embedder.generate([job_texts[i] for i in missing])
+            for i, job_embedding in zip(missing, embeddings):
+                jobs[i] = self._job(job_texts[i], job_embedding)
+        
+        self.sync_resumes(resume_dir)
+        
+        # Search only for the jobs whose results are not cached
+        results = {}
+        keys = {}
+        for path, job_text in zip(job_description_paths, job_texts):
+            keys[path] = self._result_key(job_text, top_k, filters)
+            cached = self._cached(keys[path])
+            if cached is not None:
+                results[path] = cached
+        pending = [
+            (path, job) for path, job in zip(job_description_paths, jobs) if path not in results
+        ]
+        if not pending:
+            return {path: self._with_duplicates(results[path]) for path in job_description_paths}
+        
+        allowed_ids, stand_ins = self._filter_ids(filters)
+        index_size = self.searcher.get_index_size() if allowed_ids is None else len(allowed_ids)
+        if not index_size:
+            return {path: [] for path in job_description_paths}
+        
+        job_embeddings = np.array([job_embedding for _, (_, job_embedding) in pending])
+        distances, ids = self.searcher.search_batch(
+            job_embeddings, k=min(top_k, index_size), allowed_ids=allowed_ids
+        )
+        
+        for (path, (job_data, _)), row_distances, row_ids in zip(pending, distances, ids):
+            found = row_ids != -1
+            candidate_ids = [
+                self.catalog.filename(stand_ins.get(resume_id, resume_id)) for resume_id in row_ids[found]
+            ]
+            results[path] = self.ranker.rank_candidates(
+                row_distances[found], candidate_ids, job_data.get("title", "")
+            ).to_list()
+            self._store(keys[path], results[path])
+        return {path: self._with_duplicates(results[path]) for path in job_description_paths}
+
+    def _cached_job(self, job_text: str) -> Optional[Tuple[Dict[str, Any], np.ndarray]]:
+        """Parsed data and embedding of a job from the query cache, if held"""
+        if self.result_cache is None:
+            return None
+        return self.result_cache.get(QueryResultCache.job_key(job_text, self.embedder.model_id))
+
+    def _job(
+        self,
+        job_text: str,
+        job_embedding: Optional[np.ndarray] = None
+    ) -> Tuple[Dict[str, Any], np.ndarray]:
+        """Parse and embed a job description, reusing the query cache"""
+        cached = self._cached_job(job_text)
+        if cached is not None:
+            job_data, cached_embedding = cached
+            return job_data, cached_embedding if job_embedding is None else job_embedding
+        
+        with stage("parse"):
+            job_data = self.job_parser.parse(job_text)
+        if job_embedding is None:
+            job_embedding = self.embedder.generate(job_text)[0]
+        if self.result_cache is not None:
+            key = QueryResultCache.job_key(job_text, self.embedder.model_id)
+            self.result_cache.put(key, (job_data, job_embedding))
+        return job_data, job_embedding
+
+    def _result_key(self, job_text: str, top_k: int, filters: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Query cache key of a search against the current index state"""
+        if self.result_cache is None:
+            return None
+        return QueryResultCache.result_key(
+            job_text, self.embedder.model_id, top_k, active_filters(filters),
+            self.searcher.version, self.catalog.version
+        )
+
+    def _cached(self, key: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+        """Copy of cached ranked results, so callers may modify them"""
+        if key is None:
+            return None
+        results = self.result_cache.get(key)
+        return None if results is None else copy.deepcopy(results)
+
+    def _store(self, key: Optional[str], results: List[Dict[str, Any]]) -> None:
+        """Cache a copy of ranked results"""
+        if key is not None:
+            self.result_cache.put(key, copy.deepcopy(results))
+
+    def _filter_ids(
+        self,
+        filters: Optional[Dict[str, Any]]
+    ) -> Tuple[Optional[np.ndarray], Dict[int, int]]:
+        """
+        IDs of the indexed resumes meeting the filters (None when unfiltered).
+        
+        Near-duplicates are judged on their own metadata and searched
+        through their representative. Where the representative itself
+        fails the filters, the first qualifying duplicate is returned as
+        its stand-in, to be listed in its place.
+        
+        Returns:
+            Allowed index IDs, and stand-in IDs keyed by representative
+        """
+        filters = active_filters(filters)
+        if filters is None:
+            return None, {}
+        unparsed = len(self.catalog) - len(self.catalog.metadata)
+        if unparsed:
+            # Unparsed resumes have no metadata and could never qualify
+            raise ValueError(
+                f"Filters need parsed resumes, but {unparsed} indexed resumes were synced with "
+                "parse_resumes off; rebuild the index with parsing enabled"
+            )
+        with stage("filter"):
+            selected = self.catalog.metadata.select(filters, self.resume_parser.skill_matcher)
+            if self.catalog.indexed_count() == len(self.catalog):
+                return selected, {}
+            qualifying = set(selected.tolist())
+            representatives = []
+            stand_ins = {}
+            for resume_id in selected.tolist():
+                representative = self.catalog.representative(resume_id)
+                representatives.append(representative)
+                if representative not in qualifying:
+                    stand_ins.setdefault(representative, resume_id)
+            return np.unique(np.array(representatives, dtype=np.int64)), stand_ins
+
+    def match_single_resume(
+        self,
+        resume_text: str,
+        job_text: str,
+        embeddings: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+        return_stats: bool = False
+    ) -> Dict[str, Any]:
         """
         Match a single resume against a job description.
         
         Args:
             resume_text: Resume text
             job_text: Job description text
+            embeddings: Precomputed (resume, job) embeddings, e.g. from a
+                batched encode (encoded here if omitted)
+            return_stats: Also return a MetricsCollector with the stage
+                timings and counters of this call
             
         Returns:
-            Match result with score and explanation
+            Match result with score and explanation, or a (result, stats)
+            tuple if return_stats is set
         """
-        # Parse texts
-        job_data = self.job_parser.parse(job_text)
-        resume_data = self.resume_parser.parse(resume_text)
+        if return_stats:
+            with capture_stats() as stats:
+                return self.match_single_resume(resume_text, job_text, embeddings), stats
+        
+        # Parse texts; the job side is usually repeated and served from cache
+        with stage("parse"):
+            resume_data = self.resume_parser.parse(resume_text)
         
         # Generate embeddings
-        job_embedding = self.embedder.generate(job_text)
-        resume_embedding = self.embedder.generate(resume_text)
+        cached = self._cached_job(job_text) if embeddings is None else None
+        if cached is not None:
+            job_data, job_embedding = cached
+            resume_embedding = self.embedder.generate(resume_text)[0]
+        elif embeddings is None:
+            resume_embedding, job_embedding = self.embedder.generate([resume_text, job_text])
+            job_data, _ = self._job(job_text, job_embedding)
+        else:
+            resume_embedding, job_embedding = embeddings
+            job_data, _ = self._job(job_text, job_embedding)
         
         # Calculate similarity
-        from sklearn.metrics.pairwise import cosine_similarity
-        similarity = cosine_similarity(resume_embedding, job_embedding)[0][0]
+        similarity = _cosine_similarity(resume_embedding, job_embedding)
         score = similarity * 100
         
         return {
@@ -118,3 +894,37 @@ class ResumeScreener:
             return "Moderate match"
         else:
             return "Weak match"
+
+
+def _resume_metadata(resume: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Filterable values of a loaded resume (None if it was not parsed)"""
+    data = resume["data"]
+    if data is None:
+        return None
+    degrees = [
+        degree.lower()
+        for degree in DEGREES
+        if any(degree.lower() in entry["degree"].lower() for entry in data["education"])
+    ]
+    return {
+        "skills": list(data["canonical_skills"]),
+        "level": experience_level(resume["text"]),
+        "degree": degrees,
+    }
+
+
+def _push_bounded(top: List[Tuple[float, str]], k: int, distance: float, filename: str) -> None:
+    """Keep the k smallest distances in a max-heap of (-distance, filename)"""
+    entry = (-float(distance), filename)
+    if len(top) < k:
+        heapq.heappush(top, entry)
+    elif entry > top[0]:
+        heapq.heapreplace(top, entry)
+
+
+def _cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Cosine similarity of two vectors (0 when either is all zeros)"""
+    norm = np.linalg.norm(a) * np.linalg.norm(b)
+    if norm == 0:
+        return 0.0
+    return float(np.dot(a, b) / norm)
@@ -14,6 +14,7 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/yourusername/smart-resume-screener",
     packages=find_packages(),
+    package_data={"src.parser": ["data/*.txt"]},
     classifiers=[
         "Programming Language :: Python :: 3",
         "Programming Language :: Python :: 3.8",
@@ -25,10 +26,12 @@ setup(
     python_requires=">=3.8",
     install_requires=[
         "faiss-cpu>=1.7.0",
-        "sentence-transformers>=2.2.0",
-        "scikit-learn>=1.0.0",
+        "sentence-transformers>=3.2.0",
         "numpy>=1.20.0",
         "torch>=1.10.0",
-        "transformers>=4.20.0",
+        "transformers>=4.41.0",
     ],
+    extras_require={
+        "onnx": ["optimum[onnxruntime]>=1.23.0"],
+    },
 )
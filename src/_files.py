@@ -0,0 +1,50 @@
+"""Helpers for replacing files that other processes may be reading"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+
+@contextmanager
+def atomic_path(path: str) -> Iterator[str]:
+    """
+    Yield a temporary path to write, then move it over path in one step.
+
+    The temporary file sits in the destination directory, so the final
+    os.replace is atomic: readers opening path find either the old or the
+    new file, never a partial one, and processes that already opened or
+    memory-mapped the old file keep reading it unchanged. Nothing is
+    replaced if the block raises. Each call gets its own temporary name,
+    so threads saving at once do not collide.
+
+    Args:
+        path: Destination file path (its directory is created if needed)
+
+    Yields:
+        Temporary file path to write the new contents to
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    handle, temporary = tempfile.mkstemp(
+        prefix=f"{os.path.basename(path)}.", suffix=".tmp", dir=directory or "."
+    )
+    os.close(handle)
+    try:
+        # mkstemp creates the file owner-only; keep it readable like the file it replaces
+        os.chmod(temporary, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644)
+        yield temporary
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def file_stamp(path: Optional[str]) -> Optional[List[int]]:
+    """Identity of a file's current version (changes whenever it is replaced), or None"""
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return [stat.st_ino, stat.st_mtime_ns, stat.st_size]
@@ -0,0 +1,37 @@
+"""Helpers for lazily importing package members on first access"""
+
+import importlib
+from typing import Any, Callable, Dict, List
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Callable[[str], Any]:
+    """
+    Build a module-level __getattr__ that imports members on demand.
+
+    Keeps heavy dependencies (torch, faiss, ...) out of package imports
+    until the member that needs them is actually used.
+
+    Args:
+        package: Name of the package (pass __name__)
+        exports: Mapping of exported name to the submodule defining it
+
+    Returns:
+        Function suitable for assigning to the package's __getattr__
+    """
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module = importlib.import_module(exports[name], package)
+        value = getattr(module, name)
+        setattr(importlib.import_module(package), name, value)
+        return value
+
+    return __getattr__
+
+
+def lazy_dir(exports: Dict[str, str], namespace: Dict[str, Any]) -> Callable[[], List[str]]:
+    """Build a module-level __dir__ listing lazy exports alongside globals"""
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __dir__
@@ -1,5 +1,15 @@
 """Embeddings module for generating text embeddings"""
 
-from .embedder import EmbeddingGenerator
+from src._lazy import lazy_dir, lazy_exports
 
-__all__ = ["EmbeddingGenerator"]
+_EXPORTS = {
+    "EmbeddingCache": ".cache",
+    "EmbeddingGenerator": ".embedder",
+    "ModelRegistry": ".registry",
+    "get_model_registry": ".registry",
+    "check_parity": ".backends",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+__dir__ = lazy_dir(_EXPORTS, globals())
@@ -0,0 +1,204 @@
+"""Inference backends for Sentence Transformer models"""
+
+import functools
+import os
+import shutil
+import tempfile
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+# Dynamic int8 quantization presets understood by sentence-transformers
+QUANTIZATION_CONFIGS = ("arm64", "avx2", "avx512", "avx512_vnni")
+
+
+def model_key(model_name: str, backend: str = "torch") -> str:
+    """
+    Identify a model as served by a backend.
+
+    Used as the registry key and as the model name in embedding cache keys
+    and index metadata, so vectors from different backends never mix.
+
+    Args:
+        model_name: Sentence Transformer model name
+        backend: One of BACKENDS
+
+    Returns:
+        The model name for "torch", otherwise "<model_name>@<backend>"
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+    return model_name if backend == "torch" else f"{model_name}@{backend}"
+
+
+def onnx_model_dir(model_name: str, cache_dir: str) -> str:
+    """Directory holding the exported ONNX model for a model name"""
+    return os.path.join(cache_dir, "onnx", model_name.replace("/", "--"))
+
+
+def export_onnx_model(
+    model_name: str,
+    cache_dir: str,
+    quantize: bool = False,
+    quantization_config: str = "avx2"
+) -> str:
+    """
+    Export a model to ONNX once and return its file inside the model directory.
+
+    The plain export is written to a temporary directory and renamed into
+    place, so concurrent processes never load a half-written model. The
+    int8 variant is derived from it with dynamic quantization.
+
+    Args:
+        model_name: Sentence Transformer model name
+        cache_dir: Root of the model cache (config.MODEL_CACHE_DIR)
+        quantize: Also produce a dynamically int8-quantized model
+        quantization_config: One of QUANTIZATION_CONFIGS
+
+    Returns:
+        Path of the ONNX file relative to onnx_model_dir()
+    """
+    from sentence_transformers import SentenceTransformer
+
+    if quantization_config not in QUANTIZATION_CONFIGS:
+        raise ValueError(
+            f"Unknown quantization config '{quantization_config}', "
+            f"expected one of {QUANTIZATION_CONFIGS}"
+        )
+    model_dir = onnx_model_dir(model_name, cache_dir)
+    file_name = "onnx/model.onnx"
+    if not os.path.exists(os.path.join(model_dir, file_name)):
+        os.makedirs(os.path.dirname(model_dir), exist_ok=True)
+        staging_dir = tempfile.mkdtemp(prefix=".export-", dir=os.path.dirname(model_dir))
+        try:
+            SentenceTransformer(model_name, backend="onnx").save_pretrained(staging_dir)
+            try:
+                os.rename(staging_dir, model_dir)
+            except OSError:
+                # Another process finished the export first
+                if not os.path.exists(os.path.join(model_dir, file_name)):
+                    raise
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    if not quantize:
+        return file_name
+
+    quantized_name = f"onnx/model_qint8_{quantization_config}.onnx"
+    if not os.path.exists(os.path.join(model_dir, quantized_name)):
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+
+        model = SentenceTransformer(model_dir, backend="onnx")
+        export_dynamic_quantized_onnx_model(model, quantization_config, model_dir)
+    return quantized_name
+
+
+def load_onnx_model(
+    model_name: str,
+    cache_dir: str,
+    quantize: bool = False,
+    quantization_config: str = "avx2"
+) -> Any:
+    """
+    Load a model served through ONNX Runtime, exporting it on first use.
+
+    The result is a regular SentenceTransformer, so tokenization, pooling
+    and normalization are the same as with the torch backend.
+
+    Args:
+        model_name: Sentence Transformer model name
+        cache_dir: Root of the model cache (config.MODEL_CACHE_DIR)
+        quantize: Serve the int8-quantized model
+        quantization_config: One of QUANTIZATION_CONFIGS
+
+    Returns:
+        SentenceTransformer backed by an ONNX Runtime session
+    """
+    from sentence_transformers import SentenceTransformer
+
+    file_name = export_onnx_model(model_name, cache_dir, quantize, quantization_config)
+    return SentenceTransformer(
+        onnx_model_dir(model_name, cache_dir),
+        backend="onnx",
+        model_kwargs={"file_name": file_name},
+    )
+
+
+def onnx_loader(
+    model_name: str,
+    cache_dir: str,
+    quantize: bool = False,
+    quantization_config: str = "avx2"
+) -> Callable[[str], Any]:
+    """Build a ModelRegistry loader for an ONNX-served model (picklable, for encode workers)"""
+    return functools.partial(_load_onnx_by_key, model_name, cache_dir, quantize, quantization_config)
+
+
+def _load_onnx_by_key(
+    model_name: str,
+    cache_dir: str,
+    quantize: bool,
+    quantization_config: str,
+    _key: str
+) -> Any:
+    """Registry loader signature adapter for load_onnx_model"""
+    return load_onnx_model(model_name, cache_dir, quantize, quantization_config)
+
+
+def check_parity(
+    model_name: str,
+    texts: List[str],
+    backend: str = "onnx-int8",
+    cache_dir: str = ".model_cache",
+    quantization_config: str = "avx2",
+    threshold: float = 0.99,
+    registry: Optional[Any] = None
+) -> Dict[str, Any]:
+    """
+    Compare a backend's embeddings against the torch backend.
+
+    Args:
+        model_name: Sentence Transformer model name
+        texts: Sample texts to encode with both backends
+        backend: Backend under test
+        cache_dir: Root of the model cache (config.MODEL_CACHE_DIR)
+        quantization_config: One of QUANTIZATION_CONFIGS
+        threshold: Minimum per-text cosine similarity for the check to pass
+        registry: Model registry to load both models from
+
+    Returns:
+        Dictionary with the minimum and mean cosine agreement and whether
+        every text met the threshold
+    """
+    from .embedder import EmbeddingGenerator
+
+    if not texts:
+        raise ValueError("Parity check needs at least one text")
+    reference = EmbeddingGenerator(model_name, registry=registry)
+    candidate = EmbeddingGenerator(
+        model_name,
+        registry=registry,
+        backend=backend,
+        model_cache_dir=cache_dir,
+        quantization_config=quantization_config,
+    )
+    try:
+        expected = reference.generate(texts)
+        actual = candidate.generate(texts)
+    finally:
+        reference.close()
+        candidate.close()
+
+    norms = np.linalg.norm(expected, axis=1) * np.linalg.norm(actual, axis=1)
+    cosines = np.einsum("ij,ij->i", expected, actual) / np.maximum(norms, 1e-12)
+    return {
+        "model": model_name,
+        "backend": backend,
+        "texts": len(texts),
+        "min_cosine": float(cosines.min()),
+        "mean_cosine": float(cosines.mean()),
+        "threshold": threshold,
+        "passed": bool(cosines.min() >= threshold),
+    }
@@ -0,0 +1,166 @@
+"""Persistent, content-addressed cache for text embeddings"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import unicodedata
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """On-disk LRU cache mapping text hashes to embedding vectors"""
+
+    # SQLite limits the number of bound parameters per statement
+    _QUERY_CHUNK = 500
+
+    def __init__(self, path: str, max_entries: int = 200000):
+        """
+        Open (or create) an embedding cache.
+
+        Args:
+            path: Path of the SQLite database file
+            max_entries: Maximum number of vectors kept before LRU eviction
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)"
+        )
+        self._conn.commit()
+        # Logical clock for LRU ordering; resumes from the stored maximum
+        self._clock = self._conn.execute(
+            "SELECT COALESCE(MAX(last_used), 0) FROM embeddings"
+        ).fetchone()[0]
+        # Running row count, so puts never scan the table to enforce the bound
+        self._size = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normalise unicode form and whitespace so trivial edits share a key"""
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    @classmethod
+    def make_key(cls, text: str, model_name: str, embedding_dim: int) -> str:
+        """
+        Build the cache key for a text.
+
+        Args:
+            text: Raw text
+            model_name: Name of the model producing the embedding
+            embedding_dim: Dimension of the embedding
+
+        Returns:
+            Hex digest identifying (model, dimension, normalised text)
+        """
+        payload = f"{model_name}\0{embedding_dim}\0{cls.normalize_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Tuple[Dict[str, np.ndarray], List[str]]:
+        """
+        Look up several keys at once.
+
+        Args:
+            keys: Cache keys to look up
+
+        Returns:
+            Tuple of (hits mapping key to vector, list of missing keys)
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        hits = {}
+        with self._lock:
+            for start in range(0, len(unique_keys), self._QUERY_CHUNK):
+                chunk = unique_keys[start:start + self._QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    hits[key] = np.frombuffer(blob, dtype=np.float32)
+
+            if hits:
+                now = self._tick()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in hits],
+                )
+                self._conn.commit()
+
+        misses = [key for key in unique_keys if key not in hits]
+        return hits, misses
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        """
+        Store several vectors and evict the least recently used overflow.
+
+        Args:
+            items: Mapping of cache key to embedding vector
+        """
+        if not items:
+            return
+
+        with self._lock:
+            now = self._tick()
+            rows = [
+                (key, np.asarray(vector, dtype=np.float32).tobytes(), now)
+                for key, vector in items.items()
+            ]
+            self._size += len(rows) - self._count_present(list(items))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                rows,
+            )
+            overflow = self._size - self.max_entries
+            if overflow > 0:
+                # Walks the last_used index from the oldest entry
+                deleted = self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN ("
+                    "SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+                    (overflow,),
+                ).rowcount
+                self._size -= deleted
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove all cached vectors"""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._size = 0
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._size
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def _count_present(self, keys: List[str]) -> int:
+        """Number of keys already stored, by primary key lookups"""
+        present = 0
+        for start in range(0, len(keys), self._QUERY_CHUNK):
+            chunk = keys[start:start + self._QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            present += self._conn.execute(
+                f"SELECT COUNT(*) FROM embeddings WHERE key IN ({placeholders})", chunk
+            ).fetchone()[0]
+        return present
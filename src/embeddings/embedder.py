@@ -1,29 +1,141 @@
 """Generate embeddings using Sentence Transformers"""
 
+import threading
 import numpy as np
-from typing import List, Union
-from sentence_transformers import SentenceTransformer
+from typing import List, Optional, Union
+
+from src.metrics.collector import count, observe, stage
+
+from .backends import model_key, onnx_loader
+from .cache import EmbeddingCache
+from .encode_pool import EncodePool
+from .registry import ModelRegistry, get_model_registry
+
+# Output sizes of common models, so the dimension is known before loading
+KNOWN_DIMENSIONS = {
+    "all-MiniLM-L6-v2": 384,
+    "all-MiniLM-L12-v2": 384,
+    "paraphrase-MiniLM-L6-v2": 384,
+    "multi-qa-MiniLM-L6-cos-v1": 384,
+    "all-mpnet-base-v2": 768,
+    "sentence-t5-base": 768,
+}
 
 
 class EmbeddingGenerator:
     """Generate embeddings for texts using pre-trained models"""
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        batch_size: int = 32,
+        cache: Optional[EmbeddingCache] = None,
+        registry: Optional[ModelRegistry] = None,
+        backend: str = "torch",
+        model_cache_dir: str = ".model_cache",
+        quantization_config: str = "avx2",
+        encode_workers: int = 0,
+        threads_per_worker: Optional[int] = None,
+        min_pool_texts: int = 256,
+        normalize_embeddings: bool = True
+    ):
         """
         Initialize the embedding generator.
         
+        The model itself is taken from the process-wide model registry on
+        first use, so generators for the same model share one instance.
+        
         Args:
             model_name: Name of the Sentence Transformer model
+            batch_size: Number of texts encoded per forward pass
+            cache: Optional persistent cache consulted before encoding
+            registry: Model registry to draw from (defaults to the shared one)
+            backend: "torch", "onnx" (ONNX Runtime) or "onnx-int8"
+                (ONNX Runtime with dynamic int8 quantization)
+            model_cache_dir: Where exported ONNX models are kept
+            quantization_config: Int8 preset ("arm64", "avx2", "avx512"
+                or "avx512_vnni")
+            encode_workers: Worker processes, each with its own model copy,
+                that large inputs are split across (0 or 1 encodes in-process)
+            threads_per_worker: Intra-op threads per encode worker
+                (defaults to the cores divided by encode_workers)
+            min_pool_texts: Inputs with fewer texts to encode are handled
+                in-process, where there is no transfer overhead
+            normalize_embeddings: Scale embeddings to unit length, which
+                the index distances and CandidateRanker scores assume
         """
-        self.model = SentenceTransformer(model_name)
-        self.embedding_dim = self.model.get_sentence_embedding_dimension()
+        self.model_name = model_name
+        self.backend = backend
+        self.model_id = model_key(model_name, backend)
+        self.batch_size = batch_size
+        self.cache = cache
+        self.registry = registry or get_model_registry()
+        self._loader = None
+        if backend != "torch":
+            self._loader = onnx_loader(
+                model_name,
+                model_cache_dir,
+                quantize=backend == "onnx-int8",
+                quantization_config=quantization_config,
+            )
+        self._model = None
+        self._embedding_dim = KNOWN_DIMENSIONS.get(model_name)
+        self._load_lock = threading.Lock()
+        self.min_pool_texts = min_pool_texts
+        self.normalize_embeddings = normalize_embeddings
+        self._pool = None
+        if encode_workers > 1:
+            self._pool = EncodePool(
+                self._loader or self.registry.loader,
+                self.model_id,
+                encode_workers,
+                threads_per_worker=threads_per_worker,
+                embedding_dim=self._embedding_dim,
+            )
+
+    @property
+    def model(self):
+        """The underlying SentenceTransformer, loaded on first access"""
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    model = self.registry.acquire(self.model_id, self._loader)
+                    dimension = model.get_sentence_embedding_dimension()
+                    if self._embedding_dim not in (None, dimension):
+                        self.registry.release(self.model_id)
+                        raise ValueError(
+                            f"Model '{self.model_name}' produces {dimension}-d embeddings, "
+                            f"expected {self._embedding_dim}"
+                        )
+                    self._embedding_dim = dimension
+                    self._model = model
+        return self._model
 
-    def generate(self, texts: Union[str, List[str]]) -> np.ndarray:
+    @property
+    def embedding_dim(self) -> int:
+        """Embedding dimension (loads the model if it is not a known one)"""
+        if self._embedding_dim is None:
+            return self.model.get_sentence_embedding_dimension()
+        return self._embedding_dim
+
+    def generate(
+        self,
+        texts: Union[str, List[str]],
+        batch_size: Optional[int] = None
+    ) -> np.ndarray:
         """
         Generate embeddings for input texts.
         
+        Cached vectors are reused; the remaining texts are sorted by
+        character length and encoded in batches of similar length so that
+        padding within a batch is minimal. The returned rows are in the
+        same order as the input texts and, with normalize_embeddings,
+        have unit L2 norm whatever the model, so search distances are
+        2 - 2 * cosine as CandidateRanker assumes.
+        
         Args:
             texts: Single text or list of texts
+            batch_size: Texts per batch (defaults to the generator's batch size)
             
         Returns:
             Numpy array of embeddings
@@ -31,9 +143,109 @@ class EmbeddingGenerator:
         if isinstance(texts, str):
             texts = [texts]
         
-        embeddings = self.model.encode(texts, convert_to_numpy=True)
+        with stage("embed"):
+            return self._generate(texts, batch_size or self.batch_size)
+
+    def _generate(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """Serve texts from the cache, encoding the misses"""
+        if self.cache is None:
+            return self._encode(texts, batch_size)
+        
+        keys = [
+            self.cache.make_key(text, self.model_id, self.embedding_dim)
+            for text in texts
+        ]
+        hits, misses = self.cache.get_many(keys)
+        count("embedding_cache_hits_total", len(texts) - len(misses))
+        count("embedding_cache_misses_total", len(misses))
+        if misses:
+            first_index = {}
+            for i, key in enumerate(keys):
+                first_index.setdefault(key, i)
+            missing_texts = [texts[first_index[key]] for key in misses]
+            encoded = self._encode(missing_texts, batch_size)
+            new_items = dict(zip(misses, encoded))
+            self.cache.put_many(new_items)
+            hits.update(new_items)
+        
+        embeddings = np.empty((len(texts), self.embedding_dim), dtype=np.float32)
+        for i, key in enumerate(keys):
+            embeddings[i] = hits[key]
+        # Entries cached before encodes were normalized
+        return self._normalize(embeddings)
+
+    def _encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """Encode texts in length-bucketed batches, preserving input order"""
+        if self._pool is not None and texts and len(texts) >= self.min_pool_texts:
+            return self._encode_in_pool(texts, batch_size)
+        
+        embeddings = np.empty((len(texts), self.embedding_dim), dtype=np.float32)
+        if not texts:
+            return embeddings
+        
+        if len(texts) <= batch_size:
+            order = np.arange(len(texts))
+        else:
+            order = _length_order(texts)
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            observe("encode_batch_size", len(batch))
+            embeddings[batch] = self.model.encode(
+                [texts[i] for i in batch],
+                batch_size=len(batch),
+                convert_to_numpy=True,
+            )
+        count("texts_encoded_total", len(texts))
+        return self._normalize(embeddings)
+
+    def _encode_in_pool(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """Encode texts across the worker processes"""
+        order = _length_order(texts)
+        for start in range(0, len(texts), batch_size):
+            observe("encode_batch_size", min(batch_size, len(texts) - start))
+        embeddings = self._pool.encode(texts, batch_size, order)
+        if self._embedding_dim not in (None, embeddings.shape[1]):
+            raise ValueError(
+                f"Model '{self.model_name}' produces {embeddings.shape[1]}-d embeddings, "
+                f"expected {self._embedding_dim}"
+            )
+        self._embedding_dim = embeddings.shape[1]
+        count("texts_encoded_total", len(texts))
+        return self._normalize(embeddings)
+
+    def _normalize(self, embeddings: np.ndarray) -> np.ndarray:
+        """Scale rows to unit L2 norm in place, if enabled (all-zero rows are kept)"""
+        if self.normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            np.divide(embeddings, norms, out=embeddings, where=norms > 0)
         return embeddings
 
+    def close(self) -> None:
+        """Release this generator's reference to the shared model and stop encode workers"""
+        if self._pool is not None:
+            self._pool.close()
+        with self._load_lock:
+            if self._model is not None:
+                self._model = None
+                self.registry.release(self.model_id)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
     def get_embedding_dimension(self) -> int:
         """Get dimension of embeddings"""
         return self.embedding_dim
+
+
+def _length_order(texts: List[str]) -> np.ndarray:
+    """
+    Return text indices sorted by character length.
+
+    Character counts track token counts closely enough to group texts of
+    similar length, without tokenizing every text twice (encode tokenizes
+    each batch again).
+    """
+    return np.argsort([len(text) for text in texts], kind="stable")
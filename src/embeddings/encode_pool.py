@@ -0,0 +1,167 @@
+"""Worker processes encoding slices of a batch, each with its own model copy"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+
+# Model held by each worker process, loaded once by _init_worker
+_worker_model = None
+
+
+def _pin_threads(threads: int, cores: Optional[List[int]]) -> None:
+    """Limit this process to a thread count and, if given, a set of cores"""
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[variable] = str(threads)
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Only settable before the first parallel op; already fixed otherwise
+        pass
+
+
+def _init_worker(
+    loader: Callable[[str], Any],
+    model_key: str,
+    threads: int,
+    core_sets: Optional[List[List[int]]],
+    counter: Any
+) -> None:
+    """Pin the worker, then load its model copy"""
+    global _worker_model
+    cores = None
+    if core_sets:
+        with counter.get_lock():
+            cores = core_sets[counter.value % len(core_sets)]
+            counter.value += 1
+    _pin_threads(threads, cores)
+    _worker_model = loader(model_key)
+
+
+def _encode_slice(texts: List[str], batch_size: int) -> np.ndarray:
+    """Encode one slice of texts with the worker's model"""
+    return np.asarray(
+        _worker_model.encode(texts, batch_size=batch_size, convert_to_numpy=True),
+        dtype=np.float32,
+    )
+
+
+def _embedding_dimension() -> int:
+    """Output dimension of the worker's model"""
+    return _worker_model.get_sentence_embedding_dimension()
+
+
+class EncodePool:
+    """Encode large inputs across worker processes, reassembling rows in order"""
+
+    def __init__(
+        self,
+        loader: Callable[[str], Any],
+        model_key: str,
+        workers: int,
+        threads_per_worker: Optional[int] = None,
+        pin_cores: bool = True,
+        embedding_dim: Optional[int] = None
+    ):
+        """
+        Configure the pool; workers start and load their model on first use.
+
+        Small models such as MiniLM scale poorly with intra-op threads, so
+        several single-digit-thread copies beat one model using every core.
+        Workers are spawned rather than forked, which is safe once torch
+        or FAISS have started threads in the parent.
+
+        Args:
+            loader: Picklable function building the model from model_key
+                (e.g. a ModelRegistry loader)
+            model_key: Argument passed to loader
+            workers: Number of worker processes
+            threads_per_worker: Intra-op threads per worker (defaults to
+                the available cores divided by workers)
+            pin_cores: Also bind each worker to its own cores where the OS
+                supports it
+            embedding_dim: Output dimension, if known; otherwise learned
+                from the first encode (or asked of a worker)
+        """
+        cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None
+        available = len(cores) if cores else (os.cpu_count() or 1)
+        self.loader = loader
+        self.model_key = model_key
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker or max(1, available // workers)
+        self._core_sets = None
+        if pin_cores and cores and self.threads_per_worker * workers <= len(cores):
+            step = self.threads_per_worker
+            self._core_sets = [cores[i * step:(i + 1) * step] for i in range(workers)]
+        self.embedding_dim = embedding_dim
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        """The executor, started on first use"""
+        if self._executor is None:
+            context = multiprocessing.get_context("spawn")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(
+                    self.loader,
+                    self.model_key,
+                    self.threads_per_worker,
+                    self._core_sets,
+                    context.Value("i", 0),
+                ),
+            )
+        return self._executor
+
+    def encode(self, texts: List[str], batch_size: int, order: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Encode texts across the workers.
+
+        The texts (taken in the given order, e.g. sorted by length) are cut
+        into one contiguous slice per worker, rounded to whole batches.
+
+        Args:
+            texts: Texts to encode
+            batch_size: Texts per forward pass inside a worker
+            order: Index order to encode the texts in (defaults to input order)
+
+        Returns:
+            Array of embeddings, rows aligned with texts
+        """
+        if not texts:
+            if self.embedding_dim is None:
+                self.embedding_dim = self._pool().submit(_embedding_dimension).result()
+            return np.empty((0, self.embedding_dim), dtype=np.float32)
+        if order is None:
+            order = np.arange(len(texts))
+        batches = -(-len(texts) // batch_size)
+        per_worker = -(-batches // self.workers) * batch_size
+        slices = [order[start:start + per_worker] for start in range(0, len(order), per_worker)]
+        pool = self._pool()
+        futures = [
+            pool.submit(_encode_slice, [texts[i] for i in rows], batch_size) for rows in slices
+        ]
+        embeddings = None
+        for rows, future in zip(slices, futures):
+            encoded = future.result()
+            if embeddings is None:
+                embeddings = np.empty((len(texts), encoded.shape[1]), dtype=np.float32)
+            embeddings[rows] = encoded
+        self.embedding_dim = embeddings.shape[1]
+        return embeddings
+
+    def close(self) -> None:
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,130 @@
+"""Process-wide registry sharing loaded embedding models"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+
+def load_sentence_transformer(model_name: str) -> Any:
+    """Load a SentenceTransformer model by name"""
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
+
+class ModelRegistry:
+    """Share loaded models between users, with reference counts and LRU eviction"""
+
+    def __init__(
+        self,
+        max_models: int = 2,
+        loader: Callable[[str], Any] = load_sentence_transformer
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            max_models: Idle models kept loaded before least recently used
+                ones are evicted (models in use are never evicted)
+            loader: Function building a model from its name
+        """
+        self.max_models = max_models
+        self.loader = loader
+        self._lock = threading.Lock()
+        self._models: "OrderedDict[str, Any]" = OrderedDict()
+        self._refcounts: Dict[str, int] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+    def acquire(self, name: str, loader: Optional[Callable[[str], Any]] = None) -> Any:
+        """
+        Get a model, loading it if needed, and take a reference to it.
+
+        Concurrent callers asking for the same model wait for a single load.
+
+        Args:
+            name: Model name (registry key)
+            loader: Override of the registry's loader for this model
+
+        Returns:
+            The shared model instance
+        """
+        with self._lock:
+            if name in self._models:
+                return self._take(name)
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                if name in self._models:
+                    return self._take(name)
+            model = (loader or self.loader)(name)
+            with self._lock:
+                self._models[name] = model
+                self._load_locks.pop(name, None)
+                model = self._take(name)
+                self._evict()
+                return model
+
+    def release(self, name: str) -> None:
+        """
+        Drop a reference taken with acquire().
+
+        Args:
+            name: Model name
+        """
+        with self._lock:
+            if self._refcounts.get(name, 0) > 0:
+                self._refcounts[name] -= 1
+            self._evict()
+
+    def evict(self, name: str) -> bool:
+        """
+        Unload an idle model immediately.
+
+        Args:
+            name: Model name
+
+        Returns:
+            True if the model was unloaded
+        """
+        with self._lock:
+            if name in self._models and not self._refcounts.get(name):
+                del self._models[name]
+                self._refcounts.pop(name, None)
+                return True
+            return False
+
+    def loaded_models(self) -> List[str]:
+        """Names of loaded models, least recently used first"""
+        with self._lock:
+            return list(self._models)
+
+    def refcount(self, name: str) -> int:
+        """Number of live references to a model"""
+        with self._lock:
+            return self._refcounts.get(name, 0)
+
+    def _take(self, name: str) -> Any:
+        """Mark a model as most recently used and count a reference"""
+        self._models.move_to_end(name)
+        self._refcounts[name] = self._refcounts.get(name, 0) + 1
+        return self._models[name]
+
+    def _evict(self) -> None:
+        """Unload least recently used idle models beyond max_models"""
+        excess = len(self._models) - self.max_models
+        for name in list(self._models):
+            if excess <= 0:
+                break
+            if not self._refcounts.get(name):
+                del self._models[name]
+                self._refcounts.pop(name, None)
+                excess -= 1
+
+
+_default_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get the process-wide model registry"""
+    return _default_registry
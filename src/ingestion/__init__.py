@@ -0,0 +1,14 @@
+"""Ingestion module for scanning and loading resume files"""
+
+from src._lazy import lazy_dir, lazy_exports
+
+_EXPORTS = {
+    "NearDuplicateIndex": ".dedup",
+    "scan_resumes": ".scanner",
+    "load_resumes": ".scanner",
+    "stream_resumes": ".pipeline",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+__dir__ = lazy_dir(_EXPORTS, globals())
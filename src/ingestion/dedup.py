@@ -0,0 +1,184 @@
+"""Near-duplicate resume detection with MinHash and LSH banding"""
+
+import hashlib
+import re
+from typing import Dict, Optional, Set, Tuple
+
+import numpy as np
+
+from src._files import atomic_path
+
+# Mersenne prime modulus of the MinHash permutations; products of two
+# values below it fit in uint64
+_PRIME = np.uint64((1 << 31) - 1)
+_WORD = re.compile(r"\w+")
+
+
+class NearDuplicateIndex:
+    """Find near-identical resumes among cluster representatives"""
+
+    def __init__(
+        self,
+        threshold: float = 0.85,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle_size: int = 3,
+        seed: int = 1
+    ):
+        """
+        Create an empty index.
+
+        Texts are compared as sets of word shingles. Signatures are split
+        into bands and hashed into buckets, so a lookup only compares
+        against representatives sharing at least one band; with the
+        defaults, pairs at Jaccard similarity 0.85 share a band with
+        probability above 0.99.
+
+        Args:
+            threshold: Estimated Jaccard similarity from which two texts
+                count as duplicates
+            num_perm: MinHash permutations (signature length)
+            bands: LSH bands; must divide num_perm
+            shingle_size: Words per shingle
+            seed: Seed of the permutations (signatures from different
+                seeds are not comparable)
+        """
+        if num_perm % bands:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), num_perm, dtype=np.uint64)
+        self._signatures: Dict[int, np.ndarray] = {}
+        self._buckets: Dict[Tuple[int, bytes], Set[int]] = {}
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        Compute the MinHash signature of a text.
+
+        Args:
+            text: Resume text
+
+        Returns:
+            uint32 array of length num_perm
+        """
+        words = _WORD.findall(text.lower())
+        size = self.shingle_size
+        shingles = {" ".join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))}
+        hashes = np.fromiter(
+            (
+                int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little")
+                for shingle in shingles
+            ),
+            dtype=np.uint64,
+            count=len(shingles),
+        ) % _PRIME
+        permuted = (hashes[:, None] * self._a + self._b) % _PRIME
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray):
+        """Bucket keys of a signature, one per band"""
+        for band, rows in enumerate(np.split(signature, self.bands)):
+            yield band, rows.tobytes()
+
+    def find(self, signature: np.ndarray) -> Optional[int]:
+        """
+        Find the most similar representative at or above the threshold.
+
+        Args:
+            signature: Signature from signature()
+
+        Returns:
+            Key of the representative, or None
+        """
+        candidates = set()
+        for key in self._band_keys(signature):
+            candidates.update(self._buckets.get(key, ()))
+        best, best_similarity = None, self.threshold
+        for candidate in candidates:
+            similarity = float(np.mean(self._signatures[candidate] == signature))
+            if similarity >= best_similarity:
+                best, best_similarity = candidate, similarity
+        return best
+
+    def add(self, key: int, signature: np.ndarray) -> None:
+        """
+        Register a cluster representative.
+
+        Args:
+            key: Resume ID of the representative
+            signature: Its signature
+        """
+        key = int(key)
+        self.remove(key)
+        self._signatures[key] = signature
+        for bucket in self._band_keys(signature):
+            self._buckets.setdefault(bucket, set()).add(key)
+
+    def get(self, key: int) -> Optional[np.ndarray]:
+        """Get the signature of a representative, if registered"""
+        return self._signatures.get(int(key))
+
+    def remove(self, key: int) -> None:
+        """Forget a representative"""
+        signature = self._signatures.pop(int(key), None)
+        if signature is None:
+            return
+        for bucket in self._band_keys(signature):
+            members = self._buckets[bucket]
+            members.discard(int(key))
+            if not members:
+                del self._buckets[bucket]
+
+    def clear(self) -> None:
+        """Forget all representatives"""
+        self._signatures.clear()
+        self._buckets.clear()
+
+    def save(self, path: str) -> None:
+        """
+        Write the signatures and settings as .npz, atomically replacing any previous file.
+
+        Args:
+            path: Destination file path
+        """
+        keys = np.array(sorted(self._signatures), dtype=np.int64)
+        signatures = np.array([self._signatures[key] for key in keys], dtype=np.uint32)
+        settings = np.array([self.num_perm, self.bands, self.shingle_size, self.seed], dtype=np.int64)
+        with atomic_path(path) as temporary, open(temporary, "wb") as f:
+            np.savez(f, keys=keys, signatures=signatures.reshape(-1, self.num_perm), settings=settings)
+
+    @classmethod
+    def load(cls, path: str, threshold: float = 0.85, **params) -> "NearDuplicateIndex":
+        """
+        Load signatures written with save().
+
+        Signatures computed with other settings cannot be compared, so a
+        file saved with different settings loads as an empty index.
+
+        Args:
+            path: File written by save()
+            threshold: Duplicate threshold (may differ from the saved one)
+            **params: num_perm, bands, shingle_size and seed (see __init__)
+
+        Returns:
+            Loaded NearDuplicateIndex
+        """
+        index = cls(threshold, **params)
+        with np.load(path) as data:
+            settings = [index.num_perm, index.bands, index.shingle_size, index.seed]
+            if data["settings"].tolist() != settings:
+                return index
+            for key, signature in zip(data["keys"], data["signatures"]):
+                index.add(int(key), signature)
+        return index
+
+    def __contains__(self, key: int) -> bool:
+        return int(key) in self._signatures
+
+    def __len__(self) -> int:
+        return len(self._signatures)
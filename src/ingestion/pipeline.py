@@ -0,0 +1,192 @@
+"""Staged resume ingestion: threaded reads feeding a parse pool through bounded queues"""
+
+import contextvars
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.metrics.collector import observe, stage
+
+from .scanner import _load_resume, _worker_parser
+
+# End-of-stream marker passed down the queues
+_DONE = object()
+
+
+class _Failure:
+    """Exception raised in a stage, forwarded to the consumer"""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _parse_texts(texts: List[str], taxonomy_path: Optional[str]) -> List[Dict[str, Any]]:
+    """Parse a chunk of resume texts, reusing the worker's parser"""
+    parser = _worker_parser(taxonomy_path)
+    return [parser.parse(text) for text in texts]
+
+
+def _put(target: "queue.Queue", item: Any, stop: threading.Event, name: str) -> bool:
+    """Block until item is queued or the pipeline stops; False if stopped"""
+    while not stop.is_set():
+        try:
+            target.put(item, timeout=0.1)
+        except queue.Full:
+            continue
+        observe("ingest_queue_depth", target.qsize(), queue=name)
+        return True
+    return False
+
+
+def _start(target: Callable[..., None], *args: Any) -> threading.Thread:
+    """Run a stage in a daemon thread that records into the caller's metrics"""
+    context = contextvars.copy_context()
+    thread = threading.Thread(target=context.run, args=(target, *args), daemon=True)
+    thread.start()
+    return thread
+
+
+def stream_resumes(
+    paths: List[str],
+    parse: bool = True,
+    read_workers: int = 4,
+    parse_workers: Optional[int] = None,
+    chunk_size: int = 64,
+    queue_size: int = 256,
+    taxonomy_path: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Read and parse resumes in a pipeline running ahead of the consumer.
+
+    Reader threads fill a bounded queue with file contents; a dispatcher
+    groups them into chunks for a parse process pool and puts parsed
+    resumes on a second bounded queue that this generator drains. While
+    the caller encodes one batch, the next is being read and parsed; a
+    full queue stalls the stage before it, so memory stays bounded.
+    Depths of the "read" and "parsed" queues are recorded in the
+    ingest_queue_depth histogram.
+
+    Results are yielded in completion order, not input order. Inputs that
+    fit in a single chunk are parsed in the dispatcher thread to avoid
+    pool startup. Closing the generator early stops all stages.
+
+    Args:
+        paths: Resume file paths
+        parse: Run ResumeParser on each resume (skip when only ranking)
+        read_workers: Threads reading files
+        parse_workers: Parse processes (defaults to the CPU count)
+        chunk_size: Resumes sent to a parse process per task
+        queue_size: Capacity of each queue between stages
+        taxonomy_path: Skill taxonomy file for parsing (None uses the bundled one)
+
+    Yields:
+        Dicts with "path", "text", "hash" and "data" (parsed resume or None)
+    """
+    if not paths:
+        return
+    stop = threading.Event()
+    pending_paths: "queue.Queue[str]" = queue.Queue()
+    for path in paths:
+        pending_paths.put(path)
+    read_queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    parsed_queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    read_workers = max(1, min(read_workers, len(paths)))
+
+    def read() -> None:
+        while not stop.is_set():
+            try:
+                path = pending_paths.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                # Parsing happens in the next stage
+                item = _load_resume(path, parse=False)
+            except Exception as error:
+                item = _Failure(error)
+            if not _put(read_queue, item, stop, "read"):
+                return
+        _put(read_queue, _DONE, stop, "read")
+
+    parse_workers = parse_workers or os.cpu_count() or 1
+    executor = None
+    if parse and parse_workers > 1 and len(paths) > chunk_size:
+        executor = ProcessPoolExecutor(max_workers=parse_workers)
+        # Start (fork) the workers now, before the stage threads exist
+        executor.submit(_parse_texts, [], taxonomy_path).result()
+
+    def dispatch() -> None:
+        in_flight: "deque[tuple]" = deque()
+        chunk: List[Dict[str, Any]] = []
+        readers_left = read_workers
+
+        def submit() -> None:
+            texts = [item["text"] for item in chunk]
+            if executor is None:
+                future = Future()
+                with stage("parse"):
+                    future.set_result(_parse_texts(texts, taxonomy_path))
+            else:
+                future = executor.submit(_parse_texts, texts, taxonomy_path)
+            in_flight.append((list(chunk), future))
+            chunk.clear()
+
+        def forward(items: List[Dict[str, Any]], future: Future) -> bool:
+            for item, data in zip(items, future.result()):
+                item["data"] = data
+                if not _put(parsed_queue, item, stop, "parsed"):
+                    return False
+            return True
+
+        while readers_left and not stop.is_set():
+            # Hand on finished chunks; wait for the oldest once too many are in flight
+            while in_flight and (in_flight[0][1].done() or len(in_flight) > 2 * parse_workers):
+                if not forward(*in_flight.popleft()):
+                    return
+            try:
+                item = read_queue.get(timeout=0.05)
+            except queue.Empty:
+                # Flush a partial chunk rather than idle while readers are slow
+                if chunk:
+                    submit()
+                continue
+            if item is _DONE:
+                readers_left -= 1
+            elif not parse or isinstance(item, _Failure):
+                if not _put(parsed_queue, item, stop, "parsed"):
+                    return
+            else:
+                chunk.append(item)
+                if len(chunk) >= chunk_size:
+                    submit()
+        if chunk:
+            submit()
+        while in_flight:
+            if not forward(*in_flight.popleft()):
+                return
+        _put(parsed_queue, _DONE, stop, "parsed")
+
+    def run_dispatch() -> None:
+        try:
+            dispatch()
+        except Exception as error:
+            _put(parsed_queue, _Failure(error), stop, "parsed")
+
+    threads = [_start(read) for _ in range(read_workers)]
+    threads.append(_start(run_dispatch))
+    try:
+        while True:
+            item = parsed_queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
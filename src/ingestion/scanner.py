@@ -0,0 +1,112 @@
+"""Streaming resume directory scan and parallel loading"""
+
+import hashlib
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.parser import ResumeParser, get_skill_matcher
+
+# Parser instances reused by each worker process, keyed by taxonomy path
+_worker_parsers: Dict[Optional[str], ResumeParser] = {}
+
+
+def scan_resumes(resume_dir: str, suffix: str = ".txt") -> Iterator[os.DirEntry]:
+    """
+    Lazily yield resume files in a directory.
+
+    Args:
+        resume_dir: Directory containing resume files
+        suffix: File name suffix of resumes
+
+    Yields:
+        Directory entries of resume files
+    """
+    with os.scandir(resume_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(suffix) and entry.is_file():
+                yield entry
+
+
+def _worker_parser(taxonomy_path: Optional[str]) -> ResumeParser:
+    """This process's parser for a taxonomy, built on first use"""
+    parser = _worker_parsers.get(taxonomy_path)
+    if parser is None:
+        parser = _worker_parsers[taxonomy_path] = ResumeParser(get_skill_matcher(taxonomy_path))
+    return parser
+
+
+def _load_resume(path: str, parse: bool, taxonomy_path: Optional[str] = None) -> Dict[str, Any]:
+    """Read, hash and optionally parse one resume"""
+    with open(path, 'r') as f:
+        text = f.read()
+
+    data = None
+    if parse:
+        data = _worker_parser(taxonomy_path).parse(text)
+
+    return {
+        "path": path,
+        "text": text,
+        # Same digest as ResumeCatalog.content_hash
+        "hash": hashlib.sha1(text.encode("utf-8")).hexdigest(),
+        "data": data,
+    }
+
+
+def _load_chunk(paths: List[str], parse: bool, taxonomy_path: Optional[str]) -> List[Dict[str, Any]]:
+    """Load a chunk of resumes inside a worker process"""
+    return [_load_resume(path, parse, taxonomy_path) for path in paths]
+
+
+def load_resumes(
+    paths: List[str],
+    parse: bool = True,
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+    taxonomy_path: Optional[str] = None,
+    max_pending_chunks: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Read and parse resumes, fanning chunks out to a process pool.
+
+    Results are yielded in completion order, not input order. Inputs that
+    fit in a single chunk are handled in-process to avoid pool startup.
+    Only a bounded number of chunks is in flight at once, so a slow
+    consumer does not make finished results pile up in memory.
+
+    Args:
+        paths: Resume file paths
+        parse: Run ResumeParser on each resume (skip when only ranking)
+        workers: Number of worker processes (defaults to the CPU count)
+        chunk_size: Resumes sent to a worker per task
+        taxonomy_path: Skill taxonomy file for parsing (None uses the bundled one)
+        max_pending_chunks: Chunks submitted but not yet consumed
+            (defaults to twice the worker count)
+
+    Yields:
+        Dicts with "path", "text", "hash" and "data" (parsed resume or None)
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) <= chunk_size:
+        for path in paths:
+            yield _load_resume(path, parse, taxonomy_path)
+        return
+
+    max_pending_chunks = max_pending_chunks or 2 * workers
+    starts = iter(range(0, len(paths), chunk_size))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for start in starts:
+            pending.add(executor.submit(_load_chunk, paths[start:start + chunk_size], parse, taxonomy_path))
+            if len(pending) >= max_pending_chunks:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                start = next(starts, None)
+                if start is not None:
+                    pending.add(
+                        executor.submit(_load_chunk, paths[start:start + chunk_size], parse, taxonomy_path)
+                    )
+                yield from future.result()
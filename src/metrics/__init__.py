@@ -0,0 +1,19 @@
+"""Metrics module for stage timings, counters and profiling"""
+
+from src._lazy import lazy_dir, lazy_exports
+
+_EXPORTS = {
+    "MetricsCollector": ".collector",
+    "enable_metrics": ".collector",
+    "disable_metrics": ".collector",
+    "get_metrics": ".collector",
+    "capture_stats": ".collector",
+    "stage": ".collector",
+    "count": ".collector",
+    "observe": ".collector",
+    "profile_run": ".profiling",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+__dir__ = lazy_dir(_EXPORTS, globals())
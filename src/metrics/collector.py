@@ -0,0 +1,272 @@
+"""Stage timers, counters and histograms with a Prometheus text dump
+
+Recording goes through the module-level helpers stage(), count() and
+observe(). They write to the process-wide collector when metrics are
+enabled and to any collectors opened with capture_stats(); when neither
+is active they return immediately, so instrumented code costs next to
+nothing with metrics off.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+
+_Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, Any]) -> _Key:
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+    parts = [f'{label}="{value}"' for label, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class MetricsCollector:
+    """Thread-safe store of counters and histograms"""
+
+    def __init__(self, prefix: str = "screener"):
+        """
+        Initialize an empty collector.
+
+        Args:
+            prefix: Prepended to metric names in the Prometheus dump
+        """
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters: Dict[_Key, float] = {}
+        # key -> [bucket bounds, per-bucket counts, sum, count]
+        self._histograms: Dict[_Key, list] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Add to a counter"""
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, buckets: Optional[Sequence[float]] = None, **labels: Any) -> None:
+        """
+        Record one observation in a histogram.
+
+        Args:
+            name: Histogram name
+            value: Observed value
+            buckets: Upper bucket bounds, fixed by the first observation
+                (defaults to SIZE_BUCKETS)
+            **labels: Label values distinguishing series of the histogram
+        """
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                bounds = tuple(buckets or SIZE_BUCKETS)
+                histogram = self._histograms[key] = [bounds, [0] * (len(bounds) + 1), 0.0, 0]
+            histogram[1][bisect_left(histogram[0], value)] += 1
+            histogram[2] += value
+            histogram[3] += 1
+
+    def counter(self, name: str, **labels: Any) -> float:
+        """Current value of a counter (0 if never incremented)"""
+        with self._lock:
+            return self._counters.get(_key(name, labels), 0)
+
+    def histogram(self, name: str, **labels: Any) -> Dict[str, float]:
+        """Count, sum and mean of a histogram series"""
+        with self._lock:
+            histogram = self._histograms.get(_key(name, labels))
+            if histogram is None:
+                return {"count": 0, "sum": 0.0, "mean": 0.0}
+            _, _, total, observations = histogram
+            return {"count": observations, "sum": total, "mean": total / observations}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Summarize everything recorded so far.
+
+        Returns:
+            Dictionary with "stages" (calls, total and mean time per stage),
+            "counters" and "histograms" (count, sum and mean per series)
+        """
+        with self._lock:
+            stages = {}
+            histograms = {}
+            for (name, labels), (_, _, total, observations) in sorted(self._histograms.items()):
+                if name == "stage_seconds":
+                    stages[dict(labels)["stage"]] = {
+                        "calls": observations,
+                        "total_s": total,
+                        "mean_ms": total / observations * 1e3,
+                    }
+                else:
+                    histograms[name + _format_labels(labels)] = {
+                        "count": observations,
+                        "sum": total,
+                        "mean": total / observations,
+                    }
+            counters = {
+                name + _format_labels(labels): value
+                for (name, labels), value in sorted(self._counters.items())
+            }
+        return {"stages": stages, "counters": counters, "histograms": histograms}
+
+    def reset(self) -> None:
+        """Drop all recorded values"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            typed = set()
+            for (name, labels), value in sorted(self._counters.items()):
+                metric = f"{self.prefix}_{name}"
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} counter")
+                    typed.add(metric)
+                lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+            for (name, labels), (bounds, counts, total, observations) in sorted(self._histograms.items()):
+                metric = f"{self.prefix}_{name}"
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} histogram")
+                    typed.add(metric)
+                cumulative = 0
+                for bound, bucket_count in zip(bounds, counts):
+                    cumulative += bucket_count
+                    bucket_labels = _format_labels(labels, 'le="%g"' % bound)
+                    lines.append(f"{metric}_bucket{bucket_labels} {cumulative}")
+                bucket_labels = _format_labels(labels, 'le="+Inf"')
+                lines.append(f"{metric}_bucket{bucket_labels} {observations}")
+                lines.append(f"{metric}_sum{_format_labels(labels)} {total:g}")
+                lines.append(f"{metric}_count{_format_labels(labels)} {observations}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+_default: Optional[MetricsCollector] = None
+_captures: ContextVar[Tuple[MetricsCollector, ...]] = ContextVar("metrics_captures", default=())
+
+
+def enable_metrics(collector: Optional[MetricsCollector] = None) -> MetricsCollector:
+    """
+    Turn on process-wide metrics.
+
+    Args:
+        collector: Collector to record into (a new one if omitted and
+            metrics are not already enabled)
+
+    Returns:
+        The process-wide collector
+    """
+    global _default
+    if collector is not None or _default is None:
+        _default = collector or MetricsCollector()
+    return _default
+
+
+def disable_metrics() -> None:
+    """Turn off process-wide metrics"""
+    global _default
+    _default = None
+
+
+def get_metrics() -> Optional[MetricsCollector]:
+    """The process-wide collector, or None when metrics are disabled"""
+    return _default
+
+
+def _active() -> Tuple[MetricsCollector, ...]:
+    captures = _captures.get()
+    return captures if _default is None else (_default, *captures)
+
+
+@contextmanager
+def capture_stats() -> Iterator[MetricsCollector]:
+    """
+    Record metrics from the enclosed code into a fresh collector.
+
+    Works whether or not process-wide metrics are enabled; captures nest.
+
+    Yields:
+        The collector receiving this block's metrics
+    """
+    collector = MetricsCollector()
+    token = _captures.set(_captures.get() + (collector,))
+    try:
+        yield collector
+    finally:
+        _captures.reset(token)
+
+
+def count(name: str, value: float = 1, **labels: Any) -> None:
+    """Add to a counter in every active collector"""
+    if _default is None and not _captures.get():
+        return
+    for collector in _active():
+        collector.inc(name, value, **labels)
+
+
+def observe(name: str, value: float, buckets: Optional[Sequence[float]] = None, **labels: Any) -> None:
+    """Record a histogram observation in every active collector"""
+    if _default is None and not _captures.get():
+        return
+    for collector in _active():
+        collector.observe(name, value, buckets, **labels)
+
+
+class _StageTimer:
+    """Times a block into the stage_seconds histogram"""
+
+    __slots__ = ("name", "collectors", "start")
+
+    def __init__(self, name: str, collectors: Tuple[MetricsCollector, ...]):
+        self.name = name
+        self.collectors = collectors
+
+    def __enter__(self) -> "_StageTimer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        elapsed = time.perf_counter() - self.start
+        for collector in self.collectors:
+            collector.observe("stage_seconds", elapsed, SECONDS_BUCKETS, stage=self.name)
+
+
+class _NullTimer:
+    """Stand-in returned by stage() when nothing is recording"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def stage(name: str):
+    """
+    Context manager timing a pipeline stage.
+
+    Args:
+        name: Stage name (e.g. "parse", "embed", "search", "rank")
+
+    Returns:
+        A timer, or a shared no-op when no collector is active
+    """
+    if _default is None and not _captures.get():
+        return _NULL_TIMER
+    return _StageTimer(name, _active())
@@ -0,0 +1,33 @@
+"""Opt-in cProfile capture of a single run"""
+
+import cProfile
+import pstats
+import sys
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+@contextmanager
+def profile_run(path: Optional[str] = None, sort: str = "cumulative", limit: int = 30) -> Iterator[cProfile.Profile]:
+    """
+    Profile the enclosed code with cProfile.
+
+    Args:
+        path: Write raw stats here (open with pstats or snakeviz); when
+            omitted, the top functions are printed to stderr
+        sort: pstats sort key for the printed summary
+        limit: Number of functions printed
+
+    Yields:
+        The running profiler
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if path:
+            profiler.dump_stats(path)
+        else:
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats(sort).print_stats(limit)
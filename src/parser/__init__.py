@@ -1,6 +1,14 @@
 """Resume and job description parser module"""
 
-from .resume_parser import ResumeParser
-from .job_parser import JobDescriptionParser
+from src._lazy import lazy_dir, lazy_exports
 
-__all__ = ["ResumeParser", "JobDescriptionParser"]
+_EXPORTS = {
+    "ResumeParser": ".resume_parser",
+    "JobDescriptionParser": ".job_parser",
+    "SkillMatcher": ".skill_matcher",
+    "get_skill_matcher": ".skill_matcher",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+__dir__ = lazy_dir(_EXPORTS, globals())
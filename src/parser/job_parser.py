@@ -1,12 +1,43 @@
 """Job description parser for extracting requirements and qualifications"""
 
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+from .skill_matcher import SkillMatcher, get_skill_matcher
+
+
+def experience_level(text: str) -> str:
+    """
+    Classify the seniority a text asks for (or, for a resume, describes).
+
+    Args:
+        text: Job description or resume text
+
+    Returns:
+        "senior", "junior", "mid-level" or "entry-level"
+    """
+    text_lower = text.lower()
+    if "senior" in text_lower or "10+ years" in text_lower:
+        return "senior"
+    elif "junior" in text_lower or "0-2 years" in text_lower:
+        return "junior"
+    elif "mid" in text_lower or "3-5 years" in text_lower:
+        return "mid-level"
+    return "entry-level"
 
 
 class JobDescriptionParser:
     """Parse job descriptions and extract requirements"""
 
+    def __init__(self, skill_matcher: Optional[SkillMatcher] = None):
+        """
+        Initialize the job description parser.
+        
+        Args:
+            skill_matcher: Skill taxonomy matcher (defaults to the shared one)
+        """
+        self.skill_matcher = skill_matcher or get_skill_matcher()
+
     def parse(self, job_text: str) -> Dict[str, Any]:
         """
         Parse job description and extract structured information.
@@ -54,28 +85,8 @@ class JobDescriptionParser:
 
     def _extract_skills(self, text: str) -> List[str]:
         """Extract required skills from job description"""
-        # Common technical skills
-        tech_skills = [
-            "python", "java", "javascript", "typescript", "c++", "rust",
-            "sql", "nosql", "mongodb", "postgres", "mysql",
-            "react", "angular", "vue", "node", "django", "flask",
-            "aws", "azure", "gcp", "docker", "kubernetes",
-            "machine learning", "ai", "nlp", "deep learning",
-        ]
-        found_skills = []
-        text_lower = text.lower()
-        for skill in tech_skills:
-            if skill in text_lower:
-                found_skills.append(skill)
-        return found_skills
+        return self.skill_matcher.find(text)
 
     def _extract_experience_level(self, text: str) -> str:
         """Determine experience level required"""
-        text_lower = text.lower()
-        if "senior" in text_lower or "10+ years" in text_lower:
-            return "senior"
-        elif "junior" in text_lower or "0-2 years" in text_lower:
-            return "junior"
-        elif "mid" in text_lower or "3-5 years" in text_lower:
-            return "mid-level"
-        return "entry-level"
+        return experience_level(text)
@@ -1,77 +1,182 @@
 """Resume parser for extracting structured information from resumes"""
 
 import re
-from typing import Dict, List, Any
+from bisect import bisect_left
+from typing import Dict, List, Any, Optional, Tuple
+
+from .skill_matcher import SkillMatcher, get_skill_matcher
+
+SECTION_HEADERS = ["experience", "education", "skills", "projects", "certifications"]
+DEGREES = ["Bachelor", "Master", "PhD", "Diploma", "Associate"]
+ROLE_KEYWORDS = ["Engineer", "Manager", "Developer", "Analyst", "Designer"]
+
+# Keywords located by the scan; headers and degrees are case-insensitive
+_CASELESS_KEYWORDS = (
+    ("header", ("experience", "education", "skill", "projects", "certifications")),
+    ("degree", ("bachelor", "master", "phd", "diploma", "associate")),
+)
+# Fallback for non-ASCII text, where lower() and re.IGNORECASE disagree.
+# None of these words can overlap another, so non-overlapping matching
+# sees every occurrence.
+_TOKEN_PATTERN = re.compile(
+    r"(?P<header>(?i:experience|education|skills?|projects|certifications))"
+    r"|(?P<degree>(?i:bachelor|master|phd|diploma|associate))"
+    r"|(?P<role>Engineer|Manager|Developer|Analyst|Designer)"
+)
+_WHITESPACE = re.compile(r"\s*")
+_DEGREE_TAIL = re.compile(r"[^.\n]+")
+_ROLE_PATTERN = re.compile(
+    r"([A-Z][a-z\s]+(?:Engineer|Manager|Developer|Analyst|Designer).*?)(?=\n[A-Z]|\Z)",
+    re.MULTILINE,
+)
 
 
 class ResumeParser:
     """Parse resume text and extract structured information"""
 
-    def __init__(self):
+    def __init__(self, skill_matcher: Optional[SkillMatcher] = None):
+        """
+        Initialize the resume parser.
+
+        Args:
+            skill_matcher: Skill taxonomy matcher (defaults to the shared one)
+        """
         self.sections = {}
+        self.skill_matcher = skill_matcher or get_skill_matcher()
 
     def parse(self, resume_text: str) -> Dict[str, Any]:
         """
         Parse resume text and extract structured information.
-        
+
         Args:
             resume_text: Raw resume text
-            
+
         Returns:
-            Dictionary containing parsed resume data
+            Dictionary containing parsed resume data. "skills" holds the
+            raw entries of the "Skills:" section as written; use
+            "canonical_skills" (taxonomy names found anywhere in the text)
+            to compare skills across resumes and jobs
         """
+        tokens = self._scan(resume_text)
         parsed_resume = {
             "text": resume_text,
-            "sections": self._extract_sections(resume_text),
-            "skills": self._extract_skills(resume_text),
-            "experience": self._extract_experience(resume_text),
-            "education": self._extract_education(resume_text),
+            "sections": self._extract_sections(resume_text, tokens),
+            "skills": self._extract_skills(resume_text, tokens),
+            "canonical_skills": self.skill_matcher.find(resume_text),
+            "experience": self._extract_experience(resume_text, tokens),
+            "education": self._extract_education(resume_text, tokens),
         }
         return parsed_resume
 
-    def _extract_sections(self, text: str) -> Dict[str, str]:
+    def _scan(self, text: str) -> Dict[str, List[Tuple[int, int, str]]]:
+        """Locate headers, degrees and role keywords as (start, end, word)"""
+        if not text.isascii():
+            tokens = {"header": [], "degree": [], "role": []}
+            for match in _TOKEN_PATTERN.finditer(text):
+                tokens[match.lastgroup].append((match.start(), match.end(), match.group().casefold()))
+            return tokens
+
+        # str.find runs at memchr speed, far faster than a regex alternation
+        lowered = text.lower()
+        tokens = {}
+        for kind, words in _CASELESS_KEYWORDS:
+            found = []
+            for word in words:
+                position = lowered.find(word)
+                while position != -1:
+                    end = position + len(word)
+                    if word == "skill" and lowered.startswith("s", end):
+                        end += 1
+                    found.append((position, end, lowered[position:end]))
+                    position = lowered.find(word, end)
+            found.sort()
+            tokens[kind] = found
+
+        roles = []
+        for word in ROLE_KEYWORDS:
+            position = text.find(word)
+            while position != -1:
+                roles.append((position, position + len(word), word))
+                position = text.find(word, position + len(word))
+        roles.sort()
+        tokens["role"] = roles
+        return tokens
+
+    def _extract_sections(self, text: str, tokens: Dict[str, List[Tuple[int, int, str]]]) -> Dict[str, str]:
         """Extract major sections from resume"""
+        # A section runs from the first occurrence of its header to the
+        # nearest following line that starts with the same header, or to
+        # the trailing newline of the text.
+        length = len(text)
+        text_end = []
+        if text.endswith("\n"):
+            text_end.append(length - 1)
+        if text.endswith("\n\n"):
+            text_end.append(length - 2)
+
+        occurrences = {header: [] for header in SECTION_HEADERS}
+        for position, end, word in tokens["header"]:
+            if word in occurrences:
+                occurrences[word].append((position, end))
+
         sections = {}
-        # Simple section detection based on common headers
-        headers = ["experience", "education", "skills", "projects", "certifications"]
-        for header in headers:
-            pattern = rf"{header}:?(.*?)(?=\n(?:{header}|$))"
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if match:
-                sections[header] = match.group(1).strip()
+        for header in SECTION_HEADERS:
+            positions = occurrences[header]
+            if not positions:
+                continue
+            ends = sorted(
+                [position - 1 for position, _ in positions if position and text[position - 1] == "\n"]
+                + text_end
+            )
+            start = positions[0][1]
+            if start < length and text[start] == ":":
+                start += 1
+            index = bisect_left(ends, start)
+            if index < len(ends):
+                sections[header] = text[start:ends[index]].strip()
         return sections
 
-    def _extract_skills(self, text: str) -> List[str]:
+    def _extract_skills(self, text: str, tokens: Dict[str, List[Tuple[int, int, str]]]) -> List[str]:
         """Extract skills from resume"""
-        # Simple skill extraction - can be enhanced
+        # Each "skill(s):" marker opens a span that ends at the next blank line
         skills = []
-        skills_patterns = [
-            r"skills?:?\s*(.*?)(?=\n\n|\Z)",
-        ]
-        for pattern in skills_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.DOTALL)
-            for match in matches:
-                skills.extend([s.strip() for s in match.split(",") if s.strip()])
+        span_end = 0
+        for position, end, word in tokens["header"]:
+            if not word.startswith("skill") or position < span_end:
+                continue
+            start = end
+            if start < len(text) and text[start] == ":":
+                start += 1
+            start = _WHITESPACE.match(text, start).end()
+            span_end = text.find("\n\n", start)
+            if span_end == -1:
+                span_end = len(text)
+            skills.extend([s.strip() for s in text[start:span_end].split(",") if s.strip()])
         return list(set(skills))
 
-    def _extract_experience(self, text: str) -> List[Dict[str, str]]:
+    def _extract_experience(self, text: str, tokens: Dict[str, List[Tuple[int, int, str]]]) -> List[Dict[str, str]]:
         """Extract work experience from resume"""
-        experience = []
-        # Pattern for job titles and companies
-        pattern = r"([A-Z][a-z\s]+(?:Engineer|Manager|Developer|Analyst|Designer).*?)(?=\n[A-Z]|\Z)"
-        matches = re.findall(pattern, text, re.MULTILINE)
-        for match in matches:
-            experience.append({"role": match.strip()})
-        return experience
-
-    def _extract_education(self, text: str) -> List[Dict[str, str]]:
+        if not tokens["role"]:
+            return []
+        # No role can start before the run of lowercase/whitespace that
+        # precedes the first role keyword
+        start = tokens["role"][0][0]
+        while start > 0 and ("a" <= text[start - 1] <= "z" or text[start - 1].isspace()):
+            start -= 1
+        start = max(start - 1, 0)
+        return [{"role": match.strip()} for match in _ROLE_PATTERN.findall(text, start)]
+
+    def _extract_education(self, text: str, tokens: Dict[str, List[Tuple[int, int, str]]]) -> List[Dict[str, str]]:
         """Extract education from resume"""
-        education = []
-        # Pattern for degrees
-        degrees = ["Bachelor", "Master", "PhD", "Diploma", "Associate"]
-        for degree in degrees:
-            pattern = rf"{degree}[^.\n]+"
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                education.append({"degree": match.strip()})
-        return education
+        # Degree entries run to the end of the sentence or line; matches of
+        # the same degree never overlap, different degrees may
+        by_degree = {degree.lower(): [] for degree in DEGREES}
+        span_end = dict.fromkeys(by_degree, 0)
+        for position, end, word in tokens["degree"]:
+            if position < span_end[word]:
+                continue
+            match = _DEGREE_TAIL.match(text, end)
+            if match:
+                by_degree[word].append({"degree": text[position:match.end()].strip()})
+                span_end[word] = match.end()
+        return [entry for degree in by_degree.values() for entry in degree]
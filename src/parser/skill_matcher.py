@@ -0,0 +1,135 @@
+"""Word-boundary skill matching against a compiled taxonomy trie"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), "data", "skills.txt")
+
+# Words are runs of letters, digits, "+" and "#", optionally joined by dots
+# ("node.js", "asp.net") or led by one (".net"). Everything else, including
+# "-" and "/", separates words, so "ci/cd" and "ci cd" tokenize alike.
+_WORD_PATTERN = re.compile(r"\.?[a-z0-9+#]+(?:\.[a-z0-9+#]+)*")
+
+# Trie key marking the end of a phrase; never produced by the tokenizer
+_END = ""
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase words for skill matching"""
+    return _WORD_PATTERN.findall(text.lower())
+
+
+class SkillMatcher:
+    """Find taxonomy skills in text in a single pass over its words"""
+
+    def __init__(self, taxonomy: Dict[str, Iterable[str]]):
+        """
+        Compile a taxonomy into a word-level trie.
+
+        Args:
+            taxonomy: Mapping of canonical skill name to its synonyms
+        """
+        self._trie: Dict[str, dict] = {}
+        self.skills: List[str] = []
+        for canonical, synonyms in taxonomy.items():
+            self.skills.append(canonical)
+            for phrase in [canonical, *synonyms]:
+                self._insert(phrase, canonical)
+
+    def _insert(self, phrase: str, canonical: str) -> None:
+        """Add one phrase to the trie"""
+        words = tokenize(phrase)
+        if not words:
+            return
+        node = self._trie
+        for word in words:
+            node = node.setdefault(word, {})
+        node.setdefault(_END, canonical)
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillMatcher":
+        """
+        Load a taxonomy file.
+
+        Each non-empty line holds a canonical skill followed by optional
+        synonyms, separated by "|". Lines starting with "#" are comments.
+
+        Args:
+            path: Taxonomy file path
+
+        Returns:
+            Compiled SkillMatcher
+        """
+        taxonomy = {}
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                names = [name.strip() for name in line.split("|") if name.strip()]
+                taxonomy.setdefault(names[0].lower(), []).extend(names[1:])
+        return cls(taxonomy)
+
+    def find_spans(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Find leftmost-longest skill mentions.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            List of (first word, end word, canonical skill) tuples
+        """
+        words = tokenize(text)
+        trie = self._trie
+        spans = []
+        covered = 0
+        # Only words that begin some phrase can start a match
+        for position in [i for i, word in enumerate(words) if word in trie]:
+            if position < covered:
+                continue
+            node = trie
+            match = None
+            end = position
+            while end < len(words):
+                node = node.get(words[end])
+                if node is None:
+                    break
+                end += 1
+                if _END in node:
+                    match = (position, end, node[_END])
+            if match:
+                spans.append(match)
+                covered = match[1]
+        return spans
+
+    def find(self, text: str) -> List[str]:
+        """
+        Find the distinct canonical skills mentioned in text.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            Canonical skill names in order of first mention
+        """
+        return list(dict.fromkeys(skill for _, _, skill in self.find_spans(text)))
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+
+@lru_cache(maxsize=None)
+def get_skill_matcher(path: Optional[str] = None) -> SkillMatcher:
+    """
+    Get the process-wide matcher for a taxonomy file.
+
+    Args:
+        path: Taxonomy file path (None uses the bundled taxonomy)
+
+    Returns:
+        Shared SkillMatcher instance
+    """
+    return SkillMatcher.from_file(path or DEFAULT_TAXONOMY_PATH)
@@ -1,5 +1,12 @@
 """Ranking module for candidate scoring and ranking"""
 
-from .ranker import CandidateRanker
+from src._lazy import lazy_dir, lazy_exports
 
-__all__ = ["CandidateRanker"]
+_EXPORTS = {
+    "CandidateRanker": ".ranker",
+    "QueryResultCache": ".result_cache",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+__dir__ = lazy_dir(_EXPORTS, globals())
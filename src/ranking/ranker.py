@@ -1,48 +1,130 @@
 """Rank candidates based on job-resume similarity"""
 
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, List, Optional, Union
+
 import numpy as np
-from typing import List, Dict, Any
+
+from src.metrics.collector import count, stage
+
+
+class RankedCandidates(Sequence):
+    """Columnar ranking result, best first; rows become dicts only when read"""
+
+    def __init__(
+        self,
+        candidate_ids: List[Any],
+        scores: np.ndarray,
+        distances: np.ndarray,
+        explain: Callable[[float], str]
+    ):
+        """
+        Wrap ranked columns.
+
+        Args:
+            candidate_ids: Candidate identifiers in rank order
+            scores: Calibrated 0-100 scores in rank order
+            distances: Search distances in rank order
+            explain: Maps a score to its explanation text
+        """
+        self.candidate_ids = candidate_ids
+        self.scores = scores
+        self.distances = distances
+        self._explain = explain
+
+    def __len__(self) -> int:
+        return len(self.candidate_ids)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], "RankedCandidates"]:
+        if isinstance(index, slice):
+            return RankedCandidates(
+                self.candidate_ids[index], self.scores[index], self.distances[index], self._explain
+            )
+        score = float(self.scores[index])
+        return {
+            "candidate_id": self.candidate_ids[index],
+            "score": score,
+            "distance": float(self.distances[index]),
+            "explanation": self._explain(score),
+        }
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Materialize every row as a dict"""
+        return [self[i] for i in range(len(self))]
 
 
 class CandidateRanker:
     """Rank candidates based on their matching scores"""
 
-    def __init__(self):
+    def __init__(self, max_distance: float = 2.0):
+        """
+        Initialize the ranker.
+
+        Args:
+            max_distance: Search distance that scores 0. The default suits
+                unit-length embeddings (EmbeddingGenerator normalizes its
+                output), whose distance is 2 - 2 * cosine for
+                both "flat_l2" and "cosine" indexes, so a score is the cosine
+                similarity times 100 (negative similarities score 0)
+        """
+        self.max_distance = max_distance
         self.candidates = []
 
+    def score(self, distances: np.ndarray) -> np.ndarray:
+        """
+        Calibrate search distances to 0-100 scores.
+
+        The mapping is fixed, so a resume scores the same whatever else
+        was retrieved with it, and scores can be cached and compared
+        across runs.
+
+        Args:
+            distances: Array of distances from query
+
+        Returns:
+            Array of scores
+        """
+        distances = np.asarray(distances, dtype=np.float32)
+        return 100 * np.clip(1 - distances / np.float32(self.max_distance), 0, 1)
+
     def rank_candidates(
-        self, 
-        distances: np.ndarray, 
-        candidate_ids: List[str],
-        job_title: str = ""
-    ) -> List[Dict[str, Any]]:
+        self,
+        distances: np.ndarray,
+        candidate_ids: List[Any],
+        job_title: str = "",
+        top_k: Optional[int] = None
+    ) -> RankedCandidates:
         """
         Rank candidates based on similarity distances.
-        
+
         Args:
             distances: Array of distances from query
-            candidate_ids: List of candidate identifiers
+            candidate_ids: Candidate identifiers aligned with distances
             job_title: Job title for context
-            
+            top_k: Keep only the best top_k candidates (all if None)
+
         Returns:
-            List of ranked candidates with scores
-        """
-        # Convert L2 distances to similarity scores (0-100)
-        # Normalize distances to scores
-        max_distance = np.max(distances) if len(distances) > 0 else 1
-        scores = 100 * (1 - distances / (max_distance + 1e-6))
-        
-        ranked = []
-        for candidate_id, score, distance in zip(candidate_ids, scores, distances):
-            ranked.append({
-                "candidate_id": candidate_id,
-                "score": float(score),
-                "distance": float(distance),
-                "explanation": self._generate_explanation(score)
-            })
-        
-        # Sort by score descending
-        ranked.sort(key=lambda x: x["score"], reverse=True)
+            RankedCandidates, best first
+        """
+        with stage("rank"):
+            distances = np.asarray(distances, dtype=np.float32)
+            k = len(distances) if top_k is None else min(top_k, len(distances))
+            if k < len(distances):
+                # Partition out the best k, then sort just those
+                best = np.argpartition(distances, k - 1)[:k] if k else np.empty(0, dtype=np.int64)
+                order = best[np.argsort(distances[best], kind="stable")]
+            else:
+                order = np.argsort(distances, kind="stable")
+
+            if isinstance(candidate_ids, np.ndarray):
+                ranked_ids = candidate_ids[order].tolist()
+            else:
+                ranked_ids = [candidate_ids[i] for i in order]
+            ranked_distances = distances[order]
+            ranked = RankedCandidates(
+                ranked_ids, self.score(ranked_distances), ranked_distances, self._generate_explanation
+            )
+        count("candidates_ranked_total", len(ranked))
         return ranked
 
     def _generate_explanation(self, score: float) -> str:
@@ -0,0 +1,132 @@
+"""In-memory cache of parsed jobs, job embeddings and ranked results"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from src.metrics.collector import count
+
+
+class QueryResultCache:
+    """Bounded LRU cache with per-entry expiry for repeated job searches"""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: Optional[float] = 3600.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Create an empty cache.
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+            ttl_seconds: Lifetime of an entry (None keeps entries until evicted)
+            clock: Time source in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (expiry time, value), least recently used first
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    @staticmethod
+    def job_key(job_text: str, model_name: str) -> str:
+        """
+        Key of a job's parsed data and embedding.
+
+        Args:
+            job_text: Raw job description text
+            model_name: Model producing the embedding
+
+        Returns:
+            Hex digest identifying (model, text)
+        """
+        payload = f"job\0{model_name}\0{job_text}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def result_key(
+        job_text: str,
+        model_name: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        index_version: int,
+        catalog_version: int = 0
+    ) -> str:
+        """
+        Key of a ranked result list.
+
+        Args:
+            job_text: Raw job description text
+            model_name: Model that embedded the job and the index
+            top_k: Number of results requested
+            filters: Metadata filters of the search
+            index_version: FAISSSearcher.version at search time, so that
+                results computed before any add or remove never match
+            catalog_version: ResumeCatalog.version at search time, which
+                also changes when only near-duplicates join or leave
+
+        Returns:
+            Hex digest identifying the search
+        """
+        payload = "\0".join([
+            "results",
+            model_name,
+            str(top_k),
+            json.dumps(filters or {}, sort_keys=True),
+            str(index_version),
+            str(catalog_version),
+            job_text,
+        ])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up an entry, refreshing its LRU position.
+
+        Args:
+            key: Entry key
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] <= self._clock():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                count("query_cache_misses_total")
+                return None
+            self._entries.move_to_end(key)
+        count("query_cache_hits_total")
+        return entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store an entry, evicting the least recently used beyond max_entries.
+
+        Args:
+            key: Entry key
+            value: Value to cache (treated as read-only)
+        """
+        expires = None if self.ttl_seconds is None else self._clock() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                count("query_cache_evictions_total")
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
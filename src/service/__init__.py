@@ -0,0 +1,13 @@
+"""Service module exposing the screener over HTTP"""
+
+from src._lazy import lazy_dir, lazy_exports
+
+_EXPORTS = {
+    "MicroBatcher": ".batcher",
+    "ScoringService": ".server",
+    "run_service": ".server",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+__dir__ = lazy_dir(_EXPORTS, globals())
@@ -0,0 +1,186 @@
+"""Coalesce concurrent requests into batched calls"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+
+class MicroBatcher:
+    """Gather items submitted concurrently and process them in batches"""
+
+    def __init__(
+        self,
+        fn: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        max_concurrency: int = 1,
+        max_pending: int = 1024
+    ):
+        """
+        Initialize the batcher.
+
+        Each batch is handed to fn on a worker thread, so the event loop
+        keeps accepting requests while a batch is processed. A batch is
+        dispatched once it holds max_batch_size items or its first item
+        has waited max_wait_ms, whichever comes first.
+
+        Args:
+            fn: Blocking function mapping a list of items to one result each
+            max_batch_size: Most items passed to fn in one call
+            max_wait_ms: Longest time the first item of a batch waits for more
+            max_concurrency: Batches processed at the same time (worker threads)
+            max_pending: Queued items before submit() rejects new ones
+        """
+        if max_batch_size < 1 or max_concurrency < 1:
+            raise ValueError("max_batch_size and max_concurrency must be positive")
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.stats = {"requests": 0, "rejected": 0, "batches": 0, "batched_items": 0}
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._inflight: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Start collecting batches on the running event loop"""
+        if self._collector is not None:
+            return
+        self._queue = asyncio.Queue(self.max_pending)
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._executor = ThreadPoolExecutor(self.max_concurrency, thread_name_prefix="batcher")
+        self._collector = asyncio.ensure_future(self._collect())
+
+    async def close(self) -> None:
+        """Finish in-flight batches and fail items still queued"""
+        if self._collector is None:
+            return
+        self._collector.cancel()
+        try:
+            await self._collector
+        except asyncio.CancelledError:
+            pass
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        while not self._queue.empty():
+            _fail([self._queue.get_nowait()], RuntimeError("MicroBatcher closed"))
+        self._executor.shutdown(wait=True)
+        self._collector = None
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Queue one item and wait for its result.
+
+        Args:
+            item: Item to process
+
+        Returns:
+            The result fn produced for this item
+
+        Raises:
+            asyncio.QueueFull: If max_pending items are already waiting
+        """
+        if self._collector is None:
+            raise RuntimeError("MicroBatcher is not started")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            self.stats["rejected"] += 1
+            raise
+        self.stats["requests"] += 1
+        return await future
+
+    @property
+    def pending(self) -> int:
+        """Items waiting for a batch"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters plus the mean batch size and current queue depth"""
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "mean_batch_size": self.stats["batched_items"] / batches if batches else 0.0,
+            "pending": self.pending,
+            "inflight": len(self._inflight),
+        }
+
+    async def _collect(self) -> None:
+        """Form batches and dispatch them as worker slots free up"""
+        loop = asyncio.get_running_loop()
+        while True:
+            # Wait for a free slot first: while all workers are busy, new
+            # requests keep queueing and the next batch comes out fuller
+            await self._slots.acquire()
+            batch = []
+            try:
+                batch.append(await self._queue.get())
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    if not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    entry = await self._get_before(deadline - loop.time())
+                    if entry is None:
+                        break
+                    batch.append(entry)
+            except BaseException:
+                self._slots.release()
+                _fail(batch, RuntimeError("MicroBatcher closed"))
+                raise
+            task = asyncio.ensure_future(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _get_before(self, timeout: float) -> Optional[Tuple[Any, asyncio.Future]]:
+        """Next queued entry, or None if nothing arrives within timeout"""
+        if timeout <= 0:
+            return None
+        getter = asyncio.ensure_future(self._queue.get())
+        try:
+            done, _ = await asyncio.wait({getter}, timeout=timeout)
+        except asyncio.CancelledError:
+            if getter.done():
+                _fail([getter.result()], RuntimeError("MicroBatcher closed"))
+            getter.cancel()
+            raise
+        if done:
+            return getter.result()
+        # Cancelling a pending get leaves any item it was about to receive
+        # in the queue
+        getter.cancel()
+        return None
+
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        """Run fn over one batch on a worker thread and resolve its futures"""
+        try:
+            # Callers that gave up (e.g. closed connections) are skipped
+            batch = [(item, future) for item, future in batch if not future.done()]
+            if not batch:
+                return
+            self.stats["batches"] += 1
+            self.stats["batched_items"] += len(batch)
+            loop = asyncio.get_running_loop()
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, self.fn, [item for item, _ in batch]
+                )
+            except Exception as error:
+                _fail(batch, error)
+                return
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._slots.release()
+
+
+def _fail(batch: List[Tuple[Any, asyncio.Future]], error: BaseException) -> None:
+    """Resolve every unfinished future in a batch with an error"""
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(error)
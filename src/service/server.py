@@ -0,0 +1,266 @@
+"""Asyncio HTTP service scoring resumes with batched encoding"""
+
+import asyncio
+import json
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from src.metrics.collector import get_metrics
+
+from .batcher import MicroBatcher
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+
+class ScoringService:
+    """Serve score and search requests over HTTP/1.1 with shared batched encodes"""
+
+    def __init__(
+        self,
+        screener: Any,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        max_concurrency: int = 1,
+        max_pending: int = 1024
+    ):
+        """
+        Initialize the service.
+
+        Texts from concurrent requests are encoded together in one
+        EmbeddingGenerator.generate call per batch.
+
+        Args:
+            screener: ResumeScreener used for parsing, encoding and search
+            max_batch_size: Most texts encoded in one call
+            max_wait_ms: Longest time a text waits for its batch to fill
+            max_concurrency: Batches encoded at the same time
+            max_pending: Queued texts before requests are rejected with 503
+        """
+        self.screener = screener
+        self.batcher = MicroBatcher(
+            self._encode,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            max_concurrency=max_concurrency,
+            max_pending=max_pending,
+        )
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._routes = {
+            ("GET", "/health"): self._health,
+            ("GET", "/stats"): self._stats,
+            ("GET", "/metrics"): self._metrics,
+            ("POST", "/score"): self._score,
+            ("POST", "/search"): self._search,
+        }
+
+    def _encode(self, texts: List[str]) -> List[Any]:
+        """Encode one batch; texts repeated across requests are encoded once"""
+        unique = list(dict.fromkeys(texts))
+        embeddings = self.screener.embedder.generate(unique)
+        rows = dict(zip(unique, embeddings))
+        return [rows[text] for text in texts]
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        """
+        Start the batcher and listen for connections.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+
+        Returns:
+            The listening server
+        """
+        await self.batcher.start()
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server
+
+    async def close(self) -> None:
+        """Stop listening and drain the batcher"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.batcher.close()
+
+    async def handle(self, method: str, path: str, body: bytes) -> Tuple[int, Union[Dict[str, Any], str]]:
+        """
+        Route one request.
+
+        Args:
+            method: HTTP method
+            path: Request path (query string ignored)
+            body: Raw request body
+
+        Returns:
+            (HTTP status, JSON-serializable payload or plain text)
+        """
+        path = path.split("?", 1)[0]
+        route = self._routes.get((method, path))
+        if route is None:
+            if any(known == path for _, known in self._routes):
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"{method} not allowed"}
+            return HTTPStatus.NOT_FOUND, {"error": f"Unknown path {path}"}
+
+        payload = {}
+        if method == "POST":
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError:
+                return HTTPStatus.BAD_REQUEST, {"error": "Body is not valid JSON"}
+            if not isinstance(payload, dict):
+                return HTTPStatus.BAD_REQUEST, {"error": "Body must be a JSON object"}
+        try:
+            return HTTPStatus.OK, await route(payload)
+        except (KeyError, TypeError, ValueError) as error:
+            return HTTPStatus.BAD_REQUEST, {"error": str(error)}
+        except asyncio.QueueFull:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Too many pending requests"}
+
+    async def _health(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return {"status": "ok", "index_size": self.screener.searcher.get_index_size()}
+
+    async def _stats(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return self.batcher.snapshot()
+
+    async def _metrics(self, payload: Dict[str, Any]) -> str:
+        """Process-wide metrics in the Prometheus text format (empty if disabled)"""
+        collector = get_metrics()
+        return collector.to_prometheus() if collector is not None else ""
+
+    async def _score(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        resume_text = _text_field(payload, "resume")
+        job_text = _text_field(payload, "job")
+        embeddings = await asyncio.gather(
+            self.batcher.submit(resume_text), self.batcher.submit(job_text)
+        )
+        # Parsing is CPU work too; keep it off the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, lambda: self.screener.match_single_resume(resume_text, job_text, embeddings)
+        )
+
+    async def _search(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        job_text = _text_field(payload, "job")
+        top_k = int(payload.get("top_k", 10))
+        if top_k < 1:
+            raise ValueError("top_k must be positive")
+        filters = payload.get("filters")
+        if filters is not None and not isinstance(filters, dict):
+            raise ValueError("filters must be a JSON object")
+        loop = asyncio.get_running_loop()
+        # Repeated queries are answered from the result cache without encoding
+        candidates = await loop.run_in_executor(
+            None, lambda: self.screener.cached_search(job_text, top_k, filters=filters)
+        )
+        if candidates is None:
+            job_embedding = await self.batcher.submit(job_text)
+            candidates = await loop.run_in_executor(
+                None, lambda: self.screener.search_index(job_text, top_k, job_embedding, filters=filters)
+            )
+        return {"candidates": candidates}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one keep-alive connection"""
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body, keep_alive = request
+                if body is None:
+                    status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Body too large"}
+                    keep_alive = False
+                else:
+                    try:
+                        status, payload = await self.handle(method, path, body)
+                    except Exception as error:
+                        status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": repr(error)}
+                _write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            # Dropped connection, oversized headers or a malformed request line
+            pass
+        finally:
+            writer.close()
+
+
+def _text_field(payload: Dict[str, Any], name: str) -> str:
+    """Fetch a required non-empty string field"""
+    value = payload.get(name)
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"'{name}' must be a non-empty string")
+    return value
+
+
+async def _read_request(reader: asyncio.StreamReader):
+    """Read one request; None at end of stream, body None if it is too large"""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    lines = head.decode("latin-1").split("\r\n")
+    method, path, version = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        keep_alive = connection == "keep-alive"
+    else:
+        keep_alive = connection != "close"
+
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY_BYTES:
+        return method, path, headers, None, False
+    body = await reader.readexactly(length) if length else b""
+    return method, path, headers, body, keep_alive
+
+
+def _write_response(
+    writer: asyncio.StreamWriter,
+    status: int,
+    payload: Union[Dict[str, Any], str],
+    keep_alive: bool
+) -> None:
+    """Write a JSON response, or a Prometheus text one for str payloads"""
+    if isinstance(payload, str):
+        body = payload.encode("utf-8")
+        content_type = "text/plain; version=0.0.4; charset=utf-8"
+    else:
+        body = json.dumps(payload).encode("utf-8")
+        content_type = "application/json"
+    status = HTTPStatus(status)
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+
+
+def run_service(screener: Any, host: str = "127.0.0.1", port: int = 8080, **options: Any) -> None:
+    """
+    Run the scoring service until interrupted.
+
+    Args:
+        screener: ResumeScreener used for parsing, encoding and search
+        host: Interface to bind
+        port: Port to bind
+        **options: ScoringService batching options
+    """
+    async def serve() -> None:
+        service = ScoringService(screener, **options)
+        server = await service.start(host, port)
+        try:
+            await server.serve_forever()
+        finally:
+            await service.close()
+
+    asyncio.run(serve())
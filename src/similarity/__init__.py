@@ -1,5 +1,15 @@
 """Similarity search module using FAISS"""
 
-from .faiss_searcher import FAISSSearcher
+from src._lazy import lazy_dir, lazy_exports
 
-__all__ = ["FAISSSearcher"]
+_EXPORTS = {
+    "FAISSSearcher": ".faiss_searcher",
+    "MetadataStore": ".metadata",
+    "ResumeCatalog": ".catalog",
+    "ShardedSearcher": ".sharded_searcher",
+    "VectorStore": ".vector_store",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+__dir__ = lazy_dir(_EXPORTS, globals())
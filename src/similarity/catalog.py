@@ -0,0 +1,198 @@
+"""Sidecar catalog mapping stable index IDs to resume files"""
+
+import hashlib
+import itertools
+import json
+from typing import Any, Dict, List, Optional, Set
+
+from src._files import atomic_path
+
+from .metadata import MetadataStore
+
+# Process-wide source of catalog versions, so no two states ever share one
+_versions = itertools.count(1)
+
+
+class ResumeCatalog:
+    """Track which resume file each index ID belongs to"""
+
+    def __init__(self, resume_dir: Optional[str] = None, model_name: str = ""):
+        """
+        Initialize an empty catalog.
+
+        Args:
+            resume_dir: Directory the indexed resumes were read from
+            model_name: Embedding model used to build the index
+        """
+        self.resume_dir = resume_dir
+        self.model_name = model_name
+        self.records: Dict[int, Dict[str, Any]] = {}
+        self._ids_by_filename: Dict[str, int] = {}
+        self.metadata = MetadataStore()
+        # representative ID -> IDs of the near-duplicates it stands for
+        self._duplicates: Dict[int, Set[int]] = {}
+        self.next_id = 0
+        # Identity of the index file saved alongside, if recorded (see
+        # ResumeScreener.save_index)
+        self.index_stamp: Optional[List[int]] = None
+        # Changes whenever a resume joins, leaves or changes representative;
+        # results cached under an older version are stale
+        self.version = next(_versions)
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """Hash resume content to detect real modifications"""
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def add(
+        self,
+        filename: str,
+        mtime: float,
+        size: int,
+        digest: str,
+        metadata: Optional[Dict[str, List[str]]] = None,
+        duplicate_of: Optional[int] = None
+    ) -> int:
+        """
+        Register a resume file and allocate its ID.
+
+        Args:
+            filename: Resume file name relative to resume_dir
+            mtime: File modification time
+            size: File size in bytes
+            digest: Content hash of the file
+            metadata: Filterable values (see MetadataStore), if parsed
+            duplicate_of: ID of the indexed resume this one is a near-duplicate
+                of; duplicates share its vector instead of being indexed
+
+        Returns:
+            Newly allocated ID
+        """
+        resume_id = self.next_id
+        self.next_id += 1
+        self.version = next(_versions)
+        self.records[resume_id] = {
+            "filename": filename,
+            "mtime": mtime,
+            "size": size,
+            "hash": digest,
+        }
+        if metadata is not None:
+            self.records[resume_id]["metadata"] = metadata
+            self.metadata.add(resume_id, metadata)
+        self._ids_by_filename[filename] = resume_id
+        if duplicate_of is not None:
+            self.set_representative(resume_id, duplicate_of)
+        return resume_id
+
+    def touch(self, filename: str, mtime: float, size: int) -> None:
+        """Update file stats for a resume whose content did not change"""
+        record = self.records[self._ids_by_filename[filename]]
+        record["mtime"] = mtime
+        record["size"] = size
+
+    def remove(self, resume_ids: List[int]) -> None:
+        """Forget the given IDs"""
+        self.version = next(_versions)
+        for resume_id in resume_ids:
+            if resume_id in self.records:
+                self.set_representative(resume_id, None)
+            record = self.records.pop(resume_id, None)
+            if record is not None:
+                self._ids_by_filename.pop(record["filename"], None)
+        self.metadata.remove(resume_ids)
+
+    def representative(self, resume_id: int) -> int:
+        """Get the indexed ID standing for a resume (itself unless a duplicate)"""
+        return self.records[int(resume_id)].get("duplicate_of", int(resume_id))
+
+    def duplicates(self, resume_id: int) -> List[int]:
+        """List the IDs of the near-duplicates represented by an indexed resume"""
+        return sorted(self._duplicates.get(int(resume_id), ()))
+
+    def set_representative(self, resume_id: int, representative: Optional[int]) -> None:
+        """
+        Point a resume at the indexed resume representing it.
+
+        Args:
+            resume_id: ID of the resume
+            representative: ID of its representative (None makes the resume
+                represent itself)
+        """
+        resume_id = int(resume_id)
+        record = self.records[resume_id]
+        self.version = next(_versions)
+        previous = record.pop("duplicate_of", None)
+        if previous is not None:
+            self._duplicates[previous].discard(resume_id)
+            if not self._duplicates[previous]:
+                del self._duplicates[previous]
+        if representative is not None and int(representative) != resume_id:
+            record["duplicate_of"] = int(representative)
+            self._duplicates.setdefault(int(representative), set()).add(resume_id)
+
+    def indexed_count(self) -> int:
+        """Number of resumes with their own vector in the index"""
+        return len(self.records) - sum(len(ids) for ids in self._duplicates.values())
+
+    def get(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Get the record for a file name, if indexed"""
+        resume_id = self._ids_by_filename.get(filename)
+        return None if resume_id is None else self.records[resume_id]
+
+    def get_id(self, filename: str) -> Optional[int]:
+        """Get the ID of a file name, if indexed"""
+        return self._ids_by_filename.get(filename)
+
+    def filename(self, resume_id: int) -> str:
+        """Get the file name stored under an ID"""
+        return self.records[int(resume_id)]["filename"]
+
+    def filenames(self) -> List[str]:
+        """List all indexed file names"""
+        return list(self._ids_by_filename)
+
+    def save(self, path: str) -> None:
+        """
+        Write the catalog as JSON, atomically replacing any previous file.
+
+        Args:
+            path: Destination file path
+        """
+        data = {
+            "resume_dir": self.resume_dir,
+            "model_name": self.model_name,
+            "next_id": self.next_id,
+            "index_stamp": self.index_stamp,
+            "records": {str(resume_id): record for resume_id, record in self.records.items()},
+        }
+        with atomic_path(path) as temporary, open(temporary, "w") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path: str) -> "ResumeCatalog":
+        """
+        Load a catalog previously written with save().
+
+        Args:
+            path: Catalog file path
+
+        Returns:
+            Loaded ResumeCatalog
+        """
+        with open(path, "r") as f:
+            data = json.load(f)
+        catalog = cls(data.get("resume_dir"), data.get("model_name", ""))
+        catalog.next_id = data.get("next_id", 0)
+        catalog.index_stamp = data.get("index_stamp")
+        for resume_id, record in data.get("records", {}).items():
+            catalog.records[int(resume_id)] = record
+            catalog._ids_by_filename[record["filename"]] = int(resume_id)
+            if "metadata" in record:
+                catalog.metadata.add(int(resume_id), record["metadata"])
+            if "duplicate_of" in record:
+                catalog._duplicates.setdefault(record["duplicate_of"], set()).add(int(resume_id))
+        return catalog
+
+    def __len__(self) -> int:
+        return len(self.records)
@@ -1,58 +1,514 @@
 """FAISS-based similarity search"""
 
+import itertools
+import json
+import os
 import numpy as np
 import faiss
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src._files import atomic_path, file_stamp
+from src.metrics.collector import count, observe, stage
+
+from .index_factory import (
+    COMPRESSED_TYPES,
+    IVF_TYPES,
+    create_index,
+    detect_index_type,
+    id_selector,
+    search_parameters,
+)
+from .vector_store import VectorStore
+
+# Process-wide source of index versions, so no two states ever share one
+_versions = itertools.count(1)
+
+# Map the saved index instead of reading it into memory; unlike
+# IO_FLAG_MMAP, IO_FLAG_MMAP_IFC also maps flat, scalar-quantized and HNSW
+# storage
+_MMAP_FLAGS = faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY
 
 
 class FAISSSearcher:
     """Perform similarity search using FAISS"""
 
-    def __init__(self, embedding_dim: int):
+    # IVF and PQ need roughly this many training points per centroid
+    _MIN_POINTS_PER_CENTROID = 39
+    _MAX_POINTS_PER_CENTROID = 256
+
+    def __init__(
+        self,
+        embedding_dim: int,
+        index_type: str = "flat_l2",
+        nlist: int = 1024,
+        nprobe: int = 16,
+        hnsw_m: int = 32,
+        ef_construction: int = 200,
+        ef_search: int = 64,
+        pq_m: int = 48,
+        pq_nbits: int = 8,
+        rerank_factor: int = 0,
+        vector_path: Optional[str] = None
+    ):
         """
         Initialize FAISS searcher.
-        
+
+        The vector store keeps full-precision copies of all vectors. With
+        a compressed index type and a vector_path, only the compressed
+        codes need to stay in RAM; the float32 vectors live on disk and
+        are paged in for re-ranking and rebuilds.
+
         Args:
             embedding_dim: Dimension of embeddings
+            index_type: Index backend ("flat_l2", "cosine", "ivf", "hnsw",
+                or compressed "sq_fp16", "sq8" and "ivf_pq")
+            nlist: Number of inverted lists for "ivf" and "ivf_pq"
+            nprobe: Default inverted lists visited per query for "ivf" and "ivf_pq"
+            hnsw_m: Graph degree for "hnsw"
+            ef_construction: Build-time search depth for "hnsw"
+            ef_search: Default query-time search depth for "hnsw"
+            pq_m: Sub-quantizers per vector for "ivf_pq"
+            pq_nbits: Bits per sub-quantizer code for "ivf_pq"
+            rerank_factor: Fetch k * rerank_factor hits from the index and
+                keep the k closest by exact distance (0 or 1 disables)
+            vector_path: File backing the vector store (None keeps it in
+                RAM); use vectors_path() of the index path to save in place
         """
         self.embedding_dim = embedding_dim
-        self.index = faiss.IndexFlatL2(embedding_dim)
-        self.embeddings_stored = []
+        self.index_type = index_type
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.pq_m = pq_m
+        self.pq_nbits = pq_nbits
+        self.rerank_factor = rerank_factor
+        self.index = self._create_index()
+        self.store = VectorStore(embedding_dim, path=vector_path)
+        self._next_id = 0
+        # Set by load(mmap=True); the index and store are then shared pages
+        self.read_only = False
+        # Changes on every add or remove; results cached under an older
+        # version are stale
+        self.version = next(_versions)
+
+    @staticmethod
+    def vectors_path(index_path: str) -> str:
+        """Path of the vector store saved next to an index file"""
+        return f"{index_path}.vectors"
+
+    @staticmethod
+    def manifest_path(index_path: str) -> str:
+        """Path of the manifest naming the files of the last save"""
+        return f"{index_path}.manifest.json"
+
+    @classmethod
+    def _part_stamps(cls, index_path: str, rows: int) -> Dict[str, Optional[List[int]]]:
+        """
+        Identity of each file a save publishes.
+
+        The vector file is appended to in place between saves (see
+        VectorStore), so it is pinned by its inode and the row count
+        rather than by its size and modification time.
+        """
+        vector_path = cls.vectors_path(index_path)
+        vectors = file_stamp(vector_path)
+        return {
+            "index": file_stamp(index_path),
+            "vectors": None if vectors is None else [vectors[0], rows],
+            "ids": file_stamp(f"{vector_path}.ids.npy"),
+        }
+
+    def _check_writable(self) -> None:
+        """Refuse to modify an index loaded with mmap=True"""
+        if self.read_only:
+            raise RuntimeError("Index was loaded read-only (mmap=True) and cannot be modified")
+
+    def _create_index(self, nlist: Optional[int] = None, pq_nbits: Optional[int] = None) -> faiss.Index:
+        """Create an empty index that stores caller-supplied int64 IDs"""
+        return create_index(
+            self.index_type,
+            self.embedding_dim,
+            nlist=nlist or self.nlist,
+            hnsw_m=self.hnsw_m,
+            ef_construction=self.ef_construction,
+            pq_m=self.pq_m,
+            pq_nbits=pq_nbits or self.pq_nbits,
+        )
+
+    def _prepare(self, embeddings: np.ndarray) -> np.ndarray:
+        """Convert to a contiguous float32 matrix, normalised for cosine"""
+        embeddings = np.array(embeddings, dtype=np.float32, order="C")
+        if embeddings.ndim == 1:
+            embeddings = embeddings.reshape(1, -1)
+        if self.index_type == "cosine":
+            faiss.normalize_L2(embeddings)
+        return embeddings
+
+    def _trainable_settings(self, size: int) -> Tuple[int, int]:
+        """nlist and pq_nbits that size training points support, capped by the settings"""
+        # Fewer points than centroids cannot be clustered; shrink the index
+        nlist = min(self.nlist, max(1, size // self._MIN_POINTS_PER_CENTROID))
+        pq_nbits = min(self.pq_nbits, max(1, int(np.log2(max(size, 1)))))
+        return nlist, pq_nbits
+
+    def _train(self, embeddings: np.ndarray) -> None:
+        """Train an IVF or quantizing index on a sample of the first vectors added"""
+        nlist, pq_nbits = self._trainable_settings(len(embeddings))
+        self.index = self._create_index(nlist, pq_nbits)
+
+        centroids = max(nlist if self.index_type in IVF_TYPES else 1, 2 ** pq_nbits)
+        sample_size = min(len(embeddings), centroids * self._MAX_POINTS_PER_CENTROID)
+        rng = np.random.default_rng(0)
+        sample = embeddings[rng.choice(len(embeddings), sample_size, replace=False)]
+        self.index.train(sample)
+
+    def train(self, embeddings: np.ndarray) -> None:
+        """
+        Train the index on representative vectors before adding.
 
-    def add_embeddings(self, embeddings: np.ndarray) -> None:
+        Only needed for "ivf", "sq8" and "ivf_pq"; otherwise (or if
+        skipped) the first batch added is used.
+
+        Args:
+            embeddings: Numpy array of shape (n, embedding_dim)
+        """
+        self._check_writable()
+        if not self.index.is_trained:
+            self._train(self._prepare(embeddings))
+
+    def add_embeddings(
+        self,
+        embeddings: np.ndarray,
+        ids: Optional[Iterable[int]] = None
+    ) -> np.ndarray:
         """
         Add embeddings to the index.
-        
+
         Args:
             embeddings: Numpy array of shape (n, embedding_dim)
+            ids: Optional stable IDs for the embeddings (auto-assigned if omitted)
+
+        Returns:
+            Array of the IDs under which the embeddings were stored
         """
-        embeddings = np.asarray(embeddings, dtype=np.float32)
-        self.index.add(embeddings)
-        self.embeddings_stored.extend(embeddings.tolist())
+        self._check_writable()
+        embeddings = self._prepare(embeddings)
+
+        if ids is None:
+            ids = np.arange(self._next_id, self._next_id + len(embeddings), dtype=np.int64)
+        else:
+            ids = np.asarray(list(ids), dtype=np.int64)
+        if len(ids) != len(embeddings):
+            raise ValueError("Number of ids must match number of embeddings")
+        if len(ids) == 0:
+            return ids
 
-    def search(self, query_embedding: np.ndarray, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        with stage("index_add"):
+            if not self.index.is_trained:
+                self._train(embeddings)
+            self.index.add_with_ids(embeddings, ids)
+            self.store.append(embeddings, ids)
+        count("vectors_indexed_total", len(ids))
+        if self._undertrained():
+            with stage("index_retrain"):
+                self.rebuild()
+        self._next_id = max(self._next_id, int(ids.max()) + 1)
+        self.version = next(_versions)
+        return ids
+
+    def remove_ids(self, ids: Iterable[int]) -> int:
+        """
+        Remove embeddings from the index by ID.
+
+        Args:
+            ids: IDs to remove
+
+        Returns:
+            Number of embeddings removed
+        """
+        self._check_writable()
+        ids = np.asarray(list(ids), dtype=np.int64)
+        if len(ids) == 0:
+            return 0
+
+        with stage("index_remove"):
+            removed = self.store.remove(ids)
+            if self.index_type == "hnsw":
+                # HNSW graphs cannot delete nodes; rebuild from the kept vectors
+                self.rebuild()
+            else:
+                self.index.remove_ids(ids)
+        count("vectors_removed_total", removed)
+        self.version = next(_versions)
+        return removed
+
+    def _undertrained(self) -> bool:
+        """
+        Whether an IVF index trained on a small first batch should be retrained.
+
+        True once the stored vectors support at least twice the inverted
+        lists (or more PQ bits) than the index was trained with, so the
+        lists keep growing with the corpus, at geometrically spaced rebuilds.
+        """
+        if self.index_type not in IVF_TYPES:
+            return False
+        ivf = faiss.extract_index_ivf(self.index)
+        nlist, pq_nbits = self._trainable_settings(len(self.store))
+        if nlist >= 2 * ivf.nlist:
+            return True
+        return self.index_type == "ivf_pq" and pq_nbits > faiss.downcast_index(self.index).pq.nbits
+
+    def rebuild(self) -> None:
+        """Recreate the index from the vector store"""
+        self._check_writable()
+        self.index = self._create_index()
+        if len(self.store):
+            if not self.index.is_trained:
+                self._train(self.store.vectors)
+            self.index.add_with_ids(self.store.vectors, self.store.ids)
+
+    def search(
+        self,
+        query_embedding: np.ndarray,
+        k: int = 5,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        rerank_factor: Optional[int] = None,
+        allowed_ids: Optional[Iterable[int]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Search for similar embeddings.
-        
+
+        Distances are always "lower is better": squared L2 for "flat_l2",
+        "ivf", "hnsw" and the compressed types, and 2 - 2 * cosine (the
+        squared L2 distance between unit vectors) for "cosine". Compressed
+        types return approximate distances unless re-ranking is on.
+
         Args:
             query_embedding: Query embedding of shape (1, embedding_dim)
             k: Number of results to return
-            
+            nprobe: Override inverted lists visited for "ivf" and "ivf_pq"
+            ef_search: Override search depth for "hnsw"
+            rerank_factor: Override the exact re-rank shortlist factor
+            allowed_ids: Only consider these IDs (e.g. from MetadataStore.select)
+
+        Returns:
+            Tuple of (distances, ids)
+        """
+        distances, ids = self.search_batch(
+            query_embedding,
+            k,
+            nprobe=nprobe,
+            ef_search=ef_search,
+            rerank_factor=rerank_factor,
+            allowed_ids=allowed_ids,
+        )
+        # FAISS pads with -1 when fewer than k vectors are available
+        found = ids[0] != -1
+        return distances[0][found], ids[0][found]
+
+    def distances(self, query_embedding: np.ndarray, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Exact distances from one query to given vectors, without the index.
+
+        Uses the same "lower is better" convention as search().
+
+        Args:
+            query_embedding: Query embedding of shape (embedding_dim,) or (1, embedding_dim)
+            embeddings: Vectors of shape (n, embedding_dim)
+
+        Returns:
+            Float32 array of n distances
+        """
+        query = self._prepare(query_embedding)
+        embeddings = self._prepare(embeddings)
+        if self.index_type == "cosine":
+            return 2.0 - 2.0 * (embeddings @ query[0])
+        return faiss.pairwise_distances(query, embeddings)[0]
+
+    def search_batch(
+        self,
+        query_embeddings: np.ndarray,
+        k: int = 5,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        rerank_factor: Optional[int] = None,
+        allowed_ids: Optional[Iterable[int]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Search for several queries in a single FAISS call.
+
+        Flat indexes answer a multi-query search with one matrix product,
+        so this is much cheaper than calling search() per query. With
+        allowed_ids, FAISS skips every other vector through an ID
+        selector instead of the caller filtering a larger result.
+
+        Args:
+            query_embeddings: Query embeddings of shape (m, embedding_dim)
+            k: Number of results per query
+            nprobe: Override inverted lists visited for "ivf" and "ivf_pq"
+            ef_search: Override search depth for "hnsw"
+            rerank_factor: Override the exact re-rank shortlist factor
+            allowed_ids: Only consider these IDs (e.g. from MetadataStore.select)
+
         Returns:
-            Tuple of (distances, indices)
+            Tuple of (distances, ids) arrays of shape (m, k); missing
+            results have id -1 and distance inf
         """
-        query_embedding = np.asarray(query_embedding, dtype=np.float32)
-        if query_embedding.ndim == 1:
-            query_embedding = query_embedding.reshape(1, -1)
-        
-        distances, indices = self.index.search(query_embedding, k)
-        return distances[0], indices[0]
+        query_embeddings = self._prepare(query_embeddings)
+        selector = None
+        if allowed_ids is not None:
+            allowed_ids = np.asarray(list(allowed_ids), dtype=np.int64)
+            # The bitmap must outlive the search that reads it
+            selector, _bitmap = id_selector(allowed_ids)
+        if self.index.ntotal == 0 or (allowed_ids is not None and len(allowed_ids) == 0):
+            shape = (len(query_embeddings), k)
+            return np.full(shape, np.inf, dtype=np.float32), np.full(shape, -1, dtype=np.int64)
+
+        factor = self.rerank_factor if rerank_factor is None else rerank_factor
+        shortlist = k * factor if factor > 1 else k
+        params = search_parameters(
+            self.index_type,
+            nprobe=nprobe or self.nprobe,
+            ef_search=max(ef_search or self.ef_search, shortlist),
+            selector=selector,
+        )
+        observe("search_batch_size", len(query_embeddings))
+        with stage("search"):
+            distances, ids = self.index.search(query_embeddings, shortlist, params=params)
+        if shortlist > k:
+            with stage("rerank"):
+                return self._rerank(query_embeddings, ids, k)
+        missing = ids == -1
+        if self.index_type == "cosine":
+            distances = 2.0 - 2.0 * np.where(missing, 0.0, distances).astype(np.float32)
+        distances[missing] = np.inf
+        return distances, ids
+
+    def _rerank(self, queries: np.ndarray, ids: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Keep the k shortlisted IDs per query closest by exact distance"""
+        found = ids != -1
+        rows = np.nonzero(found)[0]
+        vectors = self.store.get(ids[found])
+        if self.index_type == "cosine":
+            exact = 2.0 - 2.0 * np.einsum("ij,ij->i", vectors, queries[rows])
+        else:
+            difference = vectors - queries[rows]
+            exact = np.einsum("ij,ij->i", difference, difference)
+        distances = np.full(ids.shape, np.inf, dtype=np.float32)
+        distances[found] = exact
+        order = np.argsort(distances, axis=1, kind="stable")[:, :k]
+        return np.take_along_axis(distances, order, axis=1), np.take_along_axis(ids, order, axis=1)
+
+    def save(self, path: str) -> None:
+        """
+        Write the index and its vector store to disk.
+
+        Every file is written aside and atomically swapped in, so
+        searchers loading path never see a partial write, and ones that
+        memory-mapped the previous version keep serving it. A store backed
+        by vectors_path(path) is only flushed, as its rows are append-only.
+        A manifest recording the identity of each file goes last; load()
+        checks the files against it, so it never pairs parts of two saves.
+
+        Args:
+            path: Destination index file path
+        """
+        self.store.save(self.vectors_path(path))
+        with atomic_path(path) as temporary:
+            faiss.write_index(self.index, temporary)
+        with atomic_path(self.manifest_path(path)) as temporary, open(temporary, "w") as f:
+            json.dump(self._part_stamps(path, len(self.store)), f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = False, **index_params) -> "FAISSSearcher":
+        """
+        Load an index previously written with save().
+
+        With mmap, the index and vector files are mapped read-only instead
+        of read into memory: every process loading them shares the same
+        page-cache pages, and loading takes little more than opening the
+        files. Such a searcher cannot be modified; load the new version
+        once a writer has saved one. Otherwise the saved vector file is
+        opened in place, without copying it: new rows are appended to it,
+        and removals move the rows to a new file (see VectorStore), so
+        mapped readers are not disturbed and the next save only flushes.
+
+        Args:
+            path: Index file path
+            mmap: Memory-map the files read-only
+            **index_params: Settings such as nprobe or ef_search (see __init__)
+
+        Returns:
+            FAISSSearcher wrapping the loaded index
+
+        Raises:
+            ValueError: If the files on disk do not come from one save,
+                e.g. a writer replaced them while loading
+        """
+        manifest = None
+        if os.path.exists(cls.manifest_path(path)):
+            with open(cls.manifest_path(path)) as f:
+                manifest = json.load(f)
+        index = faiss.read_index(path, _MMAP_FLAGS) if mmap else faiss.read_index(path)
+        vector_path = cls.vectors_path(path)
+        index_type = detect_index_type(index)
+        if index_type == "ivf_pq":
+            # The code layout is fixed by the saved index, not by settings
+            index_params["pq_m"] = faiss.downcast_index(index).pq.M
+        searcher = cls(index.d, index_type=index_type, **index_params)
+        searcher.index = index
+        if os.path.exists(vector_path) and os.path.exists(f"{vector_path}.ids.npy"):
+            searcher.store = VectorStore.load(vector_path, index.d, read_only=mmap)
+        elif searcher.index_type in COMPRESSED_TYPES:
+            raise ValueError(f"Compressed index {path} cannot be loaded without its vector store")
+        else:
+            # Indexes saved without a vector store: read vectors back from FAISS
+            ids, vectors = _stored_vectors(index)
+            searcher.store = VectorStore(index.d, capacity=max(len(ids), 1))
+            searcher.store.append(vectors, ids)
+        # Files replaced after the manifest was read show a different
+        # identity now, whichever version was opened
+        if manifest is not None and cls._part_stamps(path, len(searcher.store)) != manifest:
+            raise ValueError(f"Files of {path} do not match its manifest (replaced while loading?)")
+        if len(searcher.store) != index.ntotal:
+            raise ValueError(f"Vector store of {path} does not match the index (replaced while loading?)")
+        ids = searcher.store.ids
+        searcher._next_id = int(ids.max()) + 1 if len(ids) else 0
+        searcher.read_only = mmap
+        return searcher
 
     def reset(self) -> None:
         """Reset the index"""
-        self.index = faiss.IndexFlatL2(self.embedding_dim)
-        self.embeddings_stored = []
+        self._check_writable()
+        self.index = self._create_index()
+        self.store.clear()
+        self._next_id = 0
+        self.version = next(_versions)
 
     def get_index_size(self) -> int:
         """Get number of embeddings in index"""
         return self.index.ntotal
+
+
+def _stored_vectors(index: faiss.Index) -> Tuple[np.ndarray, np.ndarray]:
+    """Read back the (ids, vectors) held by an IDMap or IVF-Flat index"""
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexIDMap):
+        ids = faiss.vector_to_array(index.id_map)
+        return ids, index.index.reconstruct_n(0, index.ntotal)
+
+    invlists = index.invlists
+    ids, vectors = [], []
+    for list_no in range(index.nlist):
+        size = invlists.list_size(list_no)
+        if size == 0:
+            continue
+        ids.append(faiss.rev_swig_ptr(invlists.get_ids(list_no), size).copy())
+        codes = faiss.rev_swig_ptr(invlists.get_codes(list_no), size * invlists.code_size)
+        vectors.append(codes.copy().view(np.float32).reshape(size, index.d))
+    if not ids:
+        return np.empty(0, dtype=np.int64), np.empty((0, index.d), dtype=np.float32)
+    return np.concatenate(ids), np.concatenate(vectors)
@@ -0,0 +1,147 @@
+"""Factory for the FAISS index backends selectable from config"""
+
+from typing import Optional, Tuple
+
+import faiss
+import numpy as np
+
+INDEX_TYPES = ("flat_l2", "cosine", "ivf", "hnsw", "sq_fp16", "sq8", "ivf_pq")
+
+# Index types that keep lossy codes instead of float32 vectors
+COMPRESSED_TYPES = ("sq_fp16", "sq8", "ivf_pq")
+
+# Index types searched through inverted lists (nlist / nprobe apply)
+IVF_TYPES = ("ivf", "ivf_pq")
+
+_SQ_TYPES = {
+    "sq_fp16": faiss.ScalarQuantizer.QT_fp16,
+    "sq8": faiss.ScalarQuantizer.QT_8bit,
+}
+
+
+def create_index(
+    index_type: str,
+    embedding_dim: int,
+    nlist: int = 1024,
+    hnsw_m: int = 32,
+    ef_construction: int = 200,
+    pq_m: int = 48,
+    pq_nbits: int = 8
+) -> faiss.Index:
+    """
+    Create an empty index that stores caller-supplied int64 IDs.
+
+    Compressed types trade exactness for memory: "sq_fp16" stores 2 bytes
+    per dimension, "sq8" 1 byte, and "ivf_pq" pq_m * pq_nbits / 8 bytes
+    per vector.
+
+    Args:
+        index_type: One of INDEX_TYPES
+        embedding_dim: Dimension of embeddings
+        nlist: Number of inverted lists for "ivf" and "ivf_pq"
+        hnsw_m: Graph degree for "hnsw"
+        ef_construction: Build-time search depth for "hnsw"
+        pq_m: Sub-quantizers per vector for "ivf_pq" (must divide embedding_dim)
+        pq_nbits: Bits per sub-quantizer code for "ivf_pq"
+
+    Returns:
+        FAISS index supporting add_with_ids
+    """
+    if index_type == "flat_l2":
+        return faiss.IndexIDMap(faiss.IndexFlatL2(embedding_dim))
+    if index_type == "cosine":
+        # Inner product over L2-normalised vectors
+        return faiss.IndexIDMap(faiss.IndexFlatIP(embedding_dim))
+    if index_type == "ivf":
+        # IVF keeps its own IDs, so it is not wrapped in IndexIDMap
+        quantizer = faiss.IndexFlatL2(embedding_dim)
+        return faiss.IndexIVFFlat(quantizer, embedding_dim, nlist, faiss.METRIC_L2)
+    if index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(embedding_dim, hnsw_m)
+        index.hnsw.efConstruction = ef_construction
+        return faiss.IndexIDMap(index)
+    if index_type in _SQ_TYPES:
+        return faiss.IndexIDMap(
+            faiss.IndexScalarQuantizer(embedding_dim, _SQ_TYPES[index_type], faiss.METRIC_L2)
+        )
+    if index_type == "ivf_pq":
+        if embedding_dim % pq_m:
+            raise ValueError(f"pq_m={pq_m} does not divide the embedding dimension {embedding_dim}")
+        quantizer = faiss.IndexFlatL2(embedding_dim)
+        return faiss.IndexIVFPQ(quantizer, embedding_dim, nlist, pq_m, pq_nbits)
+    raise ValueError(f"Unknown index type '{index_type}', expected one of {INDEX_TYPES}")
+
+
+def detect_index_type(index: faiss.Index) -> str:
+    """
+    Determine which INDEX_TYPES entry a loaded index was built as.
+
+    Args:
+        index: Index read from disk
+
+    Returns:
+        Index type name
+    """
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexIDMap):
+        index = faiss.downcast_index(index.index)
+    if isinstance(index, faiss.IndexIVFFlat):
+        return "ivf"
+    if isinstance(index, faiss.IndexIVFPQ):
+        return "ivf_pq"
+    if isinstance(index, faiss.IndexScalarQuantizer):
+        for index_type, qtype in _SQ_TYPES.items():
+            if index.sq.qtype == qtype:
+                return index_type
+    if isinstance(index, faiss.IndexHNSWFlat):
+        return "hnsw"
+    if isinstance(index, faiss.IndexFlatIP):
+        return "cosine"
+    if isinstance(index, faiss.IndexFlatL2):
+        return "flat_l2"
+    raise ValueError(f"Unsupported index class {type(index).__name__}")
+
+
+def search_parameters(
+    index_type: str,
+    nprobe: int,
+    ef_search: int,
+    selector: Optional[faiss.IDSelector] = None
+):
+    """
+    Build per-query search parameters for an index type.
+
+    Args:
+        index_type: One of INDEX_TYPES
+        nprobe: Inverted lists visited per query for "ivf" and "ivf_pq"
+        ef_search: Search depth for "hnsw"
+        selector: Restricts the search to the IDs it accepts
+
+    Returns:
+        FAISS SearchParameters, or None when the index has no knobs
+    """
+    if index_type in IVF_TYPES:
+        return faiss.SearchParametersIVF(nprobe=nprobe, sel=selector)
+    if index_type == "hnsw":
+        return faiss.SearchParametersHNSW(efSearch=ef_search, sel=selector)
+    if selector is not None:
+        return faiss.SearchParameters(sel=selector)
+    return None
+
+
+def id_selector(ids: np.ndarray) -> Tuple[faiss.IDSelector, np.ndarray]:
+    """
+    Build a selector accepting only the given IDs.
+
+    Args:
+        ids: Non-negative int64 IDs
+
+    Returns:
+        Tuple of (selector, bitmap backing it); keep the bitmap alive
+        for as long as the selector is used
+    """
+    mask = np.zeros(int(ids.max()) + 1 if len(ids) else 1, dtype=bool)
+    mask[ids] = True
+    bitmap = np.packbits(mask, bitorder="little")
+    # The selector takes the bitmap length in bytes
+    return faiss.IDSelectorBitmap(len(bitmap), faiss.swig_ptr(bitmap)), bitmap
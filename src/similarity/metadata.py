@@ -0,0 +1,161 @@
+"""Per-resume metadata with inverted bitmap indexes for pre-filtering"""
+
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from src.parser.skill_matcher import SkillMatcher
+
+# Filterable fields; a filter on a match-all field requires every listed
+# value, on the others any one of them
+FIELDS = ("skills", "level", "degree")
+_MATCH_ALL = ("skills",)
+
+FilterValue = Union[str, Iterable[str]]
+
+
+def _normalize(values: FilterValue, skill_matcher: Optional[SkillMatcher] = None) -> List[str]:
+    """
+    Lower-case one value or a list of values, dropping blanks.
+
+    With a skill matcher, each value is replaced by the canonical skills
+    it names ("Python3" becomes "python"); values naming none are kept.
+    """
+    if isinstance(values, str):
+        values = [values]
+    normalized = []
+    for value in values:
+        if not value or not value.strip():
+            continue
+        canonical = skill_matcher.find(value) if skill_matcher is not None else []
+        normalized.extend(canonical or [value.strip().lower()])
+    return list(dict.fromkeys(normalized))
+
+
+def active_filters(filters: Optional[Dict[str, FilterValue]]) -> Optional[Dict[str, FilterValue]]:
+    """
+    Drop the fields of a filter that list no values.
+
+    Args:
+        filters: Values per field, as passed to MetadataStore.select
+
+    Returns:
+        The constrained fields, or None if there are none, so that an
+        empty filter means exactly the same as no filter
+    """
+    if not filters:
+        return None
+    return {field: values for field, values in filters.items() if _normalize(values)} or None
+
+
+class MetadataStore:
+    """Map field values to resume-ID bitmaps and evaluate filters over them"""
+
+    def __init__(self):
+        """Create an empty store"""
+        self._records: Dict[int, Dict[str, List[str]]] = {}
+        # field -> value -> bitmap, bit i of byte i // 8 set for resume ID i
+        self._bitmaps: Dict[str, Dict[str, np.ndarray]] = {field: {} for field in FIELDS}
+        self._capacity = 1024
+
+    def _grow(self, resume_id: int) -> None:
+        """Widen every bitmap so that resume_id fits"""
+        if resume_id < self._capacity:
+            return
+        while self._capacity <= resume_id:
+            self._capacity *= 2
+        for bitmaps in self._bitmaps.values():
+            for value, bitmap in bitmaps.items():
+                bitmaps[value] = np.concatenate(
+                    [bitmap, np.zeros(self._capacity // 8 - len(bitmap), dtype=np.uint8)]
+                )
+
+    def add(self, resume_id: int, metadata: Dict[str, FilterValue]) -> None:
+        """
+        Index the metadata of one resume.
+
+        Args:
+            resume_id: Index ID of the resume
+            metadata: Values per field, e.g. {"skills": ["Python"], "level": "senior"}
+        """
+        resume_id = int(resume_id)
+        self.remove([resume_id])
+        self._grow(resume_id)
+        record = {field: _normalize(metadata.get(field) or []) for field in FIELDS}
+        byte, bit = divmod(resume_id, 8)
+        for field, values in record.items():
+            bitmaps = self._bitmaps[field]
+            for value in values:
+                bitmap = bitmaps.get(value)
+                if bitmap is None:
+                    bitmap = bitmaps[value] = np.zeros(self._capacity // 8, dtype=np.uint8)
+                bitmap[byte] |= 1 << bit
+        self._records[resume_id] = record
+
+    def remove(self, resume_ids: Iterable[int]) -> None:
+        """Forget the given IDs"""
+        for resume_id in resume_ids:
+            record = self._records.pop(int(resume_id), None)
+            if record is None:
+                continue
+            byte, bit = divmod(int(resume_id), 8)
+            for field, values in record.items():
+                for value in values:
+                    self._bitmaps[field][value][byte] &= ~np.uint8(1 << bit)
+
+    def get(self, resume_id: int) -> Optional[Dict[str, List[str]]]:
+        """Get the indexed metadata of a resume, if any"""
+        return self._records.get(int(resume_id))
+
+    def values(self, field: str) -> List[str]:
+        """List the values of a field held by at least one resume"""
+        return sorted(value for value, bitmap in self._bitmaps[field].items() if bitmap.any())
+
+    def select(
+        self,
+        filters: Dict[str, FilterValue],
+        skill_matcher: Optional[SkillMatcher] = None
+    ) -> np.ndarray:
+        """
+        Evaluate a filter into the IDs of the qualifying resumes.
+
+        Fields are combined with AND. Within "skills" every listed value
+        is required; for "level" and "degree" any listed value qualifies.
+
+        Args:
+            filters: Values per field, e.g.
+                {"skills": ["python", "sql"], "level": "senior", "degree": ["master", "phd"]}
+            skill_matcher: Taxonomy mapping skill values to the canonical
+                names they were indexed under (values are only lower-cased
+                without one)
+
+        Returns:
+            Sorted int64 array of resume IDs
+        """
+        unknown = set(filters) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown filter fields {sorted(unknown)}, expected some of {FIELDS}")
+
+        empty = np.zeros(self._capacity // 8, dtype=np.uint8)
+        selected = None
+        for field, values in filters.items():
+            values = _normalize(values, skill_matcher if field == "skills" else None)
+            if not values:
+                continue
+            bitmaps = [self._bitmaps[field].get(value, empty) for value in values]
+            combine = np.bitwise_and if field in _MATCH_ALL else np.bitwise_or
+            field_bitmap = combine.reduce(bitmaps)
+            selected = field_bitmap if selected is None else selected & field_bitmap
+
+        if selected is None:
+            return np.array(sorted(self._records), dtype=np.int64)
+        return np.flatnonzero(np.unpackbits(selected, bitorder="little")).astype(np.int64)
+
+    def clear(self) -> None:
+        """Drop all metadata"""
+        self._records.clear()
+        for bitmaps in self._bitmaps.values():
+            bitmaps.clear()
+
+    def __len__(self) -> int:
+        return len(self._records)
@@ -0,0 +1,577 @@
+"""Resume index partitioned across worker processes or socket-connected nodes"""
+
+import json
+import multiprocessing
+import os
+import re
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import faiss
+import numpy as np
+
+from src._files import atomic_path
+from src.metrics.collector import stage
+
+from .faiss_searcher import FAISSSearcher, _versions
+
+# Operations a shard understands; each takes the shard's FAISSSearcher first
+_SHARD_METHODS = {
+    "add": lambda searcher, vectors, ids: len(searcher.add_embeddings(vectors, ids)),
+    "remove": lambda searcher, ids: searcher.remove_ids(ids),
+    "search": lambda searcher, queries, k, options: searcher.search_batch(queries, k, **options),
+    "get": lambda searcher, ids: np.array(searcher.store.get(ids)),
+    "export": lambda searcher: (searcher.store.ids.copy(), np.array(searcher.store.vectors)),
+    "size": lambda searcher: searcher.get_index_size(),
+    "reset": lambda searcher: searcher.reset(),
+    "save": lambda searcher, path: searcher.save(path),
+}
+
+
+def shard_of(ids: np.ndarray, num_shards: int) -> np.ndarray:
+    """
+    Assign IDs to shards with jump consistent hashing.
+
+    Growing from n to n + 1 shards moves only about 1 / (n + 1) of the
+    IDs, all of them onto the new shard.
+
+    Args:
+        ids: Int64 resume IDs
+        num_shards: Number of shards
+
+    Returns:
+        Shard number of each ID
+    """
+    # splitmix64 finalizer, so sequential IDs spread evenly
+    key = np.asarray(ids, dtype=np.int64).astype(np.uint64)
+    key = (key ^ (key >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    key = (key ^ (key >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    key ^= key >> np.uint64(31)
+
+    shard = np.zeros(len(key), dtype=np.int64)
+    jump = np.zeros(len(key), dtype=np.int64)
+    active = np.ones(len(key), dtype=bool)
+    while active.any():
+        shard[active] = jump[active]
+        key[active] = key[active] * np.uint64(2862933555777941757) + np.uint64(1)
+        scale = float(1 << 31) / ((key[active] >> np.uint64(33)) + np.uint64(1)).astype(np.float64)
+        jump[active] = ((shard[active] + 1) * scale).astype(np.int64)
+        active &= jump < num_shards
+    return shard
+
+
+def _serve(conn: Connection, searcher: FAISSSearcher) -> None:
+    """Answer shard requests on a connection until it asks to close"""
+    while True:
+        try:
+            method, args = conn.recv()
+        except EOFError:
+            return
+        if method == "close":
+            conn.send((True, None))
+            return
+        try:
+            result = _SHARD_METHODS[method](searcher, *args)
+        except Exception as error:
+            conn.send((False, error))
+        else:
+            conn.send((True, result))
+
+
+def _open_shard(
+    embedding_dim: int,
+    index_type: str,
+    path: Optional[str],
+    index_params: Dict[str, Any]
+) -> FAISSSearcher:
+    """Load a shard's saved index, or start an empty one"""
+    if path and os.path.exists(path):
+        return FAISSSearcher.load(path, **index_params)
+    vector_path = FAISSSearcher.vectors_path(path) if path else None
+    return FAISSSearcher(embedding_dim, index_type=index_type, vector_path=vector_path, **index_params)
+
+
+def _shard_process(
+    conn: Connection,
+    embedding_dim: int,
+    index_type: str,
+    path: Optional[str],
+    index_params: Dict[str, Any],
+    threads: int
+) -> None:
+    """Entry point of a shard worker process"""
+    faiss.omp_set_num_threads(threads)
+    _serve(conn, _open_shard(embedding_dim, index_type, path, index_params))
+
+
+def run_shard_server(
+    address: Tuple[str, int],
+    embedding_dim: int,
+    authkey: bytes,
+    index_type: str = "flat_l2",
+    path: Optional[str] = None,
+    **index_params: Any
+) -> None:
+    """
+    Serve one shard over a socket, for ShardedSearcher(addresses=...).
+
+    Connections are served one at a time, and the shard persists between
+    them. The connection is authenticated with authkey, but requests are
+    pickled, so only listen on a trusted network.
+
+    Args:
+        address: (host, port) to listen on
+        embedding_dim: Dimension of embeddings
+        authkey: Shared secret clients must present
+        index_type: Index backend of the shard
+        path: Index file of the shard (loaded if present, written on save)
+        **index_params: Settings such as nlist or ef_search (see FAISSSearcher)
+    """
+    searcher = _open_shard(embedding_dim, index_type, path, index_params)
+    with Listener(address, authkey=authkey) as listener:
+        while True:
+            with listener.accept() as conn:
+                _serve(conn, searcher)
+
+
+def _remove_orphaned_shards(path: str, num_shards: int) -> None:
+    """Delete the files of shards numbered num_shards or above next to a manifest"""
+    directory = os.path.dirname(path) or "."
+    pattern = re.compile(re.escape(os.path.basename(path)) + r"\.shard(\d+)(\..*)?$")
+    for name in os.listdir(directory):
+        match = pattern.match(name)
+        if match and int(match.group(1)) >= num_shards:
+            os.remove(os.path.join(directory, name))
+
+
+class _LocalShard:
+    """Shard searched in the calling process"""
+
+    def __init__(self, searcher: FAISSSearcher):
+        self.searcher = searcher
+        self._reply = None
+
+    def send(self, method: str, *args: Any) -> None:
+        try:
+            self._reply = (True, _SHARD_METHODS[method](self.searcher, *args))
+        except Exception as error:
+            self._reply = (False, error)
+
+    def recv(self) -> Any:
+        ok, value = self._reply
+        self._reply = None
+        if not ok:
+            raise value
+        return value
+
+    def close(self) -> None:
+        pass
+
+
+class _ConnectionShard:
+    """Shard behind a pipe to a worker process or a socket to a node"""
+
+    def __init__(self, conn: Connection, process: Optional[multiprocessing.Process] = None):
+        self.conn = conn
+        self.process = process
+
+    def send(self, method: str, *args: Any) -> None:
+        self.conn.send((method, args))
+
+    def recv(self) -> Any:
+        ok, value = self.conn.recv()
+        if not ok:
+            raise value
+        return value
+
+    def close(self) -> None:
+        try:
+            self.send("close")
+            self.recv()
+        except (EOFError, OSError):
+            pass
+        self.conn.close()
+        if self.process is not None:
+            self.process.join(timeout=5)
+
+
+class _ShardedStore:
+    """Read access to vectors across shards, mirroring VectorStore.get"""
+
+    def __init__(self, searcher: "ShardedSearcher"):
+        self._searcher = searcher
+
+    def get(self, ids: Iterable[int]) -> np.ndarray:
+        ids = np.asarray(list(ids), dtype=np.int64)
+        vectors = np.empty((len(ids), self._searcher.embedding_dim), dtype=np.float32)
+        parts = self._searcher._partition(ids)
+        results = self._searcher._scatter("get", {shard: (ids[rows],) for shard, rows in parts.items()})
+        for shard, rows in parts.items():
+            vectors[rows] = results[shard]
+        return vectors
+
+
+class ShardedSearcher:
+    """FAISSSearcher-compatible search over resumes partitioned into shards"""
+
+    def __init__(
+        self,
+        embedding_dim: int,
+        num_shards: int = 4,
+        index_type: str = "flat_l2",
+        mode: str = "process",
+        addresses: Optional[Sequence[Tuple[str, int]]] = None,
+        authkey: Optional[bytes] = None,
+        path: Optional[str] = None,
+        threads_per_shard: Optional[int] = None,
+        **index_params: Any
+    ):
+        """
+        Start the shards.
+
+        Resumes are assigned to shards by a hash of their ID (see
+        shard_of), queries are sent to all shards at once and the
+        per-shard top-k lists are merged with a heap.
+
+        Args:
+            embedding_dim: Dimension of embeddings
+            num_shards: Number of shards (ignored when addresses are given)
+            index_type: Index backend of every shard
+            mode: "process" runs each shard in a worker process, "local"
+                keeps them in this process (for tests and small corpora)
+            addresses: (host, port) of nodes running run_shard_server,
+                one per shard, instead of local shards
+            authkey: Shared secret of the nodes in addresses
+            path: Base path of the shard index files (path + ".shard<i>");
+                shards load these if present
+            threads_per_shard: FAISS threads per worker process (defaults
+                to the cores divided by the shards)
+            **index_params: Settings such as nlist or ef_search (see FAISSSearcher)
+        """
+        if mode not in ("process", "local"):
+            raise ValueError(f"Unknown shard mode '{mode}', expected 'process' or 'local'")
+        self.embedding_dim = embedding_dim
+        self.index_type = index_type
+        self.mode = mode
+        self.path = path
+        self.index_params = index_params
+        self.threads_per_shard = threads_per_shard
+        self.store = _ShardedStore(self)
+        self.shards: List[Any] = []
+        if addresses:
+            self.shards = [
+                _ConnectionShard(Client(tuple(address), authkey=authkey)) for address in addresses
+            ]
+        else:
+            self.shards = [self._start_shard(i, max(1, num_shards)) for i in range(max(1, num_shards))]
+        self._next_id = 0
+        self.version = next(_versions)
+
+    @property
+    def num_shards(self) -> int:
+        return len(self.shards)
+
+    def shard_path(self, shard: int) -> Optional[str]:
+        """Index file of one shard"""
+        return f"{self.path}.shard{shard}" if self.path else None
+
+    def _start_shard(self, shard: int, num_shards: int) -> Any:
+        """Open a local or process-backed shard"""
+        path = self.shard_path(shard)
+        if self.mode == "local":
+            return _LocalShard(_open_shard(self.embedding_dim, self.index_type, path, self.index_params))
+
+        threads = self.threads_per_shard or max(1, (os.cpu_count() or 1) // num_shards)
+        # spawn, not fork: forking after FAISS has started OpenMP threads can hang
+        context = multiprocessing.get_context("spawn")
+        parent, child = context.Pipe()
+        process = context.Process(
+            target=_shard_process,
+            args=(child, self.embedding_dim, self.index_type, path, self.index_params, threads),
+            daemon=True,
+        )
+        process.start()
+        child.close()
+        return _ConnectionShard(parent, process)
+
+    def _partition(self, ids: np.ndarray) -> Dict[int, np.ndarray]:
+        """Row positions of ids grouped by owning shard"""
+        owners = shard_of(ids, self.num_shards)
+        return {
+            shard: np.flatnonzero(owners == shard)
+            for shard in range(self.num_shards)
+            if np.any(owners == shard)
+        }
+
+    def _scatter(self, method: str, requests: Dict[int, tuple]) -> Dict[int, Any]:
+        """Send requests to several shards at once, then collect the replies"""
+        for shard, args in requests.items():
+            self.shards[shard].send(method, *args)
+        replies = {}
+        error = None
+        for shard in requests:
+            try:
+                replies[shard] = self.shards[shard].recv()
+            except Exception as exc:
+                # Drain every reply before raising, so the shards stay in step
+                error = error or exc
+        if error is not None:
+            raise error
+        return replies
+
+    def _broadcast(self, method: str, *args: Any) -> List[Any]:
+        """Send the same request to every shard"""
+        replies = self._scatter(method, {shard: args for shard in range(self.num_shards)})
+        return [replies[shard] for shard in range(self.num_shards)]
+
+    def add_embeddings(
+        self,
+        embeddings: np.ndarray,
+        ids: Optional[Iterable[int]] = None
+    ) -> np.ndarray:
+        """
+        Add embeddings, each to the shard owning its ID.
+
+        Args:
+            embeddings: Numpy array of shape (n, embedding_dim)
+            ids: Optional stable IDs for the embeddings (auto-assigned if omitted)
+
+        Returns:
+            Array of the IDs under which the embeddings were stored
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32).reshape(-1, self.embedding_dim)
+        if ids is None:
+            ids = np.arange(self._next_id, self._next_id + len(embeddings), dtype=np.int64)
+        else:
+            ids = np.asarray(list(ids), dtype=np.int64)
+        if len(ids) != len(embeddings):
+            raise ValueError("Number of ids must match number of embeddings")
+        if len(ids) == 0:
+            return ids
+
+        parts = self._partition(ids)
+        self._scatter("add", {shard: (embeddings[rows], ids[rows]) for shard, rows in parts.items()})
+        self._next_id = max(self._next_id, int(ids.max()) + 1)
+        self.version = next(_versions)
+        return ids
+
+    def remove_ids(self, ids: Iterable[int]) -> int:
+        """
+        Remove embeddings by ID.
+
+        Args:
+            ids: IDs to remove
+
+        Returns:
+            Number of embeddings removed
+        """
+        ids = np.asarray(list(ids), dtype=np.int64)
+        if len(ids) == 0:
+            return 0
+        parts = self._partition(ids)
+        removed = self._scatter("remove", {shard: (ids[rows],) for shard, rows in parts.items()})
+        self.version = next(_versions)
+        return sum(removed.values())
+
+    def search(
+        self,
+        query_embedding: np.ndarray,
+        k: int = 5,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        rerank_factor: Optional[int] = None,
+        allowed_ids: Optional[Iterable[int]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Search all shards; same arguments and results as FAISSSearcher.search.
+
+        Returns:
+            Tuple of (distances, ids)
+        """
+        distances, ids = self.search_batch(
+            query_embedding,
+            k,
+            nprobe=nprobe,
+            ef_search=ef_search,
+            rerank_factor=rerank_factor,
+            allowed_ids=allowed_ids,
+        )
+        found = ids[0] != -1
+        return distances[0][found], ids[0][found]
+
+    def search_batch(
+        self,
+        query_embeddings: np.ndarray,
+        k: int = 5,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        rerank_factor: Optional[int] = None,
+        allowed_ids: Optional[Iterable[int]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Scatter several queries to all shards and merge their top k.
+
+        Same arguments and results as FAISSSearcher.search_batch. Each
+        shard returns its own top k; a heap keeps the k best overall.
+
+        Returns:
+            Tuple of (distances, ids) arrays of shape (m, k); missing
+            results have id -1 and distance inf
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32).reshape(-1, self.embedding_dim)
+        options = {"nprobe": nprobe, "ef_search": ef_search, "rerank_factor": rerank_factor}
+        if allowed_ids is None:
+            requests = {shard: (queries, k, options) for shard in range(self.num_shards)}
+        else:
+            # Each shard only needs the allowed IDs it owns
+            allowed_ids = np.asarray(list(allowed_ids), dtype=np.int64)
+            requests = {
+                shard: (queries, k, dict(options, allowed_ids=allowed_ids[rows]))
+                for shard, rows in self._partition(allowed_ids).items()
+            }
+
+        heap = faiss.ResultHeap(len(queries), k)
+        with stage("search"):
+            for distances, ids in self._scatter("search", requests).values():
+                heap.add_result(distances, ids)
+        with stage("merge"):
+            heap.finalize()
+        distances, ids = heap.D, heap.I
+        distances[ids == -1] = np.inf
+        return distances, ids
+
+    def distances(self, query_embedding: np.ndarray, embeddings: np.ndarray) -> np.ndarray:
+        """Exact distances from one query to given vectors (see FAISSSearcher.distances)"""
+        query = np.array(query_embedding, dtype=np.float32, order="C").reshape(1, -1)
+        embeddings = np.array(embeddings, dtype=np.float32, order="C").reshape(-1, self.embedding_dim)
+        if self.index_type == "cosine":
+            faiss.normalize_L2(query)
+            faiss.normalize_L2(embeddings)
+            return 2.0 - 2.0 * (embeddings @ query[0])
+        return faiss.pairwise_distances(query, embeddings)[0]
+
+    def resize(self, num_shards: int) -> int:
+        """
+        Rebalance onto a different number of shards.
+
+        Only the vectors whose shard_of assignment changes are moved.
+        Not available with remote addresses.
+
+        Args:
+            num_shards: New number of shards
+
+        Returns:
+            Number of vectors moved
+        """
+        if any(isinstance(shard, _ConnectionShard) and shard.process is None for shard in self.shards):
+            raise ValueError("Remote shards cannot be resized from the client")
+        old = self.num_shards
+        num_shards = max(1, num_shards)
+        for shard in range(old, num_shards):
+            self.shards.append(self._start_shard(shard, num_shards))
+        if num_shards > old:
+            # New shards start empty, even if files of an earlier layout are left over
+            self._scatter("reset", {shard: () for shard in range(old, num_shards)})
+
+        moved = 0
+        for shard, (ids, vectors) in enumerate(self._broadcast("export")[:old]):
+            owners = shard_of(ids, num_shards)
+            leaving = np.flatnonzero(owners != shard)
+            if not len(leaving):
+                continue
+            self._scatter("remove", {shard: (ids[leaving],)})
+            requests = {}
+            for owner in np.unique(owners[leaving]):
+                rows = leaving[owners[leaving] == owner]
+                requests[int(owner)] = (vectors[rows], ids[rows])
+            self._scatter("add", requests)
+            moved += len(leaving)
+
+        for shard in self.shards[num_shards:]:
+            shard.close()
+        del self.shards[num_shards:]
+        self.version = next(_versions)
+        return moved
+
+    def save(self, path: Optional[str] = None) -> None:
+        """
+        Write every shard and a manifest describing them.
+
+        Files of shards beyond num_shards, left by an earlier and larger
+        layout, are deleted once the manifest is written.
+
+        Args:
+            path: Manifest path; shard files go next to it as path + ".shard<i>"
+                (defaults to the path the searcher was opened with)
+        """
+        path = path or self.path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._scatter("save", {shard: (f"{path}.shard{shard}",) for shard in range(self.num_shards)})
+        manifest = {
+            "num_shards": self.num_shards,
+            "embedding_dim": self.embedding_dim,
+            "index_type": self.index_type,
+            "next_id": self._next_id,
+        }
+        with atomic_path(path) as temporary, open(temporary, "w") as f:
+            json.dump(manifest, f)
+        _remove_orphaned_shards(path, self.num_shards)
+
+    @classmethod
+    def load(cls, path: str, num_shards: Optional[int] = None, **options: Any) -> "ShardedSearcher":
+        """
+        Reopen a sharded index written with save().
+
+        Args:
+            path: Manifest path
+            num_shards: Rebalance onto this many shards after loading
+            **options: Further ShardedSearcher arguments (mode, index settings)
+
+        Returns:
+            ShardedSearcher serving the saved shards
+        """
+        with open(path) as f:
+            manifest = json.load(f)
+        searcher = cls(
+            manifest["embedding_dim"],
+            num_shards=manifest["num_shards"],
+            index_type=manifest["index_type"],
+            path=path,
+            **options,
+        )
+        searcher._next_id = manifest["next_id"]
+        if num_shards and num_shards != searcher.num_shards:
+            try:
+                searcher.resize(num_shards)
+            except Exception:
+                searcher.close()
+                raise
+        return searcher
+
+    def reset(self) -> None:
+        """Empty every shard"""
+        self._broadcast("reset")
+        self._next_id = 0
+        self.version = next(_versions)
+
+    def get_index_size(self) -> int:
+        """Get number of embeddings across all shards"""
+        return sum(self._broadcast("size"))
+
+    def shard_sizes(self) -> List[int]:
+        """Number of embeddings held by each shard"""
+        return self._broadcast("size")
+
+    def close(self) -> None:
+        """Stop the shard workers (or disconnect from the nodes)"""
+        for shard in self.shards:
+            shard.close()
+        self.shards = []
+
+    def __enter__(self) -> "ShardedSearcher":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,254 @@
+"""Compact float32 vector storage backed by a growable buffer or memmap"""
+
+import os
+import tempfile
+import numpy as np
+from typing import Iterable, Optional
+
+from src._files import atomic_path
+
+# Rows copied per step when rewriting a backing file
+_COPY_ROWS = 65536
+
+
+class VectorStore:
+    """Store (id, vector) rows contiguously for zero-copy index rebuilds"""
+
+    def __init__(self, embedding_dim: int, path: Optional[str] = None, capacity: int = 1024):
+        """
+        Create an empty vector store.
+
+        A file-backed store maps a private file next to path until save()
+        renames it into place. From then on it only appends to that file;
+        removals and clear() move the rows to a new private file. Other
+        processes that memory-mapped the published file (see save) thus
+        keep seeing the rows they mapped.
+
+        Args:
+            embedding_dim: Dimension of embeddings
+            path: Raw float32 file the store is saved to and memory-maps
+                (None keeps vectors in RAM)
+            capacity: Number of rows preallocated before the first growth
+        """
+        self.embedding_dim = embedding_dim
+        self.path = path
+        # File currently mapped: path once published, else a private file
+        self._file = None
+        self.read_only = False
+        self._size = 0
+        self._sorted_rows = None
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._vectors = self._allocate(capacity, create=True)
+
+    def _allocate(self, capacity: int, create: bool = False) -> np.ndarray:
+        """Allocate (or remap) the vector buffer with room for capacity rows"""
+        shape = (max(capacity, 1), self.embedding_dim)
+        if self.path is None:
+            return np.empty(shape, dtype=np.float32)
+        if create:
+            self._discard_private()
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handle, self._file = tempfile.mkstemp(
+                prefix=f"{os.path.basename(self.path)}.", suffix=".tmp", dir=directory or "."
+            )
+            os.close(handle)
+        # r+ extends the file when the requested shape is larger
+        mode = "w+" if create else "r+"
+        return np.memmap(self._file, dtype=np.float32, mode=mode, shape=shape)
+
+    def _discard_private(self) -> None:
+        """Delete the private file, if one is mapped and was never published"""
+        if self._file is not None and self._file != self.path and os.path.exists(self._file):
+            os.remove(self._file)
+
+    def _check_writable(self) -> None:
+        """Refuse to modify a store opened with read_only"""
+        if self.read_only:
+            raise RuntimeError(f"Vector store {self.path} is opened read-only")
+
+    def _reserve(self, rows: int) -> None:
+        """Grow the buffers geometrically so that rows more rows fit"""
+        needed = self._size + rows
+        capacity = len(self._ids)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+
+        ids = np.empty(capacity, dtype=np.int64)
+        ids[:self._size] = self._ids[:self._size]
+        self._ids = ids
+        if self.path is None:
+            vectors = np.empty((capacity, self.embedding_dim), dtype=np.float32)
+            vectors[:self._size] = self._vectors[:self._size]
+            self._vectors = vectors
+        else:
+            self._vectors.flush()
+            del self._vectors
+            self._vectors = self._allocate(capacity)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Zero-copy view of the stored vectors, shape (size, embedding_dim)"""
+        return self._vectors[:self._size]
+
+    @property
+    def ids(self) -> np.ndarray:
+        """Zero-copy view of the stored IDs"""
+        return self._ids[:self._size]
+
+    def append(self, vectors: np.ndarray, ids: np.ndarray) -> None:
+        """
+        Append rows to the store.
+
+        Args:
+            vectors: Float32 array of shape (n, embedding_dim)
+            ids: Int64 array of shape (n,)
+        """
+        self._check_writable()
+        self._reserve(len(ids))
+        end = self._size + len(ids)
+        self._vectors[self._size:end] = vectors
+        self._ids[self._size:end] = ids
+        self._size = end
+        self._sorted_rows = None
+
+    def remove(self, ids: Iterable[int]) -> int:
+        """
+        Remove rows by ID, compacting the remaining rows in place.
+
+        Args:
+            ids: IDs to remove
+
+        Returns:
+            Number of rows removed
+        """
+        self._check_writable()
+        keep = ~np.isin(self.ids, np.asarray(list(ids), dtype=np.int64))
+        kept = int(keep.sum())
+        removed = self._size - kept
+        if removed:
+            if self._file == self.path and self.path is not None:
+                # Published rows may be mapped elsewhere; compact into a new file
+                self._rewrite(np.flatnonzero(keep))
+            else:
+                self._vectors[:kept] = self.vectors[keep]
+            self._ids[:kept] = self.ids[keep]
+            self._size = kept
+            self._sorted_rows = None
+        return removed
+
+    def _rewrite(self, rows: np.ndarray) -> None:
+        """Copy the given rows of the published file to a new private file"""
+        published = self._vectors
+        self._vectors = self._allocate(len(self._ids), create=True)
+        for start in range(0, len(rows), _COPY_ROWS):
+            chunk = rows[start:start + _COPY_ROWS]
+            self._vectors[start:start + len(chunk)] = published[chunk]
+
+    def get(self, ids: Iterable[int]) -> np.ndarray:
+        """
+        Look up vectors by ID.
+
+        Args:
+            ids: IDs to fetch (all must be present)
+
+        Returns:
+            Float32 array of shape (len(ids), embedding_dim)
+        """
+        ids = np.asarray(list(ids), dtype=np.int64)
+        if self._size == 0:
+            if len(ids):
+                raise KeyError("Some ids are not in the vector store")
+            return np.empty((0, self.embedding_dim), dtype=np.float32)
+        if self._sorted_rows is None:
+            self._sorted_rows = np.argsort(self.ids, kind="stable")
+        positions = np.searchsorted(self.ids, ids, sorter=self._sorted_rows)
+        rows = self._sorted_rows[np.minimum(positions, self._size - 1)]
+        if not np.array_equal(self.ids[rows], ids):
+            raise KeyError("Some ids are not in the vector store")
+        return self._vectors[rows]
+
+    def clear(self) -> None:
+        """Drop all rows, keeping the allocated capacity"""
+        self._check_writable()
+        if self._file == self.path and self.path is not None:
+            self._vectors = self._allocate(len(self._ids), create=True)
+        self._size = 0
+        self._sorted_rows = None
+
+    def flush(self) -> None:
+        """Write memory-mapped vectors through to disk"""
+        if isinstance(self._vectors, np.memmap):
+            self._vectors.flush()
+
+    def save(self, path: str) -> None:
+        """
+        Persist the store as a raw vector file plus an ID file.
+
+        Both files are written aside and swapped in atomically, so readers
+        that memory-mapped the previous files keep a consistent view.
+        Saving to the store's own path writes no vectors: a private file
+        is flushed and renamed into place, and a published one is only
+        flushed, as rows are appended to it after the rows readers mapped.
+
+        Args:
+            path: Raw float32 vector file path (IDs go to path + ".ids.npy")
+        """
+        if self.path is not None and os.path.abspath(path) == os.path.abspath(self.path):
+            self.flush()
+            if self._file != self.path:
+                os.replace(self._file, self.path)
+                self._file = self.path
+        else:
+            with atomic_path(path) as temporary:
+                self.vectors.tofile(temporary)
+        with atomic_path(f"{path}.ids.npy") as temporary, open(temporary, "wb") as f:
+            np.save(f, self.ids)
+
+    @classmethod
+    def load(cls, path: str, embedding_dim: int, read_only: bool = False) -> "VectorStore":
+        """
+        Open a store written with save(), memory-mapping its vectors.
+
+        Args:
+            path: Raw float32 vector file path
+            embedding_dim: Dimension of embeddings
+            read_only: Map the files read-only, so processes opening the
+                same store share its pages; appends and removals then raise
+
+        Returns:
+            VectorStore backed by the file
+        """
+        store = cls.__new__(cls)
+        store.embedding_dim = embedding_dim
+        store.path = path
+        store._file = path
+        store.read_only = read_only
+        store._sorted_rows = None
+        if read_only:
+            store._ids = np.load(f"{path}.ids.npy", mmap_mode="r")
+            store._size = len(store._ids)
+            store._vectors = (
+                np.memmap(path, dtype=np.float32, mode="r", shape=(store._size, embedding_dim))
+                if store._size else np.empty((1, embedding_dim), dtype=np.float32)
+            )
+            return store
+        ids = np.load(f"{path}.ids.npy")
+        store._size = len(ids)
+        capacity = max(len(ids), os.path.getsize(path) // (4 * embedding_dim))
+        store._ids = np.empty(max(capacity, 1), dtype=np.int64)
+        store._ids[:len(ids)] = ids
+        store._vectors = store._allocate(capacity)
+        return store
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __del__(self):
+        try:
+            self._discard_private()
+        except Exception:
+            pass
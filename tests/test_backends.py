@@ -0,0 +1,73 @@
+"""Tests for the ONNX inference backends"""
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from src.embeddings import EmbeddingGenerator, ModelRegistry, check_parity
+from src.embeddings.backends import model_key
+
+
+class FakeModel:
+    """Deterministic stand-in for a SentenceTransformer"""
+
+    def __init__(self, noise: float = 0.0):
+        self.noise = noise
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return 8
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        vectors = np.stack([
+            np.random.default_rng(len(text)).standard_normal(8) for text in texts
+        ]).astype(np.float32)
+        return vectors + self.noise
+
+
+class TestBackends(unittest.TestCase):
+    """Test cases for backend selection and the parity check"""
+
+    def setUp(self):
+        self.registry = ModelRegistry(loader=lambda name: FakeModel())
+
+    def test_model_key_separates_backends(self):
+        """Each backend gets its own registry and cache identity"""
+        self.assertEqual(model_key("m"), "m")
+        self.assertEqual(model_key("m", "onnx-int8"), "m@onnx-int8")
+        with self.assertRaises(ValueError):
+            model_key("m", "tensorrt")
+
+    @mock.patch("src.embeddings.backends.load_onnx_model")
+    def test_onnx_generator_uses_onnx_loader(self, load_onnx_model):
+        """ONNX generators load through the exporter under their own key"""
+        load_onnx_model.return_value = FakeModel()
+        generator = EmbeddingGenerator(
+            "m", registry=self.registry, backend="onnx-int8", model_cache_dir="cache"
+        )
+
+        generator.generate(["python developer"])
+
+        load_onnx_model.assert_called_once_with("m", "cache", True, "avx2")
+        self.assertEqual(self.registry.loaded_models(), ["m@onnx-int8"])
+        generator.close()
+
+    @mock.patch("src.embeddings.backends.load_onnx_model")
+    def test_parity_check_applies_threshold(self, load_onnx_model):
+        """The parity report compares per-text cosine agreement to the threshold"""
+        texts = ["python developer", "data engineer with spark", "ux designer"]
+
+        load_onnx_model.return_value = FakeModel()
+        report = check_parity("m", texts, backend="onnx", registry=self.registry)
+        self.assertTrue(report["passed"])
+        self.assertAlmostEqual(report["min_cosine"], 1.0, places=5)
+
+        self.registry.evict("m@onnx")
+        load_onnx_model.return_value = FakeModel(noise=1.0)
+        report = check_parity("m", texts, backend="onnx", registry=self.registry)
+        self.assertFalse(report["passed"])
+        self.assertEqual(report["texts"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""Tests for the benchmark corpus and report helpers"""
+
+import unittest
+
+from benchmarks.corpus import iter_resumes, make_job_descriptions
+from benchmarks.pipeline_benchmark import compare, percentile, run, summarize
+from src.parser import JobDescriptionParser, ResumeParser
+
+
+class TestCorpus(unittest.TestCase):
+    """Test cases for the synthetic corpus"""
+
+    def test_corpus_is_reproducible_and_parseable(self):
+        """The same seed gives the same corpus, in the layout the parsers expect"""
+        self.assertEqual(list(iter_resumes(5, seed=3)), list(iter_resumes(5, seed=3)))
+        self.assertNotEqual(list(iter_resumes(5, seed=3)), list(iter_resumes(5, seed=4)))
+
+        resume = ResumeParser().parse(next(iter_resumes(1)))
+        self.assertTrue(resume["skills"])
+        self.assertTrue(resume["education"])
+        job = JobDescriptionParser().parse(make_job_descriptions(1)[0])
+        self.assertTrue(job["title"])
+        self.assertTrue(job["requirements"])
+
+
+class TestReport(unittest.TestCase):
+    """Test cases for summaries and baseline comparison"""
+
+    def test_percentiles_use_nearest_rank(self):
+        """Percentiles pick observed values"""
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        summary = summarize([0.001, 0.003, 0.002], items=30)
+        self.assertEqual(summary["p50_ms"], 2.0)
+        self.assertAlmostEqual(summary["throughput_per_s"], 5000.0)
+
+    def test_compare_flags_regressions(self):
+        """Slower latencies and lower throughput beyond tolerance are flagged"""
+        report = run(resumes=200, jobs=10, fake_embeddings=True, dim=16)
+        self.assertEqual(set(report["stages"]), {"parse", "index", "search", "rank"})
+
+        slower = {"stages": {"search": dict(report["stages"]["search"])}}
+        slower["stages"]["search"]["p95_ms"] *= 2
+        rows = {row["metric"]: row for row in compare(slower, report)}
+        self.assertTrue(rows["p95_ms"]["regression"])
+        self.assertFalse(rows["p50_ms"]["regression"])
+
+    def test_recall_of_compressed_index(self):
+        """Exact search has full recall; re-ranking restores a compressed index's"""
+        exact = run(resumes=300, jobs=5, fake_embeddings=True, dim=16)
+        self.assertEqual(exact["stages"]["search"]["recall_at_k"], 1.0)
+
+        compressed = run(resumes=300, jobs=5, fake_embeddings=True, dim=16,
+                         index_type="ivf_pq", pq_m=4, rerank_factor=0)
+        reranked = run(resumes=300, jobs=5, fake_embeddings=True, dim=16,
+                       index_type="ivf_pq", pq_m=4, rerank_factor=10)
+        self.assertGreater(reranked["stages"]["search"]["recall_at_k"],
+                           compressed["stages"]["search"]["recall_at_k"])
+        rows = {row["metric"]: row for row in compare(compressed, exact, tolerance=0.05)}
+        self.assertTrue(rows["recall_at_k"]["regression"])
+
+
+if __name__ == "__main__":
+    unittest.main()
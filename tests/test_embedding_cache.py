@@ -0,0 +1,98 @@
+"""Tests for the persistent embedding cache"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.embeddings import EmbeddingGenerator
+from src.embeddings.cache import EmbeddingCache
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    """Test cases for EmbeddingCache"""
+
+    def setUp(self):
+        """Create a cache in a temporary directory"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache", "embeddings.sqlite3")
+        self.cache = EmbeddingCache(self.path, max_entries=3)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def test_key_ignores_whitespace_but_not_model(self):
+        """Keys are stable under whitespace changes and vary with the model"""
+        key = EmbeddingCache.make_key("Python  developer\n", "model-a", 384)
+        self.assertEqual(key, EmbeddingCache.make_key(" Python developer", "model-a", 384))
+        self.assertNotEqual(key, EmbeddingCache.make_key("Python developer", "model-b", 384))
+        self.assertNotEqual(key, EmbeddingCache.make_key("Python developer", "model-a", 768))
+
+    def test_bulk_lookup_returns_hits_and_misses(self):
+        """get_many splits keys into hits and misses"""
+        vector = np.arange(4, dtype=np.float32)
+        self.cache.put_many({"a": vector})
+
+        hits, misses = self.cache.get_many(["a", "b", "a"])
+
+        np.testing.assert_array_equal(hits["a"], vector)
+        self.assertEqual(misses, ["b"])
+
+    def test_persists_across_instances(self):
+        """Vectors survive reopening the cache file"""
+        self.cache.put_many({"a": np.ones(4, dtype=np.float32)})
+        self.cache.close()
+
+        self.cache = EmbeddingCache(self.path, max_entries=3)
+        hits, _ = self.cache.get_many(["a"])
+        self.assertIn("a", hits)
+
+    def test_evicts_least_recently_used(self):
+        """Entries beyond max_entries are evicted oldest-first"""
+        for key in ["a", "b", "c"]:
+            self.cache.put_many({key: np.zeros(4, dtype=np.float32)})
+        self.cache.get_many(["a"])
+        self.cache.put_many({"d": np.zeros(4, dtype=np.float32)})
+
+        hits, misses = self.cache.get_many(["a", "b", "c", "d"])
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(misses, ["b"])
+
+    def test_overwrites_do_not_count_towards_bound(self):
+        """Re-storing cached keys evicts nothing, also after reopening"""
+        self.cache.put_many({key: np.zeros(4, dtype=np.float32) for key in ["a", "b", "c"]})
+        self.cache.put_many({"a": np.ones(4, dtype=np.float32), "b": np.ones(4, dtype=np.float32)})
+        self.cache.close()
+
+        self.cache = EmbeddingCache(self.path, max_entries=3)
+        self.assertEqual(len(self.cache), 3)
+        self.cache.put_many({"c": np.ones(4, dtype=np.float32)})
+        _, misses = self.cache.get_many(["a", "b", "c"])
+        self.assertEqual(misses, [])
+
+
+class TestEmbeddingGeneratorCache(unittest.TestCase):
+    """Test cases for cache use inside EmbeddingGenerator"""
+
+    def test_cache_hits_do_not_load_model(self):
+        """Fully cached inputs are served without constructing the model"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = EmbeddingCache(os.path.join(tmpdir, "embeddings.sqlite3"))
+            generator = EmbeddingGenerator("all-MiniLM-L6-v2", cache=cache)
+            vector = np.full(384, 0.5, dtype=np.float32)
+            cache.put_many({cache.make_key("cached text", "all-MiniLM-L6-v2", 384): vector})
+
+            embeddings = generator.generate(["cached text", "cached  text"])
+            cache.close()
+
+        self.assertIsNone(generator._model)
+        self.assertEqual(embeddings.shape, (2, 384))
+        # Served normalized, like freshly encoded vectors
+        np.testing.assert_allclose(embeddings[1], vector / np.linalg.norm(vector), rtol=1e-6)
+        self.assertAlmostEqual(float(np.linalg.norm(embeddings[0])), 1.0, places=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Tests for multi-process encoding"""
+
+import os
+import unittest
+
+import numpy as np
+
+from src.embeddings import EmbeddingGenerator, ModelRegistry
+
+
+class PidModel:
+    """Encodes texts as (length, process ID)"""
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return 2
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        return np.array([[len(text), os.getpid()] for text in texts], dtype=np.float32)
+
+
+def load_pid_model(name):
+    """Module-level loader, so spawned workers can unpickle it"""
+    return PidModel()
+
+
+class TestEncodePool(unittest.TestCase):
+    """Test cases for EmbeddingGenerator with encode workers"""
+
+    def setUp(self):
+        registry = ModelRegistry(loader=load_pid_model)
+        self.embedder = EmbeddingGenerator(
+            "pid", batch_size=4, registry=registry, encode_workers=2, min_pool_texts=20,
+            normalize_embeddings=False,
+        )
+
+    def tearDown(self):
+        self.embedder.close()
+
+    def test_large_inputs_use_workers_in_order(self):
+        """Rows come back aligned with the input, encoded by the worker processes"""
+        texts = ["x" * n for n in np.random.default_rng(0).permutation(50) + 1]
+        embeddings = self.embedder.generate(texts)
+
+        np.testing.assert_array_equal(embeddings[:, 0], [len(text) for text in texts])
+        workers = set(self.embedder._pool._executor._processes)
+        self.assertLessEqual(len(workers), 2)
+        self.assertTrue(set(embeddings[:, 1].astype(int).tolist()) <= workers)
+
+        # The same worker processes serve later calls
+        again = self.embedder.generate(texts)
+        np.testing.assert_array_equal(again[:, 0], embeddings[:, 0])
+        self.assertTrue(set(again[:, 1].astype(int).tolist()) <= workers)
+
+    def test_small_inputs_stay_in_process(self):
+        """Inputs below min_pool_texts are encoded without the workers"""
+        embeddings = self.embedder.generate(["a", "bb", "ccc"])
+        np.testing.assert_array_equal(embeddings[:, 0], [1, 2, 3])
+        self.assertTrue(np.all(embeddings[:, 1] == os.getpid()))
+        self.assertIsNone(self.embedder._pool._executor)
+
+    def test_empty_input_skips_encoding(self):
+        """The pool returns an empty array for no texts, knowing the dimension from a worker"""
+        embeddings = self.embedder._pool.encode([], batch_size=4)
+        self.assertEqual(embeddings.shape, (0, 2))
+        self.assertEqual(self.embedder._pool.encode([], batch_size=4).shape, (0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
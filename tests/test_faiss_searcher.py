@@ -0,0 +1,429 @@
+"""Tests for the FAISS searcher"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.similarity import FAISSSearcher, MetadataStore, ResumeCatalog, ShardedSearcher, VectorStore
+from src.similarity.sharded_searcher import shard_of
+
+
+class TestFAISSSearcher(unittest.TestCase):
+    """Test cases for FAISSSearcher"""
+
+    def setUp(self):
+        """Set up a small index with stable IDs"""
+        rng = np.random.default_rng(0)
+        self.vectors = rng.standard_normal((5, 8)).astype(np.float32)
+        self.searcher = FAISSSearcher(8)
+        self.searcher.add_embeddings(self.vectors, ids=[10, 11, 12, 13, 14])
+
+    def test_search_returns_stable_ids(self):
+        """Search results carry the caller-supplied IDs"""
+        distances, ids = self.searcher.search(self.vectors[2], k=1)
+        self.assertEqual(ids.tolist(), [12])
+        self.assertAlmostEqual(float(distances[0]), 0.0, places=5)
+
+    def test_search_drops_padding_when_k_exceeds_size(self):
+        """Asking for more results than stored returns only real hits"""
+        _, ids = self.searcher.search(self.vectors[0], k=10)
+        self.assertEqual(sorted(ids.tolist()), [10, 11, 12, 13, 14])
+
+    def test_search_batch_matches_single_searches(self):
+        """A multi-query search returns the same rows as per-query searches"""
+        distances, ids = self.searcher.search_batch(self.vectors[[1, 3]], k=2)
+        for row, query in enumerate([1, 3]):
+            single_distances, single_ids = self.searcher.search(self.vectors[query], k=2)
+            self.assertEqual(ids[row].tolist(), single_ids.tolist())
+            np.testing.assert_allclose(distances[row], single_distances)
+
+    def test_remove_ids(self):
+        """Removed IDs are no longer returned"""
+        self.assertEqual(self.searcher.remove_ids([12]), 1)
+        _, ids = self.searcher.search(self.vectors[2], k=5)
+        self.assertNotIn(12, ids.tolist())
+        self.assertEqual(self.searcher.get_index_size(), 4)
+
+    def test_save_and_load(self):
+        """A saved index reloads with the same IDs and continues numbering"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "index", "resumes.faiss")
+            self.searcher.save(path)
+            loaded = FAISSSearcher.load(path)
+
+            _, ids = loaded.search(self.vectors[4], k=1)
+            self.assertEqual(ids.tolist(), [14])
+            new_ids = loaded.add_embeddings(self.vectors[:1])
+            self.assertEqual(new_ids.tolist(), [15])
+
+    def test_mmap_load_survives_replacement(self):
+        """A memory-mapped index is read-only and keeps its version when a new one is saved"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "resumes.faiss")
+            self.searcher.save(path)
+            mapped = FAISSSearcher.load(path, mmap=True)
+            self.assertTrue(mapped.read_only)
+            with self.assertRaises(RuntimeError):
+                mapped.add_embeddings(self.vectors[:1])
+
+            self.searcher.remove_ids([14])
+            self.searcher.save(path)
+            _, ids = mapped.search(self.vectors[4], k=1)
+            self.assertEqual(ids.tolist(), [14])
+            np.testing.assert_array_equal(mapped.store.get([14]), self.vectors[4:5])
+
+            _, ids = FAISSSearcher.load(path, mmap=True).search(self.vectors[4], k=5)
+            self.assertEqual(sorted(ids.tolist()), [10, 11, 12, 13])
+            self.assertEqual(sorted(os.listdir(tmpdir)), [
+                "resumes.faiss", "resumes.faiss.manifest.json",
+                "resumes.faiss.vectors", "resumes.faiss.vectors.ids.npy",
+            ])
+
+    def test_load_rejects_files_of_different_saves(self):
+        """Vectors left over from an earlier save are not paired with a newer index"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "resumes.faiss")
+            self.searcher.save(path)
+            older = os.path.join(tmpdir, "older.ids.npy")
+            shutil.copy(FAISSSearcher.vectors_path(path) + ".ids.npy", older)
+            self.searcher.remove_ids([14])
+            self.searcher.add_embeddings(self.vectors[4:5])
+            self.searcher.save(path)
+            FAISSSearcher.load(path, mmap=True)
+
+            os.replace(older, FAISSSearcher.vectors_path(path) + ".ids.npy")
+            for mmap in (False, True):
+                with self.subTest(mmap=mmap), self.assertRaises(ValueError):
+                    FAISSSearcher.load(path, mmap=mmap)
+
+
+class TestIndexTypes(unittest.TestCase):
+    """Test cases for the configurable index backends"""
+
+    def setUp(self):
+        """Create a corpus large enough to train IVF"""
+        rng = np.random.default_rng(1)
+        self.vectors = rng.standard_normal((400, 16)).astype(np.float32)
+        self.ids = np.arange(100, 500)
+
+    def test_each_type_finds_exact_match_and_removes(self):
+        """Every backend returns the query vector itself and honours removals"""
+        for index_type in ["flat_l2", "cosine", "ivf", "hnsw"]:
+            with self.subTest(index_type=index_type):
+                searcher = FAISSSearcher(16, index_type=index_type, nlist=8, nprobe=8)
+                searcher.add_embeddings(self.vectors, ids=self.ids)
+
+                distances, ids = searcher.search(self.vectors[7], k=3)
+                self.assertEqual(int(ids[0]), 107)
+                self.assertAlmostEqual(float(distances[0]), 0.0, places=4)
+                self.assertTrue(np.all(np.diff(distances) >= 0))
+
+                searcher.remove_ids([107])
+                _, ids = searcher.search(self.vectors[7], k=3)
+                self.assertNotIn(107, ids.tolist())
+                self.assertEqual(searcher.get_index_size(), 399)
+
+    def test_loaded_index_keeps_type(self):
+        """The backend type is recovered from a saved index"""
+        for index_type in ["cosine", "ivf", "hnsw", "sq_fp16", "sq8", "ivf_pq"]:
+            with self.subTest(index_type=index_type):
+                searcher = FAISSSearcher(16, index_type=index_type, nlist=8, pq_m=4)
+                searcher.add_embeddings(self.vectors, ids=self.ids)
+                with tempfile.TemporaryDirectory() as tmpdir:
+                    path = os.path.join(tmpdir, "resumes.faiss")
+                    searcher.save(path)
+                    loaded = FAISSSearcher.load(path, nprobe=8)
+
+                self.assertEqual(loaded.index_type, index_type)
+                self.assertEqual(loaded.get_index_size(), 400)
+
+    def test_compressed_types_rerank_exactly(self):
+        """Compressed backends return exact distances once re-ranked"""
+        for index_type in ["sq_fp16", "sq8", "ivf_pq"]:
+            with self.subTest(index_type=index_type):
+                searcher = FAISSSearcher(
+                    16, index_type=index_type, nlist=8, nprobe=8, pq_m=4, rerank_factor=10
+                )
+                searcher.add_embeddings(self.vectors, ids=self.ids)
+
+                distances, ids = searcher.search(self.vectors[7], k=3)
+                self.assertEqual(int(ids[0]), 107)
+                self.assertAlmostEqual(float(distances[0]), 0.0, places=5)
+                np.testing.assert_allclose(
+                    distances, searcher.distances(self.vectors[7], searcher.store.get(ids)), rtol=1e-5
+                )
+
+                searcher.remove_ids([107])
+                _, ids = searcher.search(self.vectors[7], k=3)
+                self.assertNotIn(107, ids.tolist())
+
+        with self.assertRaises(ValueError):
+            FAISSSearcher(16, index_type="ivf_pq", pq_m=5)
+
+    def test_allowed_ids_restrict_every_type(self):
+        """Searches with allowed_ids only return those IDs"""
+        allowed = self.ids[::5]
+        for index_type in ["flat_l2", "cosine", "ivf", "hnsw", "sq8", "ivf_pq"]:
+            with self.subTest(index_type=index_type):
+                searcher = FAISSSearcher(16, index_type=index_type, nlist=8, nprobe=8, pq_m=4)
+                searcher.add_embeddings(self.vectors, ids=self.ids)
+
+                _, ids = searcher.search_batch(self.vectors[:3], k=5, allowed_ids=allowed)
+                self.assertTrue(np.isin(ids, allowed).all())
+                # IDs above the largest allowed one must not leak through
+                _, ids = searcher.search(self.vectors[-1], k=5, allowed_ids=self.ids[:2])
+                self.assertTrue(np.isin(ids, self.ids[:2]).all())
+                _, ids = searcher.search(self.vectors[0], k=5, allowed_ids=[])
+                self.assertEqual(len(ids), 0)
+
+    def test_unknown_type_raises(self):
+        """Unknown index types are rejected"""
+        with self.assertRaises(ValueError):
+            FAISSSearcher(16, index_type="annoy")
+
+
+class TestShardedSearcher(unittest.TestCase):
+    """Test cases for ShardedSearcher"""
+
+    def setUp(self):
+        """Index the same vectors in one searcher and in shards"""
+        rng = np.random.default_rng(2)
+        self.vectors = rng.standard_normal((300, 16)).astype(np.float32)
+        self.queries = self.vectors[:10] + 0.01
+        self.reference = FAISSSearcher(16)
+        self.reference.add_embeddings(self.vectors)
+
+    def test_shard_assignment_moves_few_ids(self):
+        """Adding a shard only moves IDs onto the new shard"""
+        ids = np.arange(20000)
+        before, after = shard_of(ids, 4), shard_of(ids, 5)
+        self.assertEqual(set(before.tolist()), {0, 1, 2, 3})
+        moved = before != after
+        self.assertEqual(set(after[moved].tolist()), {4})
+        self.assertAlmostEqual(moved.mean(), 0.2, delta=0.02)
+
+    def test_merged_results_match_single_index(self):
+        """Scatter-gather returns the same top k as one unsharded index"""
+        with ShardedSearcher(16, num_shards=3, mode="local") as searcher:
+            searcher.add_embeddings(self.vectors)
+            self.assertEqual(searcher.get_index_size(), 300)
+            self.assertTrue(all(size > 0 for size in searcher.shard_sizes()))
+
+            distances, ids = searcher.search_batch(self.queries, k=5)
+            expected_distances, expected_ids = self.reference.search_batch(self.queries, k=5)
+            np.testing.assert_array_equal(ids, expected_ids)
+            np.testing.assert_allclose(distances, expected_distances, rtol=1e-5)
+
+            _, ids = searcher.search(self.queries[0], k=5, allowed_ids=[3, 150, 299])
+            self.assertEqual(sorted(ids.tolist()), [3, 150, 299])
+            np.testing.assert_allclose(searcher.store.get([7, 8]), self.vectors[[7, 8]])
+
+            searcher.remove_ids([0])
+            _, ids = searcher.search(self.queries[0], k=3)
+            self.assertNotIn(0, ids.tolist())
+
+    def test_resize_and_reload_keep_results(self):
+        """Rebalanced and reloaded shards answer like before"""
+        _, expected_ids = self.reference.search_batch(self.queries, k=5)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "resumes.faiss")
+            with ShardedSearcher(16, num_shards=2, mode="local") as searcher:
+                searcher.add_embeddings(self.vectors)
+                self.assertGreater(searcher.resize(4), 0)
+                self.assertEqual(searcher.num_shards, 4)
+                np.testing.assert_array_equal(searcher.search_batch(self.queries, k=5)[1], expected_ids)
+                searcher.save(path)
+
+            with ShardedSearcher.load(path, num_shards=3, mode="local") as loaded:
+                self.assertEqual(loaded.get_index_size(), 300)
+                np.testing.assert_array_equal(loaded.search_batch(self.queries, k=5)[1], expected_ids)
+                self.assertEqual(loaded.add_embeddings(self.vectors[:1]).tolist(), [300])
+                loaded.save(path)
+            self.assertFalse([name for name in os.listdir(directory) if ".shard3" in name])
+
+            # Growing again must not pick up the removed shard's old vectors
+            self.reference.add_embeddings(self.vectors[:1])
+            with ShardedSearcher.load(path, num_shards=4, mode="local") as regrown:
+                self.assertEqual(regrown.get_index_size(), 301)
+                np.testing.assert_array_equal(
+                    regrown.search_batch(self.queries, k=5)[1], self.reference.search_batch(self.queries, k=5)[1]
+                )
+
+    def test_worker_processes(self):
+        """Shards in worker processes give the same results"""
+        with ShardedSearcher(16, num_shards=2, threads_per_shard=1) as searcher:
+            searcher.add_embeddings(self.vectors)
+            _, ids = searcher.search_batch(self.queries, k=5)
+            np.testing.assert_array_equal(ids, self.reference.search_batch(self.queries, k=5)[1])
+
+
+class TestVectorStore(unittest.TestCase):
+    """Test cases for VectorStore"""
+
+    def test_grows_and_compacts(self):
+        """Rows survive growth and removal keeps the remaining order"""
+        store = VectorStore(4, capacity=2)
+        vectors = np.arange(20, dtype=np.float32).reshape(5, 4)
+        store.append(vectors[:3], np.array([1, 2, 3]))
+        store.append(vectors[3:], np.array([4, 5]))
+
+        self.assertEqual(store.remove([2, 4]), 2)
+        self.assertEqual(store.ids.tolist(), [1, 3, 5])
+        np.testing.assert_array_equal(store.vectors, vectors[[0, 2, 4]])
+        np.testing.assert_array_equal(store.get([5, 1]), vectors[[4, 0]])
+        with self.assertRaises(KeyError):
+            store.get([2])
+        with self.assertRaises(KeyError):
+            VectorStore(4).get([2])
+
+    def test_memmap_round_trip(self):
+        """A file-backed store reopens with the same rows"""
+        vectors = np.random.default_rng(2).standard_normal((300, 4)).astype(np.float32)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "resumes.vectors")
+            store = VectorStore(4, path=path, capacity=16)
+            store.append(vectors, np.arange(300))
+            store.save(path)
+            loaded = VectorStore.load(path, 4)
+
+            np.testing.assert_array_equal(loaded.vectors, vectors)
+            loaded.append(vectors[:1], np.array([300]))
+            self.assertEqual(len(loaded), 301)
+            del store, loaded
+
+    def test_saves_publish_without_copying(self):
+        """Loading maps the published file and later saves only append to it"""
+        vectors = np.random.default_rng(4).standard_normal((6, 4)).astype(np.float32)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "resumes.vectors")
+            store = VectorStore(4, path=path)
+            store.append(vectors[:3], np.arange(3))
+            self.assertFalse(os.path.exists(path))
+            store.save(path)
+            del store
+
+            loaded = VectorStore.load(path, 4)
+            inode = os.stat(path).st_ino
+            loaded.append(vectors[3:5], np.arange(3, 5))
+            loaded.save(path)
+            self.assertEqual(os.stat(path).st_ino, inode)
+            self.assertEqual(sorted(os.listdir(tmpdir)), ["resumes.vectors", "resumes.vectors.ids.npy"])
+
+            reader = VectorStore.load(path, 4, read_only=True)
+            loaded.remove([0, 1])
+            loaded.append(vectors[5:], np.array([5]))
+            np.testing.assert_array_equal(reader.get([0, 1]), vectors[:2])
+            loaded.save(path)
+            np.testing.assert_array_equal(reader.vectors, vectors[:5])
+            np.testing.assert_array_equal(VectorStore.load(path, 4).vectors, vectors[2:])
+            del reader, loaded
+            self.assertEqual(sorted(os.listdir(tmpdir)), ["resumes.vectors", "resumes.vectors.ids.npy"])
+
+    def test_unsaved_store_leaves_published_file(self):
+        """A store that is never saved neither replaces nor litters the published file"""
+        vectors = np.random.default_rng(5).standard_normal((2, 4)).astype(np.float32)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "resumes.vectors")
+            store = VectorStore(4, path=path)
+            store.append(vectors, np.arange(2))
+            store.save(path)
+            fresh = VectorStore(4, path=path)
+            fresh.append(vectors[:1], np.array([7]))
+            del store, fresh
+
+            np.testing.assert_array_equal(VectorStore.load(path, 4).vectors, vectors)
+            self.assertEqual(sorted(os.listdir(tmpdir)), ["resumes.vectors", "resumes.vectors.ids.npy"])
+
+    def test_concurrent_saves_use_separate_files(self):
+        """Threads saving to one path never share a temporary file"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "resumes.vectors")
+            stores = []
+            for value in range(8):
+                store = VectorStore(4)
+                store.append(np.full((500, 4), value, dtype=np.float32), np.arange(500))
+                stores.append(store)
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(lambda store: store.save(path), stores))
+
+            rows = VectorStore.load(path, 4).vectors
+            self.assertEqual(len(np.unique(rows)), 1)
+            self.assertEqual(sorted(os.listdir(tmpdir)), ["resumes.vectors", "resumes.vectors.ids.npy"])
+
+    def test_searcher_rebuilds_from_store(self):
+        """The index can be rebuilt from the vector store alone"""
+        vectors = np.random.default_rng(3).standard_normal((50, 8)).astype(np.float32)
+        searcher = FAISSSearcher(8)
+        searcher.add_embeddings(vectors)
+        searcher.rebuild()
+        _, ids = searcher.search(vectors[9], k=1)
+        self.assertEqual(ids.tolist(), [9])
+
+
+class TestMetadataStore(unittest.TestCase):
+    """Test cases for MetadataStore"""
+
+    def setUp(self):
+        self.store = MetadataStore()
+        self.store.add(0, {"skills": ["Python", "SQL"], "level": "senior", "degree": ["master"]})
+        self.store.add(1, {"skills": ["Python"], "level": "junior", "degree": ["bachelor"]})
+        self.store.add(2000, {"skills": ["SQL", "AWS"], "level": "senior", "degree": ["phd"]})
+
+    def test_select_combines_fields(self):
+        """Skills must all match, levels and degrees any, fields all"""
+        self.assertEqual(self.store.select({"skills": ["python"]}).tolist(), [0, 1])
+        self.assertEqual(self.store.select({"skills": ["Python", "SQL"]}).tolist(), [0])
+        self.assertEqual(self.store.select({"degree": ["master", "phd"]}).tolist(), [0, 2000])
+        self.assertEqual(self.store.select({"skills": "sql", "level": "senior"}).tolist(), [0, 2000])
+        self.assertEqual(self.store.select({"skills": ["rust"]}).tolist(), [])
+        self.assertEqual(self.store.select({}).tolist(), [0, 1, 2000])
+        with self.assertRaises(ValueError):
+            self.store.select({"salary": "high"})
+
+    def test_remove_clears_bits(self):
+        """Removed resumes no longer match"""
+        self.store.remove([0])
+        self.assertEqual(self.store.select({"skills": ["python"]}).tolist(), [1])
+        self.assertEqual(self.store.values("degree"), ["bachelor", "phd"])
+
+    def test_catalog_persists_metadata(self):
+        """Metadata saved with the catalog is re-indexed on load"""
+        catalog = ResumeCatalog("/resumes", model_name="model")
+        catalog.add("a.txt", 1.0, 10, "h1", metadata={"skills": ["Go"], "level": "senior"})
+        catalog.add("b.txt", 1.0, 10, "h2")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "catalog.json")
+            catalog.save(path)
+            loaded = ResumeCatalog.load(path)
+
+        self.assertEqual(loaded.metadata.select({"skills": ["go"]}).tolist(), [0])
+        loaded.remove([0])
+        self.assertEqual(loaded.metadata.select({"level": "senior"}).tolist(), [])
+
+
+class TestResumeCatalog(unittest.TestCase):
+    """Test cases for ResumeCatalog"""
+
+    def test_round_trip(self):
+        """Catalog records and ID allocation survive save/load"""
+        catalog = ResumeCatalog("/resumes", "model-a")
+        first = catalog.add("a.txt", 1.0, 10, "h1")
+        second = catalog.add("b.txt", 2.0, 20, "h2")
+        catalog.remove([first])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "catalog.json")
+            catalog.save(path)
+            loaded = ResumeCatalog.load(path)
+
+        self.assertEqual(loaded.filenames(), ["b.txt"])
+        self.assertEqual(loaded.get_id("b.txt"), second)
+        self.assertEqual(loaded.add("c.txt", 3.0, 30, "h3"), second + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+"""Tests for resume scanning and loading"""
+
+import os
+import tempfile
+import unittest
+
+from src.ingestion import NearDuplicateIndex, scan_resumes, load_resumes, stream_resumes
+from src.metrics import capture_stats
+from src.parser import ResumeParser
+
+
+class TestIngestion(unittest.TestCase):
+    """Test cases for scan_resumes, load_resumes and stream_resumes"""
+
+    def setUp(self):
+        """Write a few resumes and a non-resume file"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.texts = {}
+        for i in range(5):
+            text = f"Skills: python, sql\n\nSoftware Engineer {i}\nBachelor of Science"
+            self.texts[f"r{i}.txt"] = text
+            with open(os.path.join(self.tmpdir.name, f"r{i}.txt"), "w") as f:
+                f.write(text)
+        with open(os.path.join(self.tmpdir.name, "notes.md"), "w") as f:
+            f.write("not a resume")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_scan_only_yields_resumes(self):
+        """Only .txt files are yielded"""
+        names = sorted(entry.name for entry in scan_resumes(self.tmpdir.name))
+        self.assertEqual(names, sorted(self.texts))
+
+    def test_process_pool_matches_serial_parse(self):
+        """Parallel loading returns every resume with the serial parse result"""
+        paths = [entry.path for entry in scan_resumes(self.tmpdir.name)]
+        results = list(load_resumes(paths, workers=2, chunk_size=2))
+
+        self.assertEqual(len(results), 5)
+        parser = ResumeParser()
+        for resume in results:
+            text = self.texts[os.path.basename(resume["path"])]
+            self.assertEqual(resume["text"], text)
+            self.assertEqual(resume["data"], parser.parse(text))
+
+    def test_skip_parsing(self):
+        """parse=False returns text without structured data"""
+        paths = [entry.path for entry in scan_resumes(self.tmpdir.name)]
+        results = list(load_resumes(paths, parse=False))
+        self.assertTrue(all(resume["data"] is None for resume in results))
+
+    def test_pooled_pipeline_matches_serial_load(self):
+        """stream_resumes with a parse pool yields what serial load_resumes does"""
+        paths = [entry.path for entry in scan_resumes(self.tmpdir.name)]
+        serial = {resume["path"]: resume for resume in load_resumes(paths, workers=1)}
+        pooled = {
+            resume["path"]: resume
+            for resume in stream_resumes(paths, parse_workers=2, chunk_size=2)
+        }
+        self.assertEqual(pooled, serial)
+
+    def test_pipeline_matches_serial_parse(self):
+        """The staged pipeline returns every resume parsed, with queue depths recorded"""
+        paths = [entry.path for entry in scan_resumes(self.tmpdir.name)]
+        parser = ResumeParser()
+        for parse_workers in (1, 2):
+            with self.subTest(parse_workers=parse_workers), capture_stats() as stats:
+                results = list(stream_resumes(
+                    paths, read_workers=2, parse_workers=parse_workers, chunk_size=2, queue_size=2
+                ))
+                self.assertEqual(sorted(resume["path"] for resume in results), sorted(paths))
+                for resume in results:
+                    self.assertEqual(resume["data"], parser.parse(self.texts[os.path.basename(resume["path"])]))
+                self.assertEqual(stats.histogram("ingest_queue_depth", queue="read")["count"], 5 + 2)
+                self.assertEqual(stats.histogram("ingest_queue_depth", queue="parsed")["count"], 5 + 1)
+
+        unparsed = list(stream_resumes(paths, parse=False))
+        self.assertTrue(all(resume["data"] is None for resume in unparsed))
+
+    def test_pipeline_errors_and_early_close(self):
+        """Read errors reach the consumer, and closing early stops the stages"""
+        paths = [entry.path for entry in scan_resumes(self.tmpdir.name)]
+        with self.assertRaises(FileNotFoundError):
+            list(stream_resumes(paths + [os.path.join(self.tmpdir.name, "missing.txt")], parse=False))
+
+        resumes = stream_resumes(paths, queue_size=1)
+        self.assertIn(next(resumes)["path"], paths)
+        resumes.close()
+
+
+RESUME = (
+    "Jane Doe\nSenior Software Engineer with eight years of experience building data "
+    "pipelines and web services in Python and Go. Led a team of five engineers, "
+    "migrated batch jobs to streaming, and cut infrastructure costs by a third. "
+    "Skills: Python, Go, SQL, Kafka, Kubernetes, AWS. Education: Master of Science "
+    "in Computer Science, University of Somewhere."
+)
+
+
+class TestNearDuplicateIndex(unittest.TestCase):
+    """Test cases for MinHash near-duplicate detection"""
+
+    def test_finds_edited_copies_only(self):
+        """Lightly edited copies match their representative, other resumes do not"""
+        index = NearDuplicateIndex(threshold=0.7)
+        index.add(7, index.signature(RESUME))
+
+        edited = RESUME.replace("five engineers", "six engineers")
+        self.assertEqual(index.find(index.signature(edited)), 7)
+        self.assertEqual(index.find(index.signature(RESUME.upper())), 7)
+        other = "John Roe\nMarketing Manager. Skills: branding, SEO, events. Bachelor of Arts."
+        self.assertIsNone(index.find(index.signature(other)))
+
+        index.remove(7)
+        self.assertIsNone(index.find(index.signature(RESUME)))
+        self.assertEqual(len(index), 0)
+
+    def test_save_and_load(self):
+        """Signatures reload, unless saved with other settings"""
+        index = NearDuplicateIndex()
+        index.add(3, index.signature(RESUME))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "resumes.minhash.npz")
+            index.save(path)
+            self.assertEqual(NearDuplicateIndex.load(path).find(index.signature(RESUME)), 3)
+            self.assertEqual(len(NearDuplicateIndex.load(path, seed=2)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
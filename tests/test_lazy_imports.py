@@ -0,0 +1,44 @@
+"""Tests that heavy dependencies are only imported when needed"""
+
+import subprocess
+import sys
+import unittest
+
+
+class TestLazyImports(unittest.TestCase):
+    """Test cases for lazy package imports"""
+
+    def _loaded_modules(self, statement: str) -> set:
+        """Run a statement in a fresh interpreter and list heavy modules it loaded"""
+        code = (
+            f"import sys\n{statement}\n"
+            "print(','.join(m for m in ('torch', 'sentence_transformers', 'transformers', 'faiss', 'sklearn')"
+            " if m in sys.modules))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        return set(filter(None, output.split(",")))
+
+    def test_import_screener_is_light(self):
+        """Importing the screener does not pull in torch or faiss"""
+        self.assertEqual(self._loaded_modules("import screener"), set())
+
+    def test_parser_package_is_light(self):
+        """Parsing needs none of the model or index dependencies"""
+        statement = "from src.parser import ResumeParser; ResumeParser().parse('Skills: Python')"
+        self.assertEqual(self._loaded_modules(statement), set())
+
+    def test_package_exports_resolve(self):
+        """Lazy exports resolve to the defining module's objects"""
+        from src.embeddings import EmbeddingCache
+        from src.embeddings.cache import EmbeddingCache as DirectEmbeddingCache
+        self.assertIs(EmbeddingCache, DirectEmbeddingCache)
+        import src.ranking
+        self.assertIn("CandidateRanker", dir(src.ranking))
+        with self.assertRaises(AttributeError):
+            src.ranking.Missing
+
+
+if __name__ == "__main__":
+    unittest.main()
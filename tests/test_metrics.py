@@ -0,0 +1,103 @@
+"""Tests for stage timing, counters and the Prometheus dump"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.embeddings import EmbeddingGenerator, ModelRegistry
+from src.metrics import (
+    MetricsCollector,
+    capture_stats,
+    count,
+    disable_metrics,
+    enable_metrics,
+    get_metrics,
+    profile_run,
+    stage,
+)
+from src.ranking import CandidateRanker
+from src.similarity import FAISSSearcher
+
+
+class FakeModel:
+    """Encodes texts as (length, 1, 0, 0)"""
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return 4
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        return np.array([[len(text), 1.0, 0.0, 0.0] for text in texts], dtype=np.float32)
+
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for the metrics helpers"""
+
+    def tearDown(self):
+        disable_metrics()
+
+    def test_disabled_helpers_are_no_ops(self):
+        """With nothing recording, stage() hands out a shared no-op timer"""
+        self.assertIsNone(get_metrics())
+        self.assertIs(stage("parse"), stage("embed"))
+        with stage("parse"):
+            count("anything")
+
+        collector = enable_metrics()
+        self.assertIs(get_metrics(), collector)
+        with stage("parse"):
+            count("anything", 2)
+        self.assertEqual(collector.counter("anything"), 2)
+        self.assertEqual(collector.snapshot()["stages"]["parse"]["calls"], 1)
+
+    def test_capture_stats_records_pipeline_stages(self):
+        """Embed, search and rank report timings and counters to a capture"""
+        registry = ModelRegistry(loader=lambda name: FakeModel())
+        embedder = EmbeddingGenerator("fake", registry=registry)
+        searcher = FAISSSearcher(4)
+        ranker = CandidateRanker()
+
+        with capture_stats() as stats:
+            vectors = embedder.generate(["a", "bb", "ccc"])
+            searcher.add_embeddings(vectors)
+            distances, ids = searcher.search(embedder.generate("dd"), k=2)
+            ranker.rank_candidates(distances, [f"r{i}" for i in ids])
+        embedder.close()
+
+        snapshot = stats.snapshot()
+        self.assertEqual(set(snapshot["stages"]), {"embed", "index_add", "search", "rank"})
+        self.assertEqual(snapshot["stages"]["embed"]["calls"], 2)
+        self.assertEqual(stats.counter("texts_encoded_total"), 4)
+        self.assertEqual(stats.counter("vectors_indexed_total"), 3)
+        self.assertEqual(stats.counter("candidates_ranked_total"), 2)
+        self.assertEqual(stats.histogram("encode_batch_size")["mean"], 2)
+
+    def test_prometheus_format(self):
+        """Counters and histograms render with cumulative buckets"""
+        collector = MetricsCollector(prefix="test")
+        collector.inc("resumes_synced_total", 3, change="added")
+        for value in (1, 3, 100):
+            collector.observe("batch_size", value, buckets=(2, 4))
+
+        text = collector.to_prometheus()
+        self.assertIn("# TYPE test_resumes_synced_total counter", text)
+        self.assertIn('test_resumes_synced_total{change="added"} 3', text)
+        self.assertIn("# TYPE test_batch_size histogram", text)
+        self.assertIn('test_batch_size_bucket{le="2"} 1', text)
+        self.assertIn('test_batch_size_bucket{le="4"} 2', text)
+        self.assertIn('test_batch_size_bucket{le="+Inf"} 3', text)
+        self.assertIn("test_batch_size_sum 104", text)
+        self.assertIn("test_batch_size_count 3", text)
+
+    def test_profile_run_writes_stats(self):
+        """profile_run dumps loadable cProfile stats"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run.prof")
+            with profile_run(path):
+                sorted(range(1000), key=lambda x: -x)
+            self.assertGreater(os.path.getsize(path), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
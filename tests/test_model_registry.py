@@ -0,0 +1,105 @@
+"""Tests for the shared model registry"""
+
+import threading
+import time
+import unittest
+
+from src.embeddings import EmbeddingGenerator, ModelRegistry
+
+
+class FakeModel:
+    """Stand-in for a SentenceTransformer"""
+
+    def __init__(self, name: str, dimension: int = 384):
+        self.name = name
+        self.dimension = dimension
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+
+class TestModelRegistry(unittest.TestCase):
+    """Test cases for ModelRegistry"""
+
+    def setUp(self):
+        self.loads = []
+
+        def loader(name):
+            self.loads.append(name)
+            return FakeModel(name)
+
+        self.registry = ModelRegistry(max_models=1, loader=loader)
+
+    def test_acquire_shares_one_instance(self):
+        """Repeated acquires return the same model and count references"""
+        first = self.registry.acquire("a")
+        second = self.registry.acquire("a")
+
+        self.assertIs(first, second)
+        self.assertEqual(self.loads, ["a"])
+        self.assertEqual(self.registry.refcount("a"), 2)
+
+        self.registry.release("a")
+        self.assertEqual(self.registry.refcount("a"), 1)
+
+    def test_only_idle_models_are_evicted(self):
+        """Models in use stay loaded; idle ones go least recently used first"""
+        self.registry.acquire("a")
+        self.registry.acquire("b")
+        self.assertEqual(self.registry.loaded_models(), ["a", "b"])
+
+        self.registry.release("a")
+        self.assertEqual(self.registry.loaded_models(), ["b"])
+
+        self.registry.release("b")
+        self.assertEqual(self.registry.loaded_models(), ["b"])
+        self.assertFalse(self.registry.evict("missing"))
+        self.assertTrue(self.registry.evict("b"))
+        self.assertEqual(self.registry.loaded_models(), [])
+
+    def test_concurrent_acquires_load_once(self):
+        """Threads racing for the same model wait for a single load"""
+
+        def slow_loader(name):
+            time.sleep(0.05)
+            self.loads.append(name)
+            return FakeModel(name)
+
+        registry = ModelRegistry(loader=slow_loader)
+        models = []
+        threads = [
+            threading.Thread(target=lambda: models.append(registry.acquire("a")))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.loads, ["a"])
+        self.assertEqual(len({id(model) for model in models}), 1)
+        self.assertEqual(registry.refcount("a"), 8)
+
+    def test_generators_share_and_release_models(self):
+        """Generators for one model share it and release it on close"""
+        first = EmbeddingGenerator("a", registry=self.registry)
+        second = EmbeddingGenerator("a", registry=self.registry)
+
+        self.assertIs(first.model, second.model)
+        self.assertEqual(self.registry.refcount("a"), 2)
+
+        first.close()
+        second.close()
+        self.assertEqual(self.registry.refcount("a"), 0)
+
+    def test_dimension_mismatch_releases_model(self):
+        """A model with an unexpected dimension is rejected and released"""
+        generator = EmbeddingGenerator("all-mpnet-base-v2", registry=self.registry)
+
+        with self.assertRaises(ValueError):
+            generator.model
+        self.assertEqual(self.registry.refcount("all-mpnet-base-v2"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""Tests for the candidate ranker"""
+
+import unittest
+
+import numpy as np
+
+from src.ranking import CandidateRanker
+
+
+class TestCandidateRanker(unittest.TestCase):
+    """Test cases for CandidateRanker"""
+
+    def setUp(self):
+        self.ranker = CandidateRanker()
+
+    def test_top_k_matches_full_sort(self):
+        """argpartition top-k returns the head of a full sort"""
+        rng = np.random.default_rng(0)
+        distances = rng.uniform(0, 2, 10000).astype(np.float32)
+        ids = np.arange(10000)
+
+        ranked = self.ranker.rank_candidates(distances, ids, top_k=25)
+        self.assertEqual(len(ranked), 25)
+        self.assertEqual(ranked.candidate_ids, np.argsort(distances, kind="stable")[:25].tolist())
+        self.assertTrue(np.all(np.diff(ranked.scores) <= 0))
+
+        everything = self.ranker.rank_candidates(distances[:5], ["a", "b", "c", "d", "e"])
+        self.assertEqual(len(everything), 5)
+        self.assertEqual(len(self.ranker.rank_candidates(distances, ids, top_k=0)), 0)
+
+    def test_scores_do_not_depend_on_the_batch(self):
+        """A candidate scores the same whoever else is ranked with it"""
+        alone = self.ranker.rank_candidates(np.array([0.4]), ["a"])
+        crowded = self.ranker.rank_candidates(np.array([0.1, 0.4, 3.0]), ["b", "a", "c"])
+        self.assertAlmostEqual(alone[0]["score"], 80.0, places=4)
+        self.assertEqual(crowded[1]["candidate_id"], "a")
+        self.assertAlmostEqual(crowded[1]["score"], alone[0]["score"], places=4)
+        self.assertEqual(crowded[2]["score"], 0.0)
+        np.testing.assert_allclose(self.ranker.score([0.0, 1.0, 2.0, np.inf]), [100, 50, 0, 0])
+
+    def test_rows_materialize_as_dicts(self):
+        """Rows read as the familiar candidate dicts"""
+        ranked = self.ranker.rank_candidates(np.array([0.5, 0.1]), ["a", "b"], "Engineer")
+        self.assertEqual(ranked[0], {
+            "candidate_id": "b",
+            "score": ranked[0]["score"],
+            "distance": ranked[0]["distance"],
+            "explanation": "Excellent match",
+        })
+        self.assertEqual([row["candidate_id"] for row in ranked], ["b", "a"])
+        self.assertEqual(ranked[1:].to_list(), [ranked[1]])
+
+
+if __name__ == "__main__":
+    unittest.main()
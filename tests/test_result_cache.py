@@ -0,0 +1,125 @@
+"""Tests for the query result cache"""
+
+import os
+import tempfile
+import unittest
+
+from screener import ResumeScreener
+from src.ranking import QueryResultCache
+from tests.test_screener import HashEmbedder
+
+
+class FakeClock:
+    """Manually advanced time source"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestQueryResultCache(unittest.TestCase):
+    """Test cases for QueryResultCache"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = QueryResultCache(max_entries=2, ttl_seconds=10, clock=self.clock)
+
+    def test_lru_eviction(self):
+        """The least recently used entry goes first"""
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.assertEqual(self.cache.get("a"), 1)
+        self.cache.put("c", 3)
+
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(len(self.cache), 2)
+
+    def test_entries_expire(self):
+        """Entries older than the TTL are misses"""
+        self.cache.put("a", 1)
+        self.clock.now = 9.9
+        self.assertEqual(self.cache.get("a"), 1)
+        self.clock.now = 10.0
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_keys_cover_every_input(self):
+        """Changing any part of a search changes its key"""
+        base = ("job", "model", 5, {"skills": ["python"]}, 1)
+        key = QueryResultCache.result_key(*base)
+        for position, value in enumerate(["job2", "model2", 6, {"skills": ["go"]}, 2]):
+            changed = list(base)
+            changed[position] = value
+            self.assertNotEqual(QueryResultCache.result_key(*changed), key)
+        self.assertNotEqual(QueryResultCache.job_key("job", "model"), key)
+
+
+class CountingEmbedder(HashEmbedder):
+    """HashEmbedder that records every text it encodes"""
+
+    def __init__(self):
+        self.texts = []
+
+    def generate(self, texts):
+        if isinstance(texts, str):
+            texts = [texts]
+        self.texts.extend(texts)
+        return super().generate(texts)
+
+
+class TestScreenerResultCache(unittest.TestCase):
+    """Test cases for cached searches in ResumeScreener"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.resume_dir = os.path.join(self.tmpdir.name, "resumes")
+        os.makedirs(self.resume_dir)
+        for i in range(5):
+            self._write(f"{i}.txt", f"Candidate {i}")
+        self.job_path = os.path.join(self.tmpdir.name, "job.txt")
+        with open(self.job_path, "w") as f:
+            f.write("Software Engineer")
+
+        self.screener = ResumeScreener(
+            cache_path=None, index_path=None, parse_resumes=False, parse_workers=1
+        )
+        self.embedder = self.screener.embedder = CountingEmbedder()
+        self.screener._load_index()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, filename, text):
+        with open(os.path.join(self.resume_dir, filename), "w") as f:
+            f.write(text)
+
+    def test_repeated_search_is_served_from_cache(self):
+        """The job is embedded once and unchanged results are reused"""
+        first = self.screener.match_resumes(self.resume_dir, self.job_path, top_k=3)
+        first[0]["score"] = -1.0
+        second = self.screener.match_resumes(self.resume_dir, self.job_path, top_k=3)
+
+        self.assertEqual(self.embedder.texts.count("Software Engineer"), 1)
+        self.assertNotEqual(second[0]["score"], -1.0)
+        self.assertEqual(
+            [c["candidate_id"] for c in first], [c["candidate_id"] for c in second]
+        )
+
+    def test_index_changes_invalidate_results(self):
+        """Adding a resume bumps the index version, so results are recomputed"""
+        self.screener.match_resumes(self.resume_dir, self.job_path, top_k=10)
+        version = self.screener.searcher.version
+        self._write("new.txt", "Software Engineer")
+
+        results = self.screener.match_resumes(self.resume_dir, self.job_path, top_k=10)
+
+        self.assertGreater(self.screener.searcher.version, version)
+        self.assertEqual(results[0]["candidate_id"], "new.txt")
+        self.assertEqual(self.embedder.texts.count("Software Engineer"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
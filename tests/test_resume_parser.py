@@ -0,0 +1,95 @@
+"""Tests for the resume parser"""
+
+import unittest
+
+from src.parser import ResumeParser
+
+
+SCREENER_RESUME = """
+        John Doe
+        Senior Software Engineer
+        
+        Experience:
+        - 10 years in software development
+        - Python, JavaScript, Rust expertise
+        - AWS and Docker experience
+        
+        Education:
+        - Bachelor's in Computer Science
+        """
+
+DEMO_RESUME = """
+John Doe
+Software Engineer
+
+SKILLS:
+- Python
+- JavaScript
+- React
+
+EXPERIENCE:
+Senior Software Engineer at TechCorp (2020-2024)
+- Led development of microservices architecture
+
+Software Engineer at StartupXYZ (2018-2020)
+- Built full-stack web applications
+"""
+
+
+class TestResumeParser(unittest.TestCase):
+    """Pin parser output on the fixtures used elsewhere in the repo"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.parser = ResumeParser()
+
+    def test_screener_fixture(self):
+        """Indented resume from the screener tests"""
+        result = self.parser.parse(SCREENER_RESUME)
+        self.assertEqual(result["text"], SCREENER_RESUME)
+        self.assertEqual(result["sections"], {})
+        self.assertEqual(result["skills"], [])
+        self.assertEqual(result["experience"], [])
+        self.assertEqual(result["education"], [{"degree": "Bachelor's in Computer Science"}])
+
+    def test_demo_fixture(self):
+        """Unindented resume from the demo script"""
+        result = self.parser.parse(DEMO_RESUME)
+        experience = (
+            "Senior Software Engineer at TechCorp (2020-2024)\n"
+            "- Led development of microservices architecture\n\n"
+            "Software Engineer at StartupXYZ (2018-2020)\n"
+            "- Built full-stack web applications"
+        )
+        self.assertEqual(result["sections"], {
+            "experience": experience,
+            "skills": "- Python\n- JavaScript\n- React\n\nEXPERIENCE:\n" + experience,
+        })
+        self.assertEqual(result["skills"], ["- Python\n- JavaScript\n- React"])
+        self.assertEqual(result["experience"], [])
+        self.assertEqual(result["education"], [])
+
+    def test_single_line_resume(self):
+        """Role on a single line runs to the end of the text"""
+        result = self.parser.parse("Senior Engineer with 5 years experience")
+        self.assertEqual(result["experience"], [{"role": "Senior Engineer with 5 years experience"}])
+        self.assertEqual(result["sections"], {})
+
+    def test_comma_separated_skills_and_degrees(self):
+        """Skills split on commas; overlapping degree mentions are all kept"""
+        result = self.parser.parse("Skills: Python, SQL ,Go\n\nMaster and Bachelor of Arts.\n")
+        self.assertEqual(sorted(result["skills"]), ["Go", "Python", "SQL"])
+        self.assertEqual(result["education"], [
+            {"degree": "Bachelor of Arts"},
+            {"degree": "Master and Bachelor of Arts"},
+        ])
+
+    def test_non_ascii_text_matches_ascii_path(self):
+        """Non-ASCII text goes through the regex scanner with the same result"""
+        ascii_result = self.parser.parse("EDUCATION:\nPhD in Physics\n")
+        unicode_result = self.parser.parse("EDUCATION:\nPhD in Physics\né")
+        self.assertEqual(ascii_result["education"], unicode_result["education"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,15 @@
 """Tests for the Resume Screener"""
 
+import hashlib
+import os
+import tempfile
 import unittest
+from unittest import mock
+
+import faiss
+import numpy as np
+
+import config
 from screener import ResumeScreener
 
 
@@ -55,5 +64,291 @@ class TestResumeScreener(unittest.TestCase):
         self.assertIsNotNone(result)
 
 
+class HashEmbedder:
+    """Deterministic embedder so ranking can be tested without a model"""
+
+    model_id = "hash"
+
+    def get_embedding_dimension(self):
+        return 16
+
+    def generate(self, texts):
+        if isinstance(texts, str):
+            texts = [texts]
+        vectors = []
+        for text in texts:
+            seed = int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+            vectors.append(np.random.default_rng(seed).standard_normal(16))
+        return np.array(vectors, dtype=np.float32)
+
+
+class TestStreamingMatch(unittest.TestCase):
+    """Test cases for iter_match_resumes"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.resume_dir = os.path.join(self.tmpdir.name, "resumes")
+        os.makedirs(self.resume_dir)
+        for i in range(25):
+            self._write(f"{i:02d}.txt", f"Candidate {i}\nSoftware Engineer")
+        self.job_path = os.path.join(self.tmpdir.name, "job.txt")
+        with open(self.job_path, "w") as f:
+            f.write("Software Engineer")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, filename, text):
+        with open(os.path.join(self.resume_dir, filename), "w") as f:
+            f.write(text)
+
+    def _screener(self, mmap_index=False):
+        screener = ResumeScreener(
+            cache_path=None,
+            index_path=os.path.join(self.tmpdir.name, "index.faiss"),
+            parse_resumes=False,
+            parse_workers=1,
+            mmap_index=mmap_index,
+        )
+        screener.embedder = HashEmbedder()
+        screener._load_index()
+        return screener
+
+    def _ids(self, candidates):
+        return [candidate["candidate_id"] for candidate in candidates]
+
+    def test_snapshots_converge_to_full_ranking(self):
+        """Each chunk yields a snapshot; the last one matches match_resumes"""
+        snapshots = list(self._screener().iter_match_resumes(
+            self.resume_dir, self.job_path, top_k=5, chunk_size=10
+        ))
+
+        self.assertEqual([s["processed"] for s in snapshots], [0, 10, 20, 25])
+        self.assertEqual([s["done"] for s in snapshots], [False, False, False, True])
+        self.assertTrue(all(len(s["candidates"]) <= 5 for s in snapshots))
+        expected = self._screener().match_resumes(self.resume_dir, self.job_path, top_k=5)
+        self.assertEqual(self._ids(snapshots[-1]["candidates"]), self._ids(expected))
+
+    def test_changed_files_replace_indexed_results(self):
+        """Updated and deleted resumes never surface with stale vectors"""
+        best = self._ids(self._screener().match_resumes(self.resume_dir, self.job_path, top_k=3))
+        os.remove(os.path.join(self.resume_dir, best[0]))
+        self._write(best[1], "Software Engineer")
+        self._write(best[2], "Unrelated text")
+
+        snapshots = list(self._screener().iter_match_resumes(
+            self.resume_dir, self.job_path, top_k=3, chunk_size=1
+        ))
+
+        self.assertNotIn(best[0], self._ids(snapshots[0]["candidates"]))
+        self.assertNotIn(best[1], self._ids(snapshots[0]["candidates"]))
+        self.assertEqual(self._ids(snapshots[-1]["candidates"])[0], best[1])
+        expected = self._screener().match_resumes(self.resume_dir, self.job_path, top_k=3)
+        self.assertEqual(self._ids(snapshots[-1]["candidates"]), self._ids(expected))
+
+    def test_sharded_index_matches_single_index(self):
+        """A sharded index ranks like a single one, also after reopening"""
+        expected = self._ids(self._screener().match_resumes(self.resume_dir, self.job_path, top_k=5))
+        with mock.patch.multiple(config, FAISS_NUM_SHARDS=3, FAISS_SHARD_MODE="local"):
+            # The single index on disk is not a shard manifest, so it is rebuilt
+            screener = self._screener()
+            self.assertEqual(
+                self._ids(screener.match_resumes(self.resume_dir, self.job_path, top_k=5)), expected
+            )
+            self.assertEqual(screener.searcher.num_shards, 3)
+
+            reopened = self._screener()
+            self.assertEqual(reopened.searcher.get_index_size(), 25)
+            self.assertEqual(
+                self._ids(reopened.match_resumes(self.resume_dir, self.job_path, top_k=5)), expected
+            )
+
+    def test_ivf_lists_grow_with_synced_chunks(self):
+        """An IVF index trained on the first chunk is retrained as later chunks arrive"""
+        for i in range(25, 200):
+            self._write(f"{i:03d}.txt", f"Candidate {i}\nData Engineer")
+        with mock.patch.multiple(config, FAISS_INDEX_TYPE="ivf", FAISS_IVF_NLIST=4):
+            screener = self._screener()
+            screener.sync_resumes(self.resume_dir, chunk_size=40)
+            self.assertEqual(screener.searcher.get_index_size(), 200)
+            self.assertEqual(faiss.extract_index_ivf(screener.searcher.index).nlist, 4)
+            best = self._ids(screener.search_index("Candidate 7\nSoftware Engineer", top_k=1))
+            self.assertEqual(best, ["07.txt"])
+
+    def test_read_only_screener_follows_writer(self):
+        """A memory-mapped screener picks up each index the writer saves"""
+        reader = self._screener(mmap_index=True)
+        self.assertEqual(reader.search_index("Software Engineer", top_k=5), [])
+        with self.assertRaises(RuntimeError):
+            reader.sync_resumes(self.resume_dir)
+
+        writer = self._screener()
+        writer.sync_resumes(self.resume_dir)
+        expected = self._ids(writer.search_index("Software Engineer", top_k=5))
+        self.assertEqual(self._ids(reader.search_index("Software Engineer", top_k=5)), expected)
+        self.assertTrue(reader.searcher.read_only)
+
+        os.remove(os.path.join(self.resume_dir, expected[0]))
+        writer.sync_resumes(self.resume_dir)
+        self.assertEqual(reader.searcher.get_index_size(), 25)
+        self.assertNotIn(expected[0], self._ids(reader.search_index("Software Engineer", top_k=5)))
+        self.assertEqual(reader.searcher.get_index_size(), 24)
+
+
+class TestNearDuplicates(unittest.TestCase):
+    """Test cases for near-duplicate resumes sharing one embedding"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.resume_dir = os.path.join(self.tmpdir.name, "resumes")
+        os.makedirs(self.resume_dir)
+        base = " ".join(f"word{i}" for i in range(60))
+        resumes = {
+            "a.txt": base,
+            "b.txt": base.replace("word30", "edited"),
+            "c.txt": " ".join(f"other{i}" for i in range(60)),
+        }
+        for filename, text in resumes.items():
+            with open(os.path.join(self.resume_dir, filename), "w") as f:
+                f.write(text)
+        self.job_path = os.path.join(self.tmpdir.name, "job.txt")
+        with open(self.job_path, "w") as f:
+            f.write("Software Engineer")
+        # One reader ingests files in name order, so a.txt is the copy kept
+        patcher = mock.patch.object(config, "INGEST_READ_WORKERS", 1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _screener(self):
+        screener = ResumeScreener(
+            cache_path=None,
+            index_path=os.path.join(self.tmpdir.name, "index.faiss"),
+            parse_resumes=False,
+            parse_workers=1,
+            dedup_threshold=0.7,
+        )
+        screener.embedder = HashEmbedder()
+        screener._load_index()
+        return screener
+
+    def _match(self, screener):
+        candidates = screener.match_resumes(self.resume_dir, self.job_path, top_k=5)
+        return {candidate["candidate_id"]: candidate.get("duplicates", []) for candidate in candidates}
+
+    def test_duplicates_share_one_vector(self):
+        """A cluster is embedded and ranked once, and survives losing its representative"""
+        screener = self._screener()
+        self.assertEqual(self._match(screener), {"a.txt": ["b.txt"], "c.txt": []})
+        self.assertEqual(screener.searcher.get_index_size(), 2)
+        np.testing.assert_array_equal(screener.resume_embedding("b.txt"), screener.resume_embedding("a.txt"))
+
+        reopened = self._screener()
+        self.assertEqual(reopened.searcher.get_index_size(), 2)
+        os.remove(os.path.join(self.resume_dir, "a.txt"))
+        self.assertEqual(self._match(reopened), {"b.txt": [], "c.txt": []})
+        self.assertEqual(reopened.searcher.get_index_size(), 2)
+
+    def test_streamed_snapshots_count_duplicates(self):
+        """Near-duplicates count as processed, so the last snapshot is done"""
+        snapshots = list(self._screener().iter_match_resumes(
+            self.resume_dir, self.job_path, top_k=5, chunk_size=2
+        ))
+        self.assertEqual([s["processed"] for s in snapshots], [0, 2, 3])
+        self.assertTrue(snapshots[-1]["done"])
+        self.assertEqual(
+            {c["candidate_id"]: c.get("duplicates", []) for c in snapshots[-1]["candidates"]},
+            {"a.txt": ["b.txt"], "c.txt": []},
+        )
+
+    def test_cached_results_follow_duplicates(self):
+        """Filtered results cached before a duplicate joins or leaves are not reused"""
+        with open(os.path.join(self.resume_dir, "c.txt"), "a") as f:
+            f.write("\nSkills: python")
+        os.remove(os.path.join(self.resume_dir, "b.txt"))
+        screener = self._screener()
+        screener.parse_resumes = True
+
+        def match():
+            candidates = screener.match_resumes(
+                self.resume_dir, self.job_path, top_k=5, filters={"skills": ["python"]}
+            )
+            return sorted(candidate["candidate_id"] for candidate in candidates)
+
+        self.assertEqual(match(), ["c.txt"])
+        # A near-duplicate of a.txt with the skill is listed in a.txt's place
+        with open(os.path.join(self.resume_dir, "b.txt"), "w") as f:
+            f.write(" ".join(f"word{i}" for i in range(60)) + "\nSkills: python")
+        self.assertEqual(match(), ["b.txt", "c.txt"])
+        surfaced = screener.search_index("Software Engineer", top_k=5, filters={"skills": ["python"]})
+        self.assertEqual(
+            {candidate["candidate_id"]: candidate.get("duplicates", []) for candidate in surfaced},
+            {"b.txt": ["a.txt"], "c.txt": []},
+        )
+        self.assertEqual(screener.searcher.get_index_size(), 2)
+        os.remove(os.path.join(self.resume_dir, "b.txt"))
+        self.assertEqual(match(), ["c.txt"])
+
+
+class TestFilteredMatch(unittest.TestCase):
+    """Test cases for metadata filters in match_resumes"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.resume_dir = os.path.join(self.tmpdir.name, "resumes")
+        os.makedirs(self.resume_dir)
+        resumes = {
+            "ada.txt": "Ada\nSenior Engineer\n\nSKILLS: Python, SQL\n\nEDUCATION:\nMaster of Science\n",
+            "bob.txt": "Bob\nJunior Developer\n\nSKILLS: Python\n\nEDUCATION:\nBachelor of Arts\n",
+            "cy.txt": "Cy\nSenior Analyst\n\nSKILLS: SQL\n\nEDUCATION:\nPhD in Physics\n",
+        }
+        for filename, text in resumes.items():
+            with open(os.path.join(self.resume_dir, filename), "w") as f:
+                f.write(text)
+        self.job_path = os.path.join(self.tmpdir.name, "job.txt")
+        with open(self.job_path, "w") as f:
+            f.write("Position: Senior Engineer\nSkills: Python, SQL")
+
+        self.screener = ResumeScreener(cache_path=None, index_path=None, parse_workers=1)
+        self.screener.embedder = HashEmbedder()
+        self.screener._load_index()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _match(self, **filters):
+        candidates = self.screener.match_resumes(self.resume_dir, self.job_path, top_k=5, filters=filters)
+        return sorted(candidate["candidate_id"] for candidate in candidates)
+
+    def test_filters_restrict_candidates(self):
+        """Only resumes meeting every constraint are ranked"""
+        self.assertEqual(self._match(), ["ada.txt", "bob.txt", "cy.txt"])
+        self.assertEqual(self._match(skills=["python"]), ["ada.txt", "bob.txt"])
+        self.assertEqual(self._match(skills=["python"], level="senior"), ["ada.txt"])
+        self.assertEqual(self._match(degree=["master", "phd"]), ["ada.txt", "cy.txt"])
+        self.assertEqual(self._match(skills=["rust"]), [])
+
+    def test_empty_filters_and_unparsed_resumes(self):
+        """Filters without values act like none; real filters refuse unparsed resumes"""
+        self.assertEqual(self._match(skills=[], degree=""), ["ada.txt", "bob.txt", "cy.txt"])
+
+        unparsed = ResumeScreener(cache_path=None, index_path=None, parse_resumes=False, parse_workers=1)
+        unparsed.embedder = HashEmbedder()
+        unparsed._load_index()
+        candidates = unparsed.match_resumes(self.resume_dir, self.job_path, filters={"skills": []})
+        self.assertEqual(len(candidates), 3)
+        with self.assertRaises(ValueError):
+            unparsed.match_resumes(self.resume_dir, self.job_path, filters={"skills": ["python"]})
+
+    def test_skills_match_taxonomy_names(self):
+        """Bulleted and annotated skills are indexed, and filters match their synonyms"""
+        with open(os.path.join(self.resume_dir, "dee.txt"), "w") as f:
+            f.write("Dee\nSenior Developer\n\nSkills:\n- Python (5 yrs)\n- JS\n- React\n")
+        self.assertEqual(self._match(skills=["python3", "JavaScript"]), ["dee.txt"])
+        self.assertEqual(self._match(skills=["Python"]), ["ada.txt", "bob.txt", "dee.txt"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,183 @@
+"""Tests for the micro-batcher and the HTTP scoring service"""
+
+import asyncio
+import json
+import threading
+import unittest
+
+import numpy as np
+
+from src.service import MicroBatcher, ScoringService
+
+
+class TestMicroBatcher(unittest.IsolatedAsyncioTestCase):
+    """Test cases for MicroBatcher"""
+
+    async def asyncSetUp(self):
+        self.batches = []
+        self.release = threading.Event()
+        self.release.set()
+
+        def double(items):
+            self.release.wait(5)
+            self.batches.append(list(items))
+            return [item * 2 for item in items]
+
+        self.double = double
+
+    async def test_concurrent_submits_share_a_batch(self):
+        """Requests arriving within max_wait_ms are processed in one call"""
+        batcher = MicroBatcher(self.double, max_batch_size=16, max_wait_ms=50)
+        await batcher.start()
+        try:
+            results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+        finally:
+            await batcher.close()
+
+        self.assertEqual(results, [i * 2 for i in range(10)])
+        self.assertEqual(self.batches, [list(range(10))])
+        self.assertEqual(batcher.snapshot()["mean_batch_size"], 10)
+
+    async def test_batches_are_capped(self):
+        """No batch exceeds max_batch_size"""
+        batcher = MicroBatcher(self.double, max_batch_size=4, max_wait_ms=50)
+        await batcher.start()
+        try:
+            results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+        finally:
+            await batcher.close()
+
+        self.assertEqual(results, [i * 2 for i in range(10)])
+        self.assertEqual([len(batch) for batch in self.batches], [4, 4, 2])
+
+    async def test_errors_reach_every_caller(self):
+        """An exception in the batch function fails all items of the batch"""
+
+        def broken(items):
+            raise RuntimeError("encoder failed")
+
+        batcher = MicroBatcher(broken, max_wait_ms=20)
+        await batcher.start()
+        try:
+            results = await asyncio.gather(
+                batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+            )
+        finally:
+            await batcher.close()
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+    async def test_rejects_beyond_max_pending(self):
+        """Submits beyond max_pending fail fast instead of queueing"""
+        self.release.clear()
+        batcher = MicroBatcher(self.double, max_batch_size=1, max_wait_ms=0, max_pending=2)
+        await batcher.start()
+        try:
+            # One item in flight (blocked), two waiting in the queue
+            first = asyncio.ensure_future(batcher.submit(0))
+            await asyncio.sleep(0.05)
+            waiting = [asyncio.ensure_future(batcher.submit(i)) for i in (1, 2)]
+            await asyncio.sleep(0.01)
+            with self.assertRaises(asyncio.QueueFull):
+                await batcher.submit(3)
+            self.release.set()
+            self.assertEqual(await asyncio.gather(first, *waiting), [0, 2, 4])
+        finally:
+            self.release.set()
+            await batcher.close()
+        self.assertEqual(batcher.stats["rejected"], 1)
+
+
+class FakeEmbedder:
+    """Embeds texts by length and records batch sizes"""
+
+    def __init__(self):
+        self.calls = []
+
+    def generate(self, texts):
+        self.calls.append(len(texts))
+        return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+
+class FakeScreener:
+    """Minimal screener surface used by the service"""
+
+    def __init__(self):
+        self.embedder = FakeEmbedder()
+        self.results = {}
+
+    def match_single_resume(self, resume_text, job_text, embeddings=None):
+        resume_embedding, job_embedding = embeddings
+        return {"score": float(resume_embedding[0] + job_embedding[0])}
+
+    def cached_search(self, job_text, top_k=10, filters=None):
+        return self.results.get((job_text, top_k))
+
+    def search_index(self, job_text, top_k=10, job_embedding=None, filters=None):
+        results = [{"candidate_id": "a.txt", "score": float(job_embedding[0])}][:top_k]
+        self.results[(job_text, top_k)] = results
+        return results
+
+
+class TestScoringService(unittest.IsolatedAsyncioTestCase):
+    """Test cases for ScoringService"""
+
+    async def asyncSetUp(self):
+        self.screener = FakeScreener()
+        self.service = ScoringService(self.screener, max_wait_ms=50)
+        self.server = await self.service.start("127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        await self.service.close()
+
+    async def test_concurrent_scores_share_one_encode(self):
+        """Concurrent /score requests are encoded together, shared job text once"""
+        requests = [
+            {"resume": "r" * n, "job": "backend engineer"} for n in range(1, 6)
+        ]
+        responses = await asyncio.gather(*(
+            self.service.handle("POST", "/score", json.dumps(body).encode())
+            for body in requests
+        ))
+
+        self.assertEqual([status for status, _ in responses], [200] * 5)
+        self.assertEqual([payload["score"] for _, payload in responses], [17.0, 18.0, 19.0, 20.0, 21.0])
+        self.assertEqual(self.screener.embedder.calls, [6])
+
+    async def test_rejects_bad_requests(self):
+        """Malformed bodies, missing fields and unknown routes get 4xx"""
+        status, _ = await self.service.handle("POST", "/score", b"not json")
+        self.assertEqual(status, 400)
+        status, _ = await self.service.handle("POST", "/score", b'{"resume": "x"}')
+        self.assertEqual(status, 400)
+        status, _ = await self.service.handle("GET", "/score", b"")
+        self.assertEqual(status, 405)
+        status, _ = await self.service.handle("GET", "/missing", b"")
+        self.assertEqual(status, 404)
+
+    async def test_http_round_trip(self):
+        """Requests over a keep-alive connection get JSON responses"""
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        try:
+            for _ in range(2):
+                body = json.dumps({"job": "data engineer", "top_k": 1}).encode()
+                writer.write(
+                    b"POST /search HTTP/1.1\r\nHost: localhost\r\n"
+                    b"Content-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+                head = await reader.readuntil(b"\r\n\r\n")
+                self.assertTrue(head.startswith(b"HTTP/1.1 200 OK"))
+                length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+                payload = json.loads(await reader.readexactly(length))
+                self.assertEqual(payload["candidates"][0]["score"], 13.0)
+        finally:
+            writer.close()
+        # The repeated search was served from the cache, encoded once
+        self.assertEqual(self.screener.embedder.calls, [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""Tests for the taxonomy skill matcher"""
+
+import os
+import tempfile
+import unittest
+
+from src.parser import JobDescriptionParser, ResumeParser, SkillMatcher, get_skill_matcher
+
+
+class TestSkillMatcher(unittest.TestCase):
+    """Test cases for SkillMatcher"""
+
+    def setUp(self):
+        """Compile a small taxonomy"""
+        self.matcher = SkillMatcher({
+            "ai": ["artificial intelligence"],
+            "machine learning": ["ml"],
+            "machine vision": [],
+            "node": ["node.js", "nodejs"],
+            "c++": ["cpp"],
+            "ci/cd": [],
+        })
+
+    def test_whole_words_only(self):
+        """Short skills do not match inside longer words"""
+        self.assertEqual(self.matcher.find("maintain the anode, avoid email"), [])
+        self.assertEqual(self.matcher.find("AI and Node"), ["ai", "node"])
+
+    def test_synonyms_map_to_canonical(self):
+        """Synonyms and punctuation variants resolve to one canonical name"""
+        text = "Node.js, nodejs, C++ / cpp, CI-CD and Artificial Intelligence"
+        self.assertEqual(self.matcher.find(text), ["node", "c++", "ci/cd", "ai"])
+
+    def test_longest_phrase_wins(self):
+        """Multi-word skills are preferred over their prefixes"""
+        spans = self.matcher.find_spans("machine learning and machine vision")
+        self.assertEqual([skill for _, _, skill in spans], ["machine learning", "machine vision"])
+
+    def test_from_file(self):
+        """Taxonomy files list canonical names followed by synonyms"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "skills.txt")
+            with open(path, "w") as f:
+                f.write("# comment\nKubernetes | k8s\n\nPython\n")
+            matcher = SkillMatcher.from_file(path)
+        self.assertEqual(matcher.find("python on K8s"), ["python", "kubernetes"])
+
+    def test_parsers_share_default_taxonomy(self):
+        """Both parsers use the same compiled taxonomy"""
+        self.assertIs(ResumeParser().skill_matcher, get_skill_matcher())
+        self.assertIs(JobDescriptionParser().skill_matcher, get_skill_matcher())
+        job = JobDescriptionParser().parse("Position: Engineer\nMaintain Python and AWS services")
+        self.assertEqual(job["skills"], ["python", "aws"])
+
+
+if __name__ == "__main__":
+    unittest.main()